@@ -0,0 +1,86 @@
+"""Fixtures for the benchmarks
+
+The widgets are created without a kernel, using a mocked comm that records the number and
+size of the messages sent to the frontend.
+"""
+import json
+from typing import Any, Callable, List
+
+from ipywidgets import Widget
+from ipywidgets.widgets import widget as widget_module
+import pytest
+
+
+class RecordingComm:
+    """Mocked comm recording all messages sent to the frontend"""
+
+    def __init__(self, recorder: "CommRecorder", data=None, buffers=None, **_):
+        self.comm_id = f"comm-{id(self)}"
+        self._recorder = recorder
+        self._recorder.record(data, buffers)
+
+    def send(self, data=None, metadata=None, buffers=None) -> None:
+        self._recorder.record(data, buffers)
+
+    def on_msg(self, callback: Callable) -> None:
+        pass
+
+    def close(self, data=None, metadata=None, buffers=None, deleting=False) -> None:
+        pass
+
+
+class CommRecorder:
+    """Count the messages and bytes sent to the frontend"""
+
+    def __init__(self):
+        self.messages = 0
+        self.bytes = 0
+
+    def reset(self) -> None:
+        self.messages = 0
+        self.bytes = 0
+
+    def record(self, data: Any, buffers: List[Any] = None) -> None:
+        self.messages += 1
+        self.bytes += len(json.dumps(data, default=str).encode("utf-8"))
+        self.bytes += sum(memoryview(buffer).nbytes for buffer in buffers or ())
+
+    def create_comm(self, **kwargs) -> RecordingComm:
+        return RecordingComm(self, **kwargs)
+
+
+@pytest.fixture
+def comm(monkeypatch) -> CommRecorder:
+    """Record the messages sent by all widgets instead of sending them"""
+    recorder = CommRecorder()
+    if hasattr(widget_module, "comm"):
+        monkeypatch.setattr(widget_module.comm, "create_comm", recorder.create_comm)
+    else:  # ipywidgets < 7.8
+        monkeypatch.setattr(widget_module, "Comm", recorder.create_comm)
+    yield recorder
+    Widget.close_all()
+
+
+@pytest.fixture
+def measure(benchmark, comm: CommRecorder) -> Callable:
+    """Benchmark a function, recording the average comm traffic per call
+
+    The number of messages and bytes are stored in the `extra_info` of the benchmark,
+    and are thereby saved in the benchmark history along with the timings.
+    """
+
+    def _measure(func: Callable, *args, **kwargs) -> Any:
+        calls = 0
+
+        def wrapper():
+            nonlocal calls
+            calls += 1
+            return func(*args, **kwargs)
+
+        comm.reset()
+        result = benchmark(wrapper)
+        benchmark.extra_info["comm_messages"] = comm.messages / calls
+        benchmark.extra_info["comm_bytes"] = comm.bytes / calls
+        return result
+
+    return _measure
@@ -0,0 +1,55 @@
+"""Benchmarks for cascading dropdowns"""
+from itertools import cycle
+
+import pytest
+
+from ipywidgets_extended import CascadeLink, DropdownExtended
+
+from test_dropdown import SIZES, make_grouping
+
+
+pytest.importorskip("pytest_benchmark")
+
+PARENTS = 10
+
+
+def make_mapping(size: int):
+    """Return a mapping of `PARENTS` parent values to groupings of `size` options
+
+    The groupings of the odd parent values share their labels.
+    """
+    return {
+        parent: make_grouping(
+            size, prefix="Option" if parent % 2 else f"Option {parent}"
+        )
+        for parent in range(PARENTS)
+    }
+
+
+@pytest.mark.parametrize("size", SIZES)
+def test_link(measure, size):
+    """Create a cascade, sending the mapping table to the browser"""
+    mapping = make_mapping(size)
+    parent = DropdownExtended(options=list(mapping))
+    child = DropdownExtended()
+
+    def link():
+        CascadeLink(parent, child, mapping).close()
+
+    measure(link)
+
+
+@pytest.mark.parametrize("size", SIZES)
+def test_select_parent(measure, size):
+    """Select another parent value, switching the options of the child"""
+    mapping = make_mapping(size)
+    parent = DropdownExtended(options=list(mapping))
+    child = DropdownExtended()
+    # Kept alive by observing the parent
+    CascadeLink(parent, child, mapping)
+    values = cycle(range(1, PARENTS))
+
+    def select():
+        parent.value = next(values)
+
+    measure(select)
@@ -0,0 +1,146 @@
+"""Benchmarks for DropdownExtended"""
+from itertools import cycle
+import tracemalloc
+from typing import List, Tuple
+
+from ipywidgets import IntSlider
+import pytest
+
+from ipywidgets_extended import DisabledRule, DropdownExtended
+
+
+pytest.importorskip("pytest_benchmark")
+
+SIZES = (10, 1_000, 100_000)
+GROUP_SIZE = 100
+
+
+def make_options(size: int, prefix: str = "Option") -> List[str]:
+    """Return `size` unique option labels"""
+    return [f"{prefix} {number}" for number in range(size)]
+
+
+def make_grouping(size: int, prefix: str = "Option") -> List[Tuple[str, List[str]]]:
+    """Return `size` unique option labels in groups of `GROUP_SIZE`"""
+    options = make_options(size, prefix)
+    return [
+        (f"{prefix} group {start // GROUP_SIZE}", options[start : start + GROUP_SIZE])
+        for start in range(0, size, GROUP_SIZE)
+    ]
+
+
+@pytest.mark.parametrize("size", SIZES)
+def test_construct_options(measure, size):
+    """Create a dropdown from `options`"""
+    options = make_options(size)
+    measure(DropdownExtended, options=options)
+
+
+@pytest.mark.parametrize("size", SIZES)
+def test_construct_grouping(measure, size):
+    """Create a dropdown from `grouping`"""
+    grouping = make_grouping(size)
+    measure(DropdownExtended, grouping=grouping)
+
+
+@pytest.mark.parametrize("size", SIZES)
+def test_retained_memory_grouping(benchmark, comm, size):
+    """Memory held by a dropdown created from `grouping`
+
+    The retained bytes (excluding the grouping itself) are stored in the `extra_info` of
+    the benchmark.
+    A dropdown is created first, so one-off growth of interpreter caches, e.g., of
+    interned strings, is not counted.
+    """
+    grouping = make_grouping(size)
+    DropdownExtended(grouping=grouping).close()
+
+    def construct():
+        tracemalloc.start()
+        try:
+            widget = DropdownExtended(grouping=grouping)
+            retained, _ = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        return widget, retained
+
+    _, retained = benchmark.pedantic(construct, rounds=1, iterations=1)
+    benchmark.extra_info["retained_bytes"] = retained
+
+
+@pytest.mark.parametrize("size", SIZES)
+def test_reassign_grouping(measure, size):
+    """Re-assign `grouping`, alternating between two different groupings"""
+    widget = DropdownExtended(grouping=make_grouping(size))
+    groupings = cycle([make_grouping(size, "Other"), make_grouping(size)])
+
+    def reassign():
+        widget.grouping = next(groupings)
+
+    measure(reassign)
+
+
+@pytest.mark.parametrize("size", SIZES)
+def test_toggle_disabled_options(measure, size):
+    """Re-assign `disabled_options`, alternating between none and every other option"""
+    options = make_options(size)
+    widget = DropdownExtended(options=options)
+    disabled_options = cycle([options[::2], []])
+
+    def toggle():
+        widget.disabled_options = next(disabled_options)
+
+    measure(toggle)
+
+
+@pytest.mark.parametrize("size", SIZES)
+@pytest.mark.parametrize("vectorized", (False, True))
+def test_disabled_when_dependency_change(measure, vectorized, size):
+    """Change the dependency of `disabled_when`, alternating between two thresholds
+
+    The disabled options are memoized per threshold after the first two changes, and
+    only the tenth of the options changing state is sent to the browser.
+    """
+    if vectorized:
+        pytest.importorskip("numpy")
+    threshold = IntSlider(size // 2, max=size)
+    # Kept alive by observing the threshold
+    DropdownExtended(
+        options=list(zip(make_options(size), range(size))),
+        disabled_when=DisabledRule(
+            lambda value, threshold: value > threshold,
+            depends_on=[threshold],
+            vectorized=vectorized,
+        ),
+    )
+    thresholds = cycle([size // 2 + size // 10, size // 2])
+
+    def change():
+        threshold.value = next(thresholds)
+
+    measure(change)
+
+
+@pytest.mark.parametrize("size", SIZES)
+def test_set_value(measure, size):
+    """Set `value`, alternating between the first, middle and last option"""
+    options = make_options(size)
+    widget = DropdownExtended(options=options)
+    values = cycle([options[size // 2], options[-1], options[0]])
+
+    def select():
+        widget.value = next(values)
+
+    measure(select)
+
+
+@pytest.mark.parametrize("size", SIZES)
+def test_set_index(measure, size):
+    """Set `index`, alternating between the first, middle and last option"""
+    widget = DropdownExtended(options=make_options(size))
+    indices = cycle([size // 2, size - 1, 0])
+
+    def select():
+        widget.index = next(indices)
+
+    measure(select)
@@ -0,0 +1,60 @@
+"""Benchmarks for SelectMultipleExtended"""
+from itertools import cycle
+
+import pytest
+
+from ipywidgets_extended import SelectMultipleExtended
+
+from test_dropdown import GROUP_SIZE, SIZES, make_grouping
+
+
+pytest.importorskip("pytest_benchmark")
+
+
+@pytest.mark.parametrize("size", SIZES)
+def test_select_group(measure, size):
+    """Select a group, alternating between the first, middle and last group"""
+    widget = SelectMultipleExtended(grouping=make_grouping(size))
+    groups = len(widget.grouping)
+    headers = cycle(
+        [widget.grouping[group][0] for group in (0, groups // 2, groups - 1)]
+    )
+
+    def select():
+        widget.index = ()
+        widget.select_group(next(headers))
+
+    measure(select)
+
+
+@pytest.mark.parametrize("size", SIZES)
+def test_select_group_incrementally(measure, size):
+    """Select the groups one by one, with up to half of the options already selected"""
+    widget = SelectMultipleExtended(grouping=make_grouping(size))
+    headers = cycle(
+        [header for header, _ in widget.grouping][: max(1, size // GROUP_SIZE // 2)]
+    )
+
+    def select():
+        header = next(headers)
+        if header == widget.grouping[0][0]:
+            widget.index = ()
+        widget.select_group(header)
+
+    measure(select)
+
+
+@pytest.mark.parametrize("size", SIZES)
+def test_select_all_enabled(measure, size):
+    """Select all enabled options, with every other option disabled"""
+    grouping = make_grouping(size)
+    widget = SelectMultipleExtended(
+        grouping=grouping,
+        disabled_options=[label for _, labels in grouping for label in labels[::2]],
+    )
+
+    def select():
+        widget.index = ()
+        widget.select_all_enabled()
+
+    measure(select)
@@ -0,0 +1,54 @@
+"""Benchmarks for the single selection widgets on `GroupedOptionsMixin`"""
+from itertools import cycle
+
+import pytest
+
+from ipywidgets_extended import (
+    ComboboxExtended,
+    RadioButtonsExtended,
+    SelectExtended,
+    ToggleButtonsExtended,
+)
+
+from test_dropdown import SIZES, make_grouping, make_options
+
+
+pytest.importorskip("pytest_benchmark")
+
+WIDGETS = (SelectExtended, RadioButtonsExtended, ToggleButtonsExtended)
+
+
+@pytest.mark.parametrize("size", SIZES)
+@pytest.mark.parametrize("widget_class", WIDGETS + (ComboboxExtended,))
+def test_construct_grouping(measure, widget_class, size):
+    """Create a widget from `grouping`"""
+    grouping = make_grouping(size)
+    measure(widget_class, grouping=grouping)
+
+
+@pytest.mark.parametrize("size", SIZES)
+@pytest.mark.parametrize("widget_class", WIDGETS)
+def test_toggle_disabled_options(measure, widget_class, size):
+    """Re-assign `disabled_options`, alternating between none and every other option"""
+    options = make_options(size)
+    widget = widget_class(options=options)
+    disabled_options = cycle([options[::2], []])
+
+    def toggle():
+        widget.disabled_options = next(disabled_options)
+
+    measure(toggle)
+
+
+@pytest.mark.parametrize("size", SIZES)
+@pytest.mark.parametrize("widget_class", WIDGETS)
+def test_set_value(measure, widget_class, size):
+    """Set `value`, alternating between the first, middle and last option"""
+    options = make_options(size)
+    widget = widget_class(options=options)
+    values = cycle([options[size // 2], options[-1], options[0]])
+
+    def select():
+        widget.value = next(values)
+
+    measure(select)
@@ -7,5 +7,21 @@ from .version import __version__, version_info  # noqa: F401
 from .nbextension import _jupyter_nbextension_paths  # noqa: F401
 
 from .dropdown import *  # noqa: F403
+from .catalog import *  # noqa: F403
+from .cascade import *  # noqa: F403
+from .select_multiple import *  # noqa: F403
+from .selection import *  # noqa: F403
+from .combobox import *  # noqa: F403
+from .rules import *  # noqa: F403
+from .instrumentation import *  # noqa: F403
 
-__all__ = dropdown.__all__  # noqa: F405
+__all__ = (
+    dropdown.__all__  # noqa: F405
+    + catalog.__all__  # noqa: F405
+    + cascade.__all__  # noqa: F405
+    + select_multiple.__all__  # noqa: F405
+    + selection.__all__  # noqa: F405
+    + combobox.__all__  # noqa: F405
+    + rules.__all__  # noqa: F405
+    + instrumentation.__all__  # noqa: F405
+)
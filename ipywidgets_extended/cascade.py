@@ -0,0 +1,204 @@
+"""Cascading dropdowns switching their options in the browser"""
+from collections.abc import Mapping
+from typing import Any, Dict, List, Optional, Tuple
+
+from ipywidgets import Widget, widget_serialization
+from ipywidgets.widgets.widget_selection import _Selection
+from traitlets import traitlets
+
+from ipywidgets_extended.grouping import GroupingIndex
+from ipywidgets_extended.instrumentation import SyncStatsMixin
+from ipywidgets_extended.options import _make_grouping_index
+from ipywidgets_extended.serialization import cascade_to_json, positions_to_json
+from ipywidgets_extended.version import __version__
+
+
+__all__ = ("CascadeLink",)
+
+
+class CascadeLink(SyncStatsMixin, Widget):
+    """Switch the options of a child dropdown with the selection of a parent widget
+
+    The mapping of parent values to child groupings is sent to the browser once, as a
+    table of the distinct groupings, where each label is only sent once.
+    When an option is selected in the parent, the browser switches the options of the
+    child by itself, selecting its first enabled option, so only the selections made
+    by the user are sent to the kernel.
+    The kernel switches the options of the child in the same way, without sending them.
+
+    Example:
+        ```python
+        country = DropdownExtended(options=["Denmark", "Sweden"])
+        city = DropdownExtended()
+        link = CascadeLink(
+            country,
+            city,
+            {
+                "Denmark": [("Jutland", ["Aarhus", "Aalborg"]), ("Zealand", ["Copenhagen"])],
+                "Sweden": [("", ["Stockholm", "Gothenburg"])],
+            },
+        )
+        ```
+
+    Parameters:
+        parent: The single selection widget, e.g., a `DropdownExtended`, whose selected
+            value decides the options of the child.
+        child: The `DropdownExtended` whose options are switched. It can not be in
+            virtual mode, nor use a `catalog`.
+        mapping: Mapping of parent values to child groupings, see
+            `DropdownExtended.grouping`. Parent values without a grouping, and group
+            headers, leave the child without options.
+
+    """
+
+    _model_name = traitlets.Unicode("CascadeLinkModel").tag(sync=True)
+    _model_module = traitlets.Unicode("ipywidgets-extended").tag(sync=True)
+    _model_module_version = traitlets.Unicode(f"^{__version__}").tag(sync=True)
+
+    parent = traitlets.Instance(
+        _Selection, help="The single selection widget deciding the child's options."
+    ).tag(sync=True, **widget_serialization)
+    child = traitlets.Instance(
+        "ipywidgets_extended.dropdown.DropdownExtended",
+        help="The dropdown whose options are switched.",
+    ).tag(sync=True, **widget_serialization)
+    mapping = traitlets.Any(
+        help=(
+            "Mapping of parent values to child groupings.\n\nParent values mapped to the "
+            "same grouping object share it in the mapping table sent to the browser."
+        ),
+    )
+
+    # The mapping table: The labels and depths of each distinct grouping, and the
+    # number of the grouping of each entry of the parent
+    _groupings = traitlets.Tuple(read_only=True).tag(sync=True, to_json=cascade_to_json)
+    _parent_groupings = traitlets.Tuple(read_only=True).tag(
+        sync=True, to_json=positions_to_json
+    )
+
+    def __init__(self, parent: _Selection, child: Any, mapping: Mapping, **kwargs):
+        # The normalized grouping and flat index of each distinct grouping, shared by
+        # the options of the child
+        self._indexes: Tuple[Tuple[Any, GroupingIndex]] = ()
+        self._numbers: Dict[int, int] = {}
+        self._followed: Optional[_Selection] = None
+        kwargs.update(parent=parent, child=child, mapping=mapping)
+        super().__init__(**kwargs)
+
+    def unlink(self) -> None:
+        """Stop switching the options of the child, keeping its current options"""
+        self.close()
+
+    def close(self) -> None:
+        """Stop following the parent, and close the widget"""
+        self._follow(None)
+        super().close()
+
+    @traitlets.validate("child")
+    def _validate_child(self, proposal) -> Any:
+        """Ensure the child renders its own options"""
+        child = proposal.value
+        if child.virtual or child.catalog is not None:
+            raise traitlets.TraitError(
+                "The child of a cascade can not be in virtual mode, nor use a `catalog`."
+            )
+        return child
+
+    @traitlets.validate("mapping")
+    def _validate_mapping(self, proposal) -> Mapping:
+        """Normalize, validate and index each distinct grouping of the mapping"""
+        mapping = proposal.value
+        if not isinstance(mapping, Mapping):
+            raise traitlets.TraitError(
+                f"The mapping must map parent values to groupings, got: {mapping!r}"
+            )
+        indexes: List[Tuple[Any, GroupingIndex]] = []
+        numbers: Dict[int, int] = {}
+        for grouping in mapping.values():
+            if id(grouping) not in numbers:
+                numbers[id(grouping)] = len(indexes)
+                indexes.append(_make_grouping_index(grouping or ()))
+        self._indexes, self._numbers = tuple(indexes), numbers
+        return mapping
+
+    @traitlets.observe("mapping")
+    def _set_mapping(self, _) -> None:
+        """Update the mapping table and the options of the child"""
+        # A single message, so the browser switches the options once
+        with self.hold_sync():
+            self.set_trait(
+                "_groupings",
+                tuple(
+                    [
+                        (flat_index.group_labels(), flat_index.group_depths)
+                        for _, flat_index in self._indexes
+                    ]
+                ),
+            )
+            self._update_parent_groupings()
+        self._apply()
+
+    @traitlets.observe("parent")
+    def _set_parent(self, change) -> None:
+        """Follow the selection and options of the parent"""
+        self._follow(change.new)
+        self._update_parent_groupings()
+        self._apply()
+
+    @traitlets.observe("child")
+    def _set_child(self, _) -> None:
+        self._apply()
+
+    def _follow(self, parent: Optional[_Selection]) -> None:
+        """Observe the selection and options of `parent` instead of the current one"""
+        if self._followed is not None:
+            self._followed.unobserve(
+                self._parent_selection_changed, names=["index", "options"]
+            )
+        if parent is not None:
+            parent.observe(self._parent_selection_changed, names=["index", "options"])
+        self._followed = parent
+
+    def _parent_selection_changed(self, change) -> None:
+        """Switch the options of the child for a new selection, or options, of the
+        parent"""
+        if change.name == "options":
+            self._update_parent_groupings()
+            self._apply()
+            # The browser may switch the options of the child for the new selection of
+            # the parent before receiving the new mapping of its entries
+            self.child.send_state("index")
+        else:
+            self._apply()
+
+    def _update_parent_groupings(self) -> None:
+        """Look up the grouping number of each entry of the parent"""
+        parent, mapping = self.parent, self.mapping
+        if parent is None or mapping is None:
+            return
+        flat_index: Optional[GroupingIndex] = getattr(parent, "_flat_index", None)
+        numbers = self._numbers
+        positions: List[Optional[int]] = []
+        for position, value in enumerate(parent._options_values):
+            grouping = None
+            if flat_index is None or not flat_index.is_header(position):
+                try:
+                    grouping = mapping.get(value)
+                except TypeError:
+                    pass  # Unhashable
+            positions.append(None if grouping is None else numbers[id(grouping)])
+        self.set_trait("_parent_groupings", tuple(positions))
+
+    def _apply(self) -> None:
+        """Use the grouping of the selected parent entry as the options of the child"""
+        parent, child = self.parent, self.child
+        if parent is None or child is None or self.mapping is None:
+            return
+        positions = self._parent_groupings
+        index = parent.index
+        number = (
+            positions[index] if index is not None and index < len(positions) else None
+        )
+        child._apply_cascade(
+            *(self._indexes[number] if number is not None else ((), GroupingIndex()))
+        )
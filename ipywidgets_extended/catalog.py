@@ -0,0 +1,97 @@
+"""Option catalogs shared by several dropdowns"""
+from typing import Any, Tuple
+from weakref import WeakSet
+
+from ipywidgets import Widget
+from traitlets import traitlets
+
+from ipywidgets_extended.options import _grouping_value, _make_grouping_index
+from ipywidgets_extended.grouping import GroupingIndex
+from ipywidgets_extended.instrumentation import SyncStatsMixin
+from ipywidgets_extended.serialization import grouping_to_json
+from ipywidgets_extended.version import __version__
+
+
+__all__ = ("OptionCatalog",)
+
+
+class OptionCatalog(SyncStatsMixin, Widget):
+    """Grouped options shared by several dropdowns
+
+    The grouping is normalized, indexed and sent to the browser once, however many
+    dropdowns use it.
+    The dropdowns only hold their own selection and disabled options.
+
+    Example:
+        ```python
+        catalog = OptionCatalog(grouping=[("Fruits", ["Apple", "Pear"]), ("", ["None"])])
+        dropdowns = [DropdownExtended(catalog=catalog) for _ in range(100)]
+        ```
+
+    """
+
+    _model_name = traitlets.Unicode("OptionCatalogModel").tag(sync=True)
+    _model_module = traitlets.Unicode("ipywidgets-extended").tag(sync=True)
+    _model_module_version = traitlets.Unicode(f"^{__version__}").tag(sync=True)
+
+    _grouping_labels = traitlets.Tuple(read_only=True).tag(
+        sync=True, to_json=grouping_to_json
+    )
+    _group_depths = traitlets.Tuple(read_only=True).tag(sync=True)
+
+    grouping = traitlets.Any(
+        default_value=(),
+        help=(
+            "Iterable of (header, options)-pairs, similar to `DropdownExtended.grouping`. "
+            "An empty string header can be used to implement ungrouped options, and groups "
+            "can be nested by passing a mapping of headers to options, or to mappings of "
+            "sub-groups.\n\n"
+            "The grouping is kept normalized, similar to `DropdownExtended.grouping`, and all "
+            "dropdowns using the catalog are updated when it is changed."
+        ),
+    )
+    compact_sync = traitlets.Bool(
+        False,
+        help=(
+            "Send the labels to the browser as binary buffers (a UTF-8 blob with offsets) "
+            "instead of JSON lists of strings."
+        ),
+    )
+
+    # Shared with the dropdowns using the catalog
+    _grouping_full: Tuple[Tuple[str, Tuple[Tuple[str, Any]]]] = ()
+    _flat_index: GroupingIndex = GroupingIndex()
+    _options_full: Tuple[Tuple[str, Any]] = ()
+    _options_labels: Tuple[str] = ()
+    _options_values: Tuple[Any] = ()
+    _labels_buffers = None
+
+    def __init__(self, **kwargs):
+        self._dropdowns = WeakSet()
+        super().__init__(**kwargs)
+
+    @traitlets.validate("grouping")
+    def _validate_grouping(self, proposal) -> Any:
+        """Normalize, validate and index the grouping, keeping it normalized"""
+        self._grouping_full, self._flat_index = _make_grouping_index(
+            proposal.value or ()
+        )
+        return _grouping_value(self._grouping_full, self._flat_index.group_depths)
+
+    @traitlets.observe("grouping")
+    def _set_grouping(self, _) -> None:
+        """Update the labels and all dropdowns using the catalog"""
+        flat_index = self._flat_index
+        self._options_full = flat_index.entries
+        self._options_labels = flat_index.labels
+        self._options_values = flat_index.values()
+        self.set_trait("_group_depths", flat_index.group_depths)
+        self.set_trait("_grouping_labels", flat_index.group_labels())
+        for dropdown in list(self._dropdowns):
+            dropdown._apply_catalog()
+
+    @traitlets.observe("compact_sync")
+    def _resend_labels(self, _) -> None:
+        """Re-send the labels in the new format"""
+        if self.comm is not None:
+            self.send_state(["_grouping_labels", "_group_depths"])
@@ -0,0 +1,253 @@
+"""Columnar option sources
+
+Options can be given as columns, e.g., of a pandas DataFrame or an Arrow table, instead of
+(label, value)-pairs per group.
+The groups, and the labels sent from Arrow columns, are resolved with vectorized
+operations, which requires NumPy.
+"""
+import sys
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from ipywidgets_extended.grouping import GroupingIndex
+
+
+__all__ = ("ColumnarGrouping",)
+
+
+def _numpy():
+    """Import NumPy, which is an optional dependency"""
+    try:
+        import numpy
+    except ImportError as exc:
+        raise ImportError(
+            "NumPy is required for columnar options. Install it with `pip install numpy`."
+        ) from exc
+    return numpy
+
+
+def _to_list(column: Any) -> List[Any]:
+    """Convert a NumPy array, Arrow array, pandas Series or sequence to a list"""
+    if hasattr(column, "to_pylist"):  # Arrow
+        return column.to_pylist()
+    if hasattr(column, "tolist"):  # NumPy and pandas
+        return column.tolist()
+    return list(column)
+
+
+def _to_numpy(column: Any):
+    """Convert a column to a NumPy array, without copying if possible"""
+    numpy = _numpy()
+    if hasattr(column, "to_numpy") and hasattr(column, "to_pylist"):  # Arrow
+        return column.to_numpy(zero_copy_only=False)
+    return numpy.asarray(column)
+
+
+def _dictionary_encoded(column: Any) -> Optional[Tuple[Any, List[str]]]:
+    """Return the codes and dictionary of a dictionary-encoded (categorical) column"""
+    if hasattr(column, "combine_chunks") and hasattr(column, "num_chunks"):
+        column = column.combine_chunks()  # Arrow ChunkedArray
+    if hasattr(column, "indices") and hasattr(column, "dictionary"):  # Arrow
+        return (
+            _to_numpy(column.indices.fill_null(-1)),
+            [str(header) for header in column.dictionary.to_pylist()],
+        )
+    categorical = getattr(column, "cat", column)  # pandas Series or Categorical
+    if hasattr(categorical, "codes") and hasattr(categorical, "categories"):
+        return (
+            _to_numpy(categorical.codes),
+            [str(header) for header in categorical.categories],
+        )
+    return None
+
+
+def _arrow_string_layout(column: Any) -> Optional[Tuple[Any, memoryview]]:
+    """Return the offsets, as a NumPy array view, and UTF-8 data of an Arrow string array
+
+    Only `string` and `large_string` arrays without nulls are supported, for which
+    `None` is otherwise returned.
+    """
+    type_name = str(getattr(column, "type", ""))
+    if (
+        not hasattr(column, "buffers")
+        or type_name not in ("string", "utf8", "large_string", "large_utf8")
+        or column.null_count
+    ):
+        return None
+    _, offsets, data = column.buffers()
+    offsets = _numpy().frombuffer(
+        offsets,
+        dtype="<i8" if type_name.startswith("large") else "<i4",
+        count=column.offset + len(column) + 1,
+    )[column.offset :]
+    return offsets, memoryview(data if data is not None else b"")  # Only empty labels
+
+
+def _arrow_utf8_buffers(column: Any, order: Any = None) -> Optional[Dict[str, Any]]:
+    """Return the labels of an Arrow string column in the compact wire format
+
+    The UTF-8 data of `string` and `large_string` arrays is used without copying, when
+    the rows are not reordered. Only the offsets are converted, if they are not 32-bit
+    offsets starting at zero. The labels of dictionary-encoded columns, and reordered
+    rows, are instead gathered from the UTF-8 data of the array (or its dictionary) with
+    vectorized operations.
+    `None` is returned for any other column, for nulls, and if the labels do not fit the
+    compact wire format, see `ipywidgets_extended.serialization`.
+
+    Parameters:
+        column: The Arrow array or single-chunk `ChunkedArray` of labels.
+        order: The rows to take, in order. Defaults to all rows as they are.
+
+    """
+    numpy = _numpy()
+    if hasattr(column, "num_chunks"):  # ChunkedArray
+        if column.num_chunks != 1:
+            return None
+        column = column.chunk(0)
+    if sys.byteorder != "little":
+        return None
+    rows = order
+    if hasattr(column, "indices") and hasattr(column, "dictionary"):
+        if column.indices.null_count:
+            return None
+        rows = _to_numpy(column.indices).astype(numpy.int64)
+        if order is not None:
+            rows = rows[order]
+        column = column.dictionary
+    layout = _arrow_string_layout(column)
+    if layout is None:
+        return None
+    offsets, data = layout
+
+    if rows is None:
+        start, stop = int(offsets[0]), int(offsets[-1])
+        if stop - start > 0xFFFFFFFF:
+            return None
+        if offsets.dtype.itemsize != 4 or start:
+            offsets = (offsets - start).astype("<u4")
+        return {"blob": data[start:stop], "offsets": memoryview(offsets).cast("B")}
+
+    starts = offsets[rows].astype(numpy.int64)
+    lengths = offsets[rows + 1] - starts
+    row_offsets = numpy.zeros(len(rows) + 1, dtype=numpy.int64)
+    numpy.cumsum(lengths, out=row_offsets[1:])
+    if row_offsets[-1] > 0xFFFFFFFF:
+        return None
+    # The position in `data` of each byte of the gathered labels
+    positions = numpy.repeat(starts - row_offsets[:-1], lengths) + numpy.arange(
+        row_offsets[-1]
+    )
+    return {
+        "blob": memoryview(numpy.frombuffer(data, dtype=numpy.uint8)[positions]),
+        "offsets": memoryview(row_offsets.astype("<u4")).cast("B"),
+    }
+
+
+class ColumnarGrouping:
+    """A grouping built from columns of labels, values, groups and disabled flags.
+
+    Rows are ordered by group, keeping the order of rows within each group.
+    Groups are ordered as their headers, and groups without rows are left out.
+    Rows without a group (a negative or missing code) are put first, un-grouped.
+
+    The groups, the order of the rows and the compact wire format of Arrow labels are
+    resolved with vectorized operations. The grouping and its flat index still hold the
+    labels, values and (label, value)-pairs as Python objects, as for any other
+    grouping, since the selection, disabled options, search and deltas of the widgets
+    all work on the shared flat index. Dictionary-encoded (categorical) labels share
+    the (interned) label strings of their dictionary.
+
+    Parameters:
+        labels: The labels of the options.
+        values: The values of the options. Defaults to the labels.
+        groups: The group of each option, either as a dictionary-encoded (Arrow) or
+            categorical (pandas) column, where the categories are the headers, or as
+            integer codes into `headers`.
+        headers: The group headers, if `groups` are integer codes.
+        disabled: Boolean mask of the disabled options.
+
+    Attributes:
+        grouping: The normalized grouping, similar to `_make_grouping()`.
+        flat_index: The flat index of the grouping.
+        disabled_options: The labels of the disabled options.
+        labels_buffers: The UTF-8 data and offsets of the option labels, in group
+            order, taken from the buffers of an Arrow `string`, `large_string` or
+            dictionary-encoded column, see `_arrow_utf8_buffers()`. `None` for any
+            other column, whose labels are then encoded when sent.
+
+    """
+
+    def __init__(
+        self,
+        labels: Any,
+        values: Any = None,
+        groups: Any = None,
+        headers: Sequence[str] = None,
+        disabled: Any = None,
+    ):
+        numpy = _numpy()
+        encoded = _dictionary_encoded(labels)
+        if encoded is not None and (encoded[0] >= 0).all():
+            label_codes, dictionary = encoded
+            dictionary = [sys.intern(label) for label in dictionary]
+            label_list = [dictionary[code] for code in label_codes.tolist()]
+        else:
+            label_list = [str(label) for label in _to_list(labels)]
+        value_list = label_list if values is None else _to_list(values)
+        if len(value_list) != len(label_list):
+            raise ValueError("`labels` and `values` must have the same length.")
+
+        if groups is None:
+            codes = numpy.zeros(len(label_list), dtype=numpy.int64)
+            headers = [""]
+        else:
+            encoded = _dictionary_encoded(groups)
+            if encoded is not None:
+                codes, headers = encoded
+            elif headers is None:
+                raise ValueError("`headers` must be given for integer group codes.")
+            else:
+                codes, headers = _to_numpy(groups), [str(_) for _ in headers]
+            codes = numpy.asarray(codes, dtype=numpy.int64)
+            if len(codes) != len(label_list):
+                raise ValueError("`labels` and `groups` must have the same length.")
+            if len(codes) and codes.max() >= len(headers):
+                raise ValueError("Group codes must be valid indices into `headers`.")
+            codes = numpy.where(codes < 0, -1, codes)
+
+        named_headers = [header for header in headers if header]
+        if len(set(named_headers)) != len(named_headers):
+            raise ValueError("Group headers must be unique.")
+
+        order = None
+        if len(codes) > 1 and (numpy.diff(codes) < 0).any():
+            order = numpy.argsort(codes, kind="stable")
+            codes = codes[order]
+            rows = order.tolist()
+            label_list = [label_list[row] for row in rows]
+            value_list = [value_list[row] for row in rows]
+
+        group_codes, starts = numpy.unique(codes, return_index=True)
+        stops = numpy.append(starts[1:], len(codes))
+        grouping = []
+        for code, start, stop in zip(
+            group_codes.tolist(), starts.tolist(), stops.tolist()
+        ):
+            header = "" if code < 0 else headers[code]
+            grouping.append(
+                (header, tuple(zip(label_list[start:stop], value_list[start:stop])))
+            )
+        self.grouping: Tuple[Tuple[str, Tuple[Tuple[str, Any]]]] = tuple(grouping)
+        self.flat_index = GroupingIndex(self.grouping)
+
+        self.disabled_options: List[str] = []
+        if disabled is not None:
+            mask = numpy.asarray(_to_numpy(disabled), dtype=bool)
+            if len(mask) != len(label_list):
+                raise ValueError("`labels` and `disabled` must have the same length.")
+            if order is not None:
+                mask = mask[order]
+            self.disabled_options = list(
+                dict.fromkeys(label_list[row] for row in numpy.flatnonzero(mask))
+            )
+
+        self.labels_buffers = _arrow_utf8_buffers(labels, order)
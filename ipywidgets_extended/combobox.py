@@ -0,0 +1,66 @@
+"""Combobox Widget Extension"""
+from typing import Tuple
+
+from ipywidgets.widgets.widget_string import Combobox
+from traitlets import traitlets
+
+from ipywidgets_extended.instrumentation import SyncStatsMixin
+from ipywidgets_extended.options import GroupedOptionsMixin, _TrustedTypedTuple
+from ipywidgets_extended.version import __version__
+
+
+__all__ = ("ComboboxExtended",)
+
+
+class ComboboxExtended(GroupedOptionsMixin, SyncStatsMixin, Combobox):
+    """Extended Widget of Combobox
+
+    Extensions:
+    - Disable individual options (`disabled_options`), which are not suggested, and
+      not accepted with `ensure_option=True`.
+    - Create groupings of the suggestions, where the group header is shown next to each
+      suggestion.
+    - Compact binary serialization of the labels (`compact_sync=True`).
+    - Opt-in counting of the comm traffic per trait (`sync_stats()`).
+
+    The options are labels only, also in `grouping`.
+
+    """
+
+    _model_name = traitlets.Unicode("ComboboxExtendedModel").tag(sync=True)
+    _model_module = traitlets.Unicode("ipywidgets-extended").tag(sync=True)
+    _model_module_version = traitlets.Unicode(f"^{__version__}").tag(sync=True)
+    _view_name = traitlets.Unicode("ComboboxExtendedView").tag(sync=True)
+    _view_module = traitlets.Unicode("ipywidgets-extended").tag(sync=True)
+    _view_module_version = traitlets.Unicode(f"^{__version__}").tag(sync=True)
+
+    # Sent to the browser as `_options_labels` instead, and not validated per element
+    # when derived from the grouping
+    options = _TrustedTypedTuple(
+        trait=traitlets.Unicode(), help="Dropdown options for the combobox"
+    )
+
+    _initializing_traits_ = False
+
+    def __init__(self, **kwargs):
+        self._initializing_traits_ = True
+        self._init_options(kwargs)
+        if "options" in kwargs and not self._grouping_full:
+            # Only the labels, similar to the options of a grouping
+            kwargs["options"] = self._grouped_options()
+
+        # The options and disabled options are already validated and propagated
+        with self._trusting():
+            super().__init__(**kwargs)
+        self._initializing_traits_ = False
+
+    def _grouped_options(self) -> Tuple[str]:
+        """The labels of the options of the grouping, without the group headers"""
+        flat_index = self._flat_index
+        return tuple(
+            [
+                label
+                for position, label in enumerate(flat_index.labels)
+                if not flat_index.is_header(position)
+            ]
+        )
@@ -1,28 +1,83 @@
 """Dropdown Widget Extension"""
-from typing import Any, List, Tuple
+import asyncio
+from bisect import bisect_left
+from collections.abc import AsyncIterable
+from contextlib import contextmanager
+from inspect import isawaitable
+from typing import (
+    Any,
+    Dict,
+    FrozenSet,
+    Iterable,
+    List,
+    Optional,
+    Set,
+    Tuple,
+)
 
-from ipywidgets.widgets.widget_selection import Dropdown, _make_options
+from ipywidgets import widget_serialization
+from ipywidgets.widgets.widget_selection import Dropdown, _Selection
 from traitlets import traitlets
 
+from ipywidgets_extended.columnar import ColumnarGrouping, _numpy
+from ipywidgets_extended.grouping import DisabledState, GroupingIndex, SearchIndex
+from ipywidgets_extended.instrumentation import SyncStatsMixin
+from ipywidgets_extended.options import (
+    GroupedOptionsMixin,
+    _grouping_value,
+    _make_grouping_index,
+    _make_interned_options,
+)
+from ipywidgets_extended.rules import DisabledRule
 from ipywidgets_extended.version import __version__
 
 
 __all__ = ("DropdownExtended",)
 
+_LABEL_TRAITS = (
+    "_options_labels",
+    "_grouping_labels",
+    "_group_depths",
+    "_disabled_options_labels",
+)
+"""Traits holding all labels, which are requested in pages in virtual mode"""
+_VIRTUAL_TRAITS = (
+    "_virtual_count",
+    "_virtual_page_size",
+    "_selected_label",
+    "_pages_version",
+)
+"""Traits only used in virtual mode"""
+_CATALOG_TRAITS = ("_options_labels", "_grouping_labels", "_group_depths")
+"""Traits taken from the catalog in the browser, when using an `OptionCatalog`"""
 
-def _make_grouping(
-    grouping: List[Tuple[str, List[str]]]
-) -> Tuple[Tuple[str, Tuple[Tuple[str, Any]]]]:
-    """Utilize `_make_options()` to set inner options in grouping"""
-    return tuple([(header, _make_options(options)) for header, options in grouping])
+
+def _mask_labels(flat_index: GroupingIndex, mask: Any) -> List[str]:
+    """Return the (unique) labels of the options set in a boolean mask"""
+    labels = flat_index.labels
+    return list(
+        dict.fromkeys(
+            [labels[position] for position in _numpy().flatnonzero(mask).tolist()]
+        )
+    )
 
 
-class DropdownExtended(Dropdown):
+class DropdownExtended(GroupedOptionsMixin, SyncStatsMixin, Dropdown):
     """Extended Widget of Dropdown
 
     Extensions:
-    - Disable individual options.
+    - Disable individual options, by label or with a boolean mask (`disabled_mask`).
     - Create groupings within the dropdown.
+    - Virtual mode for very large sets of options (`virtual=True`), where the labels
+      are requested in pages by the browser as the user scrolls.
+    - Compact binary serialization of the labels (`compact_sync=True`).
+    - Opt-in counting of the comm traffic per trait (`sync_stats()`).
+    - Options shared with other dropdowns through an `OptionCatalog` (`catalog`).
+    - Options added progressively from an asynchronous source (`populate()`).
+    - Only send the settled selection to the kernel (`continuous_update` and
+      `debounce`).
+    - Options switched in the browser by the selection of a parent widget
+      (`CascadeLink`).
 
     """
 
@@ -33,35 +88,95 @@ class DropdownExtended(Dropdown):
     _view_module = traitlets.Unicode("ipywidgets-extended").tag(sync=True)
     _view_module_version = traitlets.Unicode(f"^{__version__}").tag(sync=True)
 
-    # Additional widget properties used in the TypeScript code
-    _disabled_options_labels = traitlets.Tuple(
-        trait=traitlets.Unicode(),
-        read_only=True,
-    ).tag(sync=True)
-    _grouping_labels = traitlets.Tuple(
-        trait=traitlets.Tuple(
-            traitlets.Unicode(),
-            traitlets.Tuple(traitlets.Unicode()),  # Similar to `_options_labels`
-        ),
-        read_only=True,
-    ).tag(sync=True)
+    # Additional widget properties used in the TypeScript code, see also
+    # `GroupedOptionsMixin`
+    _virtual_count = traitlets.Int(0, read_only=True).tag(sync=True)
+    _virtual_page_size = traitlets.Int(100, read_only=True).tag(sync=True)
+    _selected_label = traitlets.Unicode(None, allow_none=True, read_only=True).tag(
+        sync=True
+    )
+    # The version of the entries, sent with each page, so a view only caches pages of
+    # the current entries
+    _pages_version = traitlets.Int(0, read_only=True).tag(sync=True)
 
     # The equivalent Python changeable traits
-    disabled_options = traitlets.List(
-        traitlets.Unicode(),
-        default_value=[],
-        help="The labels for the disabled options.",
+    disabled_mask = traitlets.Any(
+        None,
+        allow_none=True,
+        help=(
+            "NumPy boolean array over the entries of `options` (including group headers), "
+            "where `True` disables the option. An alternative to `disabled_options`, which "
+            "is kept up to date with the mask, and vice versa.\n\nOptions are disabled by "
+            "label, so options sharing a label with a disabled option are disabled as "
+            "well. The stored mask is a read-only copy."
+        ),
+    )
+    disabled_when = traitlets.Any(
+        None,
+        allow_none=True,
+        help=(
+            "A `DisabledRule`, or a callable taking an option value and returning whether "
+            "the option is disabled, setting `disabled_options`.\n\nThe rule is evaluated "
+            "again when the options, or any of its dependencies, change, and only the "
+            "changed options are sent to the browser."
+        ),
+    )
+    virtual = traitlets.Bool(
+        False,
+        help=(
+            "Render only the visible part of the dropdown, requesting the labels from the "
+            "kernel in pages when scrolling. Initially, only the number of entries and the "
+            "current selection are sent to the browser.\n\nCan only be set when creating "
+            "the widget."
+        ),
     )
-    grouping = traitlets.Any(  # Similar to `options`
-        default_value=(),
+    collapsible = traitlets.Bool(
+        False,
         help=(
-            "Iterable of values, (header, ((label, value), (label, value), ...)), where the inner "
-            "iterable of labels and values can be an iterable of values only, which will result "
-            "in labels being auto-generated.\n\nAn empty string header can be used to implement "
-            "ungrouped options."
+            "Show the groups as a tree that can be expanded and collapsed. The entries of "
+            "a group are only requested from the kernel when it is first expanded, and are "
+            "then cached in the browser. Collapsed groups take up no space in the page."
+            "\n\nImplies `virtual`, and can only be set when creating the widget."
         ),
     )
-    _grouping_full: Tuple[Tuple[str, Tuple[Tuple[str, Any]]]] = None
+    catalog = traitlets.Instance(
+        "ipywidgets_extended.catalog.OptionCatalog",
+        allow_none=True,
+        help=(
+            "An `OptionCatalog` holding the options, instead of `options` or `grouping`. "
+            "The options are then shared with other dropdowns using the same catalog, and "
+            "only sent to the browser once.\n\nSetting the catalog to `None` keeps the "
+            "current options as the dropdown's own."
+        ),
+    ).tag(sync=True, **widget_serialization)
+    loading = traitlets.Bool(
+        False,
+        read_only=True,
+        help="Whether options are still being added by `populate()`.",
+    ).tag(sync=True)
+    continuous_update = traitlets.Bool(
+        True,
+        help=(
+            "Send the selection to the kernel for every step of the keyboard navigation. "
+            "If `False`, the selection is only sent when committed, i.e., when pressing "
+            "Enter, selecting with the mouse, or leaving the dropdown.\n\nNot used in "
+            "virtual mode, where options are only selected with the mouse."
+        ),
+    ).tag(sync=True)
+    debounce = traitlets.Int(
+        0,
+        min=0,
+        help=(
+            "Time in milliseconds the selection must be unchanged in the browser before "
+            "it is sent to the kernel. Zero sends every change right away.\n\nNot used "
+            "in virtual mode."
+        ),
+    ).tag(sync=True)
+    _search_index: SearchIndex = None
+    _applying_mask_ = False
+    _batch_changes: Optional[Set[str]] = None
+    _unsynced_traits: FrozenSet[str] = frozenset()
+    _population: Optional["asyncio.Task[None]"] = None
 
     def __init__(self, *args, **kwargs):
         self._initializing_traits_ = True
@@ -71,161 +186,1289 @@ class DropdownExtended(Dropdown):
                 "Either `options` or `grouping` must be specified. Not both."
             )
 
-        options = _make_options(kwargs.get("options", ()))
+        # Normalized grouping, its flat index, and possibly the wire buffers of the
+        # option labels, passed by `from_grouping()` and `from_columns()`
+        prepared: Optional[Tuple[Any, GroupingIndex, Any]] = kwargs.pop(
+            "_prepared_grouping", None
+        )
+
+        # An asynchronous source of the grouping is added once the widget is created
+        source = kwargs.get("grouping")
+        if isinstance(source, AsyncIterable) or isawaitable(source):
+            del kwargs["grouping"]
+        else:
+            source = None
+
+        catalog = kwargs.get("catalog")
+        if catalog is not None:
+            if (
+                "options" in kwargs
+                or "grouping" in kwargs
+                or prepared is not None
+                or source is not None
+            ):
+                raise ValueError(
+                    "Either `catalog` or `options`/`grouping` must be specified. Not both."
+                )
+            prepared = (catalog._grouping_full, catalog._flat_index, None)
+        elif prepared is None:
+            prepared = (*self._prepare_options(kwargs), None)
+
+        # All views of the options are derived from, and share the tuples of, the flat
+        # index, see `_init_prepared()`
+        grouping, flat_index, labels_buffers = prepared
+        if grouping:
+            # The normalized grouping, not the passed (possibly consumed) iterable
+            kwargs["grouping"] = _grouping_value(grouping, flat_index.group_depths)
+        if labels_buffers is not None:
+            self._labels_buffers = (flat_index, labels_buffers)
+        # Shared with the catalog, if any, as are the tuples of the flat index
+        self.set_trait(
+            "_grouping_labels", flat_index.group_labels() if grouping else ()
+        )
+        self.set_trait("_group_depths", flat_index.group_depths)
         disabled_options = kwargs.get("disabled_options", [])
+        self._use_index(grouping, flat_index)
+        if kwargs.get("disabled_when") is not None and (
+            "disabled_options" in kwargs or kwargs.get("disabled_mask") is not None
+        ):
+            raise ValueError(
+                "`disabled_when` sets `disabled_options`, so they can not be specified "
+                "together, nor with `disabled_mask`."
+            )
+        if kwargs.get("disabled_mask") is not None:
+            if "disabled_options" in kwargs:
+                raise ValueError(
+                    "Either `disabled_options` or `disabled_mask` must be specified. "
+                    "Not both."
+                )
+            disabled_mask = kwargs["disabled_mask"] = self._clean_disabled_mask(
+                kwargs["disabled_mask"]
+            )
+            disabled_options = kwargs["disabled_options"] = _mask_labels(
+                flat_index, disabled_mask
+            )
+            self._disabled = DisabledState.from_mask(
+                flat_index, disabled_mask, disabled_options
+            )
+        else:
+            if disabled_options and kwargs.get("validate", True):
+                self._check_disabled_options(disabled_options)
+            self._disabled = DisabledState(flat_index, disabled_options)
         self.set_trait("_disabled_options_labels", tuple(disabled_options))
-        grouping = _make_grouping(kwargs.get("grouping", ()))
-        self._grouping_full = grouping
-        self.set_trait(
-            "_grouping_labels",
-            tuple(
-                [
-                    (header, tuple([_[0] for _ in options]))
-                    for header, options in grouping
-                ]
+
+        # Ensure initialized 'index' is an enabled option (if possible)
+        if "index" not in kwargs and "value" not in kwargs and "label" not in kwargs:
+            index = self._disabled.first_enabled()
+            kwargs["index"] = index
+            kwargs["label"], kwargs["value"] = (
+                flat_index.entry(index) if index is not None else (None, None)
+            )
+
+        self._init_prepared(flat_index, *args, **kwargs)
+        self._initializing_traits_ = False
+        self._apply_disabled_rule(patch=False)
+        self.on_msg(self._handle_frontend_msg)
+        if source is not None:
+            self.populate(source)
+
+    def _init_prepared(self, flat_index: GroupingIndex, *args, **kwargs) -> None:
+        """Initialize the widget from an already validated grouping and flat index
+
+        The options bookkeeping of `_Selection.__init__()` is done from the flat index
+        here and in `_use_index()`, and the grouping and options are not normalized, validated, nor
+        propagated again when setting the traits.
+        The options, values and labels are the tuples of the flat index, not copies.
+        """
+        self.equals = kwargs.pop("equals", lambda x, y: x == y)
+        self.set_trait("_options_labels", flat_index.labels)
+
+        kwargs.setdefault("options", self._options_full)
+        with self._trusting():
+            super(_Selection, self).__init__(*args, **kwargs)
+
+    @classmethod
+    def from_grouping(
+        cls, grouping: Iterable[Tuple[str, Iterable[Any]]], **kwargs
+    ) -> "DropdownExtended":
+        """Create a dropdown from a grouping in a single pass.
+
+        This is equivalent to `DropdownExtended(grouping=grouping, **kwargs)`, but the
+        grouping is only normalized and flattened once, after which the options are not
+        normalized nor validated again.
+        This makes it considerably faster to create dropdowns with many options.
+
+        Parameters:
+            grouping: Iterable of (header, options)-pairs, see `grouping`.
+            **kwargs: Any other traits of the widget, except `options`.
+
+        """
+        if "options" in kwargs or "grouping" in kwargs:
+            raise ValueError("The grouping must be passed as the `grouping` argument.")
+        return cls(
+            _prepared_grouping=(
+                *_make_grouping_index(grouping, validate=kwargs.get("validate", True)),
+                None,
             ),
+            **kwargs,
         )
 
-        # Ensure initialized 'index' is an enabled option (if possible)
-        if (
-            "index" not in kwargs
-            and "value" not in kwargs
-            and "label" not in kwargs
-            and "grouping" in kwargs
-        ):
-            for index, option in enumerate(self._flat_groupings()):
-                if option not in disabled_options and option not in self._group_headers:
-                    kwargs["index"] = index
-                    kwargs["label"], kwargs["value"] = self._get_grouping_label_value(
-                        index
-                    )
-                    break
-            else:
-                kwargs["index"] = kwargs["label"] = kwargs["value"] = None
-        elif (
-            "index" not in kwargs
-            and "value" not in kwargs
-            and "label" not in kwargs
-            and "disabled_options" in kwargs
-        ):
-            for index, option in enumerate(options):
-                if option[0] not in disabled_options:
-                    kwargs["index"] = index
-                    kwargs["label"], kwargs["value"] = options[index]
-                    break
-            else:
-                kwargs["index"] = kwargs["label"] = kwargs["value"] = None
+    @classmethod
+    def from_columns(
+        cls,
+        labels: Any,
+        values: Any = None,
+        groups: Any = None,
+        headers: List[str] = None,
+        disabled: Any = None,
+        **kwargs,
+    ) -> "DropdownExtended":
+        """Create a dropdown from columns, e.g., of a pandas DataFrame or Arrow table.
 
-        if "grouping" in kwargs:
-            kwargs["options"] = self._flat_groupings(grouping)
-        super().__init__(*args, **kwargs)
-        self._initializing_traits_ = True
+        The options are ordered by group, keeping the order of the rows within each
+        group. Groups are ordered as their headers, leaving out groups without options.
+        Requires NumPy.
 
-        if "grouping" in kwargs:
-            self._notify_trait(
-                "_grouping_labels", self._grouping_labels, self._grouping_labels
-            )
+        For Arrow `string`, `large_string` and dictionary-encoded columns of labels
+        without nulls, the labels are sent to the browser from the UTF-8 data of the
+        Arrow buffers when `compact_sync` is enabled, without copying it for `string`
+        and `large_string` columns already ordered by group.
+        The labels of any other column are encoded when sent.
+        The options are still held as Python objects, see `ColumnarGrouping`.
 
-        self._initializing_traits_ = False
+        Parameters:
+            labels: Column of option labels (NumPy array, Arrow array, pandas Series or
+                any sequence).
+            values: Column of option values. Defaults to the labels.
+            groups: Column of the group of each option, either dictionary-encoded
+                (Arrow) or categorical (pandas), where the categories are the group
+                headers, or integer codes into `headers`. Options with a missing or
+                negative code are un-grouped. Defaults to no grouping.
+            headers: The group headers for integer codes in `groups`.
+            disabled: Boolean mask of disabled options. Note, options are disabled by
+                label, i.e., all options with the label of a masked option are disabled.
+            **kwargs: Any other traits of the widget, except `options` and `grouping`.
+
+        """
+        if "options" in kwargs or "grouping" in kwargs:
+            raise ValueError(
+                "The options must be passed as columns, not as `options` or `grouping`."
+            )
+        columns = ColumnarGrouping(labels, values, groups, headers, disabled)
+        if columns.disabled_options:
+            kwargs["disabled_options"] = list(
+                dict.fromkeys(
+                    list(kwargs.get("disabled_options", ())) + columns.disabled_options
+                )
+            )
+        return cls(
+            _prepared_grouping=(
+                columns.grouping,
+                columns.flat_index,
+                columns.labels_buffers,
+            ),
+            **kwargs,
+        )
 
-    @traitlets.validate("disabled_options")
-    def _validate_disabled_options(self, proposal) -> List[str]:
-        """Ensure disabled_options values are part of the list of options"""
-        if proposal.value is None or not proposal.value:
-            return []
-        proposal_diff = set(proposal.value).difference_update(set(self._options_labels))
-        assert (
-            not proposal_diff
-        ), f"Invalid passed options for 'disabled_options': {proposal_diff}"
+    @traitlets.validate("virtual", "collapsible")
+    def _validate_virtual(self, proposal) -> bool:
+        """Ensure virtual mode is only set when creating the widget"""
+        if self.comm is not None:
+            raise traitlets.TraitError(
+                f"`{proposal.trait.name}` can only be set when creating the widget."
+            )
         return proposal.value
 
-    @traitlets.observe("disabled_options")
-    def _set_disabled_options(self, change) -> None:
-        """Ensure the widget is updated properly."""
-        disabled_options = change.new
-        self.set_trait("_disabled_options_labels", disabled_options)
+    @traitlets.observe("virtual", "collapsible")
+    def _set_virtual(self, change) -> None:
+        """Use the virtual view, or the tree view of the collapsible groups"""
+        if self.collapsible and not self.virtual:
+            self.virtual = True
+            return
+        self._view_name = (
+            "DropdownExtendedTreeView"
+            if self.collapsible
+            else "DropdownExtendedVirtualView"
+            if self.virtual
+            else "DropdownExtendedView"
+        )
+        self._update_virtual_state()
+
+    @traitlets.observe("compact_sync")
+    def _resend_labels(self, _) -> None:
+        """Re-send the labels in the new format"""
+        if self.comm is not None and not self.virtual:
+            self.send_state(list(_LABEL_TRAITS))
+
+    @traitlets.observe(*_LABEL_TRAITS)
+    def _invalidate_pages(self, _) -> None:
+        """Let the virtual view know that its cached pages are outdated"""
+        if self.virtual and not self._initializing_traits_:
+            if self._batch_changes is not None:
+                self._batch_changes.add("pages")
+                return
+            with self.hold_sync():
+                self._update_virtual_state()
+                self.set_trait("_pages_version", self._pages_version + 1)
+
+    @traitlets.observe("label")
+    def _set_selected_label(self, change) -> None:
+        """Send the selected label to the virtual view"""
+        if self.virtual:
+            self.set_trait("_selected_label", change.new)
+
+    def _defer(self, change: str) -> bool:
+        """Defer validating and resolving changes made in `batch_update()`
+
+        Changed options also drop any selection made before them in the batch update.
+        """
+        if self._batch_changes is None:
+            return False
+        self._batch_changes.add(change)
+        if change == "options":
+            self._batch_changes.discard("selection")
+        return True
+
+    def _options_changing(self, name: str) -> None:
+        """Refuse changing the options of a dropdown using a catalog, and stop adding
+        options from `populate()`"""
+        self._check_no_catalog(name)
+        self._cancel_population()
+        self._search_index = None
+
+    def _reset_options(self, disabled_options: Iterable[str] = None) -> None:
+        """Take the labels from the flat index, and select the first enabled
+        option
+
+        The selection is not changed in `batch_update()`, where it is resolved once
+        when leaving the context.
+        """
+        super()._reset_options(disabled_options)
+        if self._defer("options"):
+            return
+        self._update_disabled_mask()
+        self._apply_disabled_rule(patch=False)
+        index = self._disabled_state.first_enabled()
+        if self.index == index:
+            # Ensure `value` and `label` match the new options
+            self._notify_trait("index", index, index)
+        else:
+            self.index = index
+
+    def _resolve_disabled(self) -> None:
+        """Update `disabled_mask`, and move the selection to the closest enabled
+        option, if it is disabled"""
+        self._update_disabled_mask()
+        disabled = self._disabled_state
+        if self.index is None:
+            self.index = disabled.first_enabled()
+        elif not disabled.is_enabled(self.index):
+            self.index = disabled.nearest_enabled(self.index)
+
+    @traitlets.validate("disabled_mask")
+    def _validate_disabled_mask(self, proposal) -> Any:
+        """Ensure the mask matches the entries of `options`"""
+        if proposal.value is None:
+            return None
+        return self._clean_disabled_mask(proposal.value)
+
+    def _clean_disabled_mask(self, value: Any) -> Any:
+        """Return a read-only boolean copy of a mask without group headers set
+
+        Options sharing a label with a disabled option are set as well.
+        """
+        numpy = _numpy()
+        flat_index = self._flat_index
+        mask = numpy.array(value, dtype=bool)
+        if mask.shape != (len(flat_index),):
+            raise traitlets.TraitError(
+                "`disabled_mask` must be a one-dimensional boolean array with an entry for "
+                f"each of the {len(flat_index)} entries of `options`, got shape "
+                f"{mask.shape}."
+            )
+        mask[list(flat_index.header_positions)] = False
+        if len(flat_index.option_labels()) + len(flat_index.header_positions) != len(
+            flat_index
+        ):
+            # Some options share labels
+            mask = DisabledState(flat_index, _mask_labels(flat_index, mask)).to_mask()
+        mask.flags.writeable = False
+        return mask
+
+    @traitlets.observe("disabled_mask")
+    def _set_disabled_mask(self, change) -> None:
+        """Disable the options set in the mask, updating `disabled_options`"""
+        mask = change.new
+        if mask is None or self._initializing_traits_ or self._applying_mask_:
+            return
+        flat_index = self._flat_index
+        disabled_options = _mask_labels(flat_index, mask)
+        self._disabled = DisabledState.from_mask(flat_index, mask, disabled_options)
+        # The labels are known to be valid
+        self._applying_mask_ = True
+        try:
+            with self._trusting():
+                self.disabled_options = disabled_options
+        finally:
+            self._applying_mask_ = False
+
+    def _update_disabled_mask(self) -> None:
+        """Keep `disabled_mask` consistent with `disabled_options`, if a mask is used"""
+        if self.disabled_mask is None or self._applying_mask_:
+            return
+        self._applying_mask_ = True
+        try:
+            self.disabled_mask = self._disabled_state.to_mask()
+        finally:
+            self._applying_mask_ = False
+
+    @traitlets.validate("disabled_when")
+    def _validate_disabled_when(self, proposal) -> Optional[DisabledRule]:
+        """Ensure the rule is a `DisabledRule`, wrapping a plain callable"""
+        rule = proposal.value
+        if rule is None or isinstance(rule, DisabledRule):
+            return rule
+        if callable(rule):
+            return DisabledRule(rule)
+        raise traitlets.TraitError(
+            f"`disabled_when` must be a `DisabledRule` or a callable, got: {rule!r}"
+        )
+
+    @traitlets.observe("disabled_when")
+    def _set_disabled_when(self, change) -> None:
+        """Follow the dependencies of the rule, and apply it"""
+        if change.old is not None:
+            change.old.unobserve(self._disabled_dependency_changed)
+        if change.new is not None:
+            change.new.observe(self._disabled_dependency_changed)
         if not self._initializing_traits_:
-            if disabled_options:
-                if (
-                    self.grouping
-                    and self._flat_groupings()[self.index] in disabled_options
-                ):
-                    for index, label in enumerate(self._flat_groupings()):
-                        if (
-                            label not in disabled_options
-                            and label not in self._group_headers
-                        ):
-                            self.index = index
-                            break
-                    else:
-                        self.index = None
-                elif self._options_labels[self.index] in disabled_options:
-                    for index, label in enumerate(self._options_labels):
-                        if label not in disabled_options:
-                            self.index = index
-                            break
-                    else:
-                        self.index = None
-            elif self._options_labels and not self._grouping_labels:
-                if self.index == 0:
-                    self._notify_trait("index", 0, 0)
-                else:
-                    self.index = 0
+            self._apply_disabled_rule(patch=False)
+
+    def _disabled_dependency_changed(self, _) -> None:
+        """Apply the rule for the new state of its dependencies"""
+        if self._batch_changes is not None:
+            # Applied when the batch update is done
+            self._batch_changes.add("disabled_when")
+            return
+        self._apply_disabled_rule()
+
+    def _apply_disabled_rule(self, patch: bool = True) -> None:
+        """Set `disabled_options` from `disabled_when`, if any
+
+        The disabled labels are memoized by the rule per state of its dependencies.
+        With `patch`, only the changed labels are sent to the frontend, while otherwise
+        `disabled_options` is re-assigned, e.g., when the options have changed as well.
+        """
+        rule = self.disabled_when
+        if rule is None:
+            return
+        labels = rule.disabled_labels(self._flat_index)
+        current = self._disabled_state.labels
+        if not patch:
+            if current != frozenset(labels):
+                # The labels are known to be valid
+                with self._trusting():
+                    self.disabled_options = list(labels)
+            return
+        disabled = frozenset(labels)
+        self._patch_disabled_options(
+            add=[label for label in labels if label not in current],
+            remove=[label for label in self.disabled_options if label not in disabled],
+        )
+
+    def _check_no_catalog(self, name: str) -> None:
+        """Ensure the options are not changed for a dropdown using a catalog"""
+        if self.catalog is not None:
+            raise traitlets.TraitError(
+                f"`{name}` can not be changed for a dropdown using a `catalog`. Change the "
+                "catalog, or set `catalog` to `None` first."
+            )
+
+    @traitlets.observe("catalog")
+    def _set_catalog(self, change) -> None:
+        """Use the options of the catalog, or keep them as the dropdown's own"""
+        if change.old is not None:
+            change.old._dropdowns.discard(self)
+        if change.new is not None:
+            change.new._dropdowns.add(self)
+            self._cancel_population()
+        if self._initializing_traits_:
+            return
+        if change.new is not None:
+            self._apply_catalog()
+        elif self.comm is not None and not self.virtual:
+            self.send_state(list(_CATALOG_TRAITS))
+
+    def _apply_catalog(self) -> None:
+        """Use the (changed) options of the catalog
+
+        The options are shared with the catalog, and not sent to the browser.
+        The selected option is kept, if it is still an enabled option.
+        """
+        catalog = self.catalog
+        flat_index = catalog._flat_index
+        selected_label = self.label if self.index is not None else None
+        self._search_index = None
+        self._replace_options(catalog._grouping_full, flat_index)
+        self._update_disabled_mask()
+        self._apply_disabled_rule(patch=False)
+
+        if self._defer("options"):
+            return
+        disabled = self._disabled_state
+        index = next(
+            (
+                position
+                for position in flat_index.positions(selected_label)
+                if disabled.is_enabled(position)
+            ),
+            None,
+        )
+        if index is None:
+            index = disabled.first_enabled()
+        if index == self.index:
+            # Ensure `value` and `label` match the new options
+            self._notify_trait("index", index, index)
+        else:
+            self.index = index
+
+    def _apply_cascade(
+        self,
+        grouping: Tuple[Tuple[str, Tuple[Tuple[str, Any]]]],
+        flat_index: GroupingIndex,
+    ) -> None:
+        """Use a grouping of the mapping table of a `CascadeLink`
+
+        The browser switches to the grouping by itself, so neither the labels nor the
+        selection are sent to it. The selection is resolved the same way as there:
+        It is kept if the labels are unchanged, and otherwise the first enabled option
+        is selected.
+        Disabled options that are not options of the grouping are left out.
+        """
+        headers = tuple([header for header, _ in self._grouping_labels])
+        unchanged = flat_index is self._flat_index or (
+            tuple(self._options_labels) == flat_index.labels
+            and headers == flat_index.group_headers
+            and tuple(self._group_depths) == flat_index.group_depths
+        )
+        previous_index = self.index
+        self._cancel_population()
+        self._search_index = None
+        with self._without_sync(*_CATALOG_TRAITS, "_disabled_options_labels"):
+            self._replace_options(grouping, flat_index)
+        self._update_disabled_mask()
+
+        index = previous_index if unchanged else self._disabled_state.first_enabled()
+        with self._without_sync("index"):
+            if index == previous_index:
+                # Ensure `value` and `label` match the new options
+                self._notify_trait("index", index, index)
             else:
-                self.index = None
-
-    @traitlets.validate("grouping")
-    def _validate_grouping(self, proposal) -> Tuple[Tuple[str, List[str]]]:
-        """Ensure all group headers are unique"""
-        if proposal.value is None or not proposal.value:
-            return ()
-        assert len([_ for _ in proposal.value if _[0]]) == len(
-            set([_[0] for _ in proposal.value if _[0]])
-        ), (
-            "Group headers must be unique (ignoring empty un-grouping headers - empty strings). "
-            f"Passed group headers: {[_[0] for _ in proposal.value]}"
-        )
-        self._grouping_full = _make_grouping(proposal.value)
-        return proposal.value
+                self.index = index
+        # Changes of the disabled options, and thereby the selection, are sent
+        self._apply_disabled_rule()
 
-    @traitlets.observe("grouping")
-    def _set_grouping(self, change) -> None:
-        """Put options into desired grouping, updating `options`"""
-        grouping = self._grouping_full
-        self.options = self._flat_groupings(grouping)
-        self.set_trait(
-            "_grouping_labels",
+    @contextmanager
+    def batch_update(self):
+        """Update several traits at once.
+
+        Within the context, changes to `grouping`, `options`, `disabled_options` and the
+        selection (`index`, `value` or `label`) are validated, and the selection is
+        resolved, only once when leaving the context.
+        All resulting changes are sent to the frontend in a single message.
+
+        Example:
+            ```python
+            with dropdown.batch_update():
+                dropdown.disabled_options = ["c"]
+                dropdown.grouping = [("Letters", ["a", "b", "c"])]
+                dropdown.value = "b"
+            ```
+
+        """
+        if self._batch_changes is not None:
+            yield
+            return
+
+        with self.hold_sync():
+            previous_disabled = self.disabled_options
+            self._batch_changes = set()
+            try:
+                yield
+            finally:
+                changes, self._batch_changes = self._batch_changes, None
+                self._finish_batch_update(changes, previous_disabled)
+
+    def _finish_batch_update(
+        self, changes: Set[str], previous_disabled: List[str] = ()
+    ) -> None:
+        """Validate and resolve the changes made in `batch_update()`
+
+        Invalid disabled options are replaced by the disabled options from before the
+        batch update (that are still options), before the error is raised, so they are
+        neither kept nor sent to the frontend.
+        """
+        error = None
+        if "options" in changes or "disabled_when" in changes:
+            # Only the disabled options are patched, unless the options changed as well
+            self._apply_disabled_rule(patch="options" not in changes)
+        if "disabled_options" in changes and self.validate:
+            try:
+                self._check_disabled_options(self.disabled_options)
+            except traitlets.TraitError as exc:
+                error = exc
+                option_labels = self._flat_index.option_labels()
+                with self._trusting():
+                    self.disabled_options = [
+                        label for label in previous_disabled if label in option_labels
+                    ]
+
+        disabled = self._disabled_state
+        self._update_disabled_mask()
+        if "options" in changes and "selection" not in changes:
+            index = disabled.first_enabled()
+        else:
+            index = self.index
+            if index is None:
+                if "selection" not in changes:
+                    index = disabled.first_enabled()
+            elif not disabled.is_enabled(index):
+                index = disabled.nearest_enabled(index)
+
+        if index != self.index:
+            self.index = index
+        elif "options" in changes:
+            # Ensure `value` and `label` match the new options
+            self._notify_trait("index", index, index)
+
+        if "pages" in changes:
+            self._invalidate_pages(None)
+        if error is not None:
+            raise error
+
+    def disable(self, *labels: str) -> None:
+        """Disable the options with the given labels.
+
+        Contrary to re-assigning `disabled_options`, only the change is sent to the
+        frontend.
+        """
+        unknown = [label for label in labels if not self._flat_index.positions(label)]
+        if unknown:
+            raise ValueError(f"Invalid options to disable: {unknown}")
+        disabled = self._disabled_state
+        self._patch_disabled_options(
+            add=list(dict.fromkeys(label for label in labels if label not in disabled))
+        )
+
+    def enable(self, *labels: str) -> None:
+        """Enable the options with the given labels.
+
+        Contrary to re-assigning `disabled_options`, only the change is sent to the
+        frontend.
+        """
+        disabled = self._disabled_state
+        self._patch_disabled_options(
+            remove=list(dict.fromkeys(label for label in labels if label in disabled))
+        )
+
+    def search(self, query: str, limit: int = 10) -> List[int]:
+        """Search for enabled options.
+
+        Options match if every word in `query` is the start of a word in their label or
+        group header.
+        The search index is built on first use and kept up to date with the options.
+
+        Parameters:
+            query: The words to search for (case-insensitive).
+            limit: The maximum number of results.
+
+        Returns:
+            The indices of the best matching options, best match first.
+
+        """
+        return self._search.search(query, self._disabled_state, limit=limit)
+
+    def nearest_enabled(self, index: int) -> Optional[int]:
+        """Return the index of the enabled option closest to `index`.
+
+        Group headers and disabled options are never returned.
+        If two enabled options are equally close, the latter is returned.
+        `None` is returned if there are no enabled options.
+        """
+        return self._disabled_state.nearest_enabled(index)
+
+    def select_next_enabled(self) -> Optional[int]:
+        """Select the next enabled option after the current selection.
+
+        If nothing is selected, the first enabled option is selected.
+        The selection is kept if there is no enabled option after it.
+
+        Returns:
+            The (possibly unchanged) selected index.
+
+        """
+        if self.index is None:
+            index = self._disabled_state.first_enabled()
+        else:
+            index = self._disabled_state.next_enabled(self.index)
+        if index is not None:
+            self.index = index
+        return self.index
+
+    def select_previous_enabled(self) -> Optional[int]:
+        """Select the previous enabled option before the current selection.
+
+        If nothing is selected, the last enabled option is selected.
+        The selection is kept if there is no enabled option before it.
+
+        Returns:
+            The (possibly unchanged) selected index.
+
+        """
+        index = self._disabled_state.previous_enabled(
+            self.index if self.index is not None else len(self._flat_index)
+        )
+        if index is not None:
+            self.index = index
+        return self.index
+
+    def add_group(
+        self, header: str, options: Iterable[Any], position: int = None
+    ) -> None:
+        """Add a new group of options.
+
+        Only the change is sent to the frontend, not the whole grouping.
+
+        Parameters:
+            header: The group header. An empty string adds un-grouped options.
+            options: Iterable of values or (label, value)-pairs, similar to `options`.
+            position: The position of the group among the existing groups.
+                Defaults to appending the group.
+                For nested groups, the group is added as a top-level group, so the
+                position must not be within the sub-groups of a group.
+
+        """
+        if header and header in self._group_headers:
+            raise ValueError(
+                f"Group headers must be unique. {header!r} already exists."
+            )
+        grouping = self._current_grouping()
+        position = len(grouping) if position is None else position
+        position = min(max(position, 0), len(grouping))
+        depths = self._flat_index.group_depths
+        if depths and position < len(grouping) and depths[position]:
+            raise ValueError(
+                "Groups can only be added as top-level groups, not among the sub-groups "
+                f"of a group. Group {position} is a sub-group."
+            )
+        options = _make_interned_options(options)
+        flat_index = self._flat_index
+
+        start = (
+            flat_index.group_positions[position]
+            if position < len(grouping)
+            else len(flat_index)
+        )
+        shift = len(options) + (1 if header else 0)
+        self._apply_grouping_delta(
+            grouping[:position] + ((header, options),) + grouping[position:],
+            {
+                "op": "add_group",
+                "group": position,
+                "header": header,
+                "labels": [label for label, _ in options],
+            },
+            selected=self._shifted_selection(start, shift),
+            depths=depths[:position] + (0,) + depths[position:] if depths else None,
+        )
+
+    def remove_group(self, header: str) -> None:
+        """Remove a group and all of its options.
+
+        Only the change is sent to the frontend, not the whole grouping.
+        Nested groups can only be removed if they have no sub-groups.
+        """
+        position = self._flat_index.group(header)
+        depths = self._flat_index.group_depths
+        if self._flat_index.children(position):
+            raise ValueError(
+                f"Group {header!r} has sub-groups, which must be removed first."
+            )
+        grouping = self._current_grouping()
+        start, stop = self._flat_index.group_span(position)
+
+        if self.index is not None and start <= self.index < stop:
+            selected = None
+        else:
+            selected = self._shifted_selection(stop, start - stop)
+        self._apply_grouping_delta(
+            grouping[:position] + grouping[position + 1 :],
+            {"op": "remove_group", "group": position},
+            selected=selected,
+            depths=depths[:position] + depths[position + 1 :] if depths else None,
+        )
+
+    def insert_options(
+        self, header: str, options: Iterable[Any], position: int = None
+    ) -> None:
+        """Insert options into an existing group.
+
+        Only the change is sent to the frontend, not the whole grouping.
+
+        Parameters:
+            header: The header of the group to insert the options into. An empty
+                string inserts un-grouped options, adding them as a group if there are
+                no options.
+            options: Iterable of values or (label, value)-pairs, similar to `options`.
+            position: The position of the options among the existing options of the
+                group. Defaults to appending the options.
+
+        """
+        grouping = self._current_grouping()
+        if not grouping and not header:
+            self.add_group(header, options)
+            return
+        group = (
+            0
+            if not self._grouping_full and not header
+            else self._flat_index.group(header)
+        )
+        group_options = grouping[group][1]
+        position = len(group_options) if position is None else position
+        position = min(max(position, 0), len(group_options))
+        options = _make_interned_options(options)
+
+        start = self._flat_index.group_positions[group] + position
+        if header:
+            start += 1
+        self._apply_grouping_delta(
+            grouping[:group]
+            + (
+                (
+                    header,
+                    group_options[:position] + options + group_options[position:],
+                ),
+            )
+            + grouping[group + 1 :],
+            {
+                "op": "insert_options",
+                "group": group,
+                "offset": position,
+                "labels": [label for label, _ in options],
+            },
+            selected=self._shifted_selection(start, len(options)),
+        )
+
+    def remove_options(self, *labels: str) -> None:
+        """Remove all options with the given labels.
+
+        Only the change is sent to the frontend, not the whole grouping.
+        """
+        flat_index = self._flat_index
+        removed_labels = set(labels)
+        removed = sorted(
+            position
+            for label in removed_labels
+            for position in flat_index.positions(label)
+        )
+        if not removed:
+            return
+
+        if self.index is None:
+            selected = None
+        elif flat_index.label(
+            self.index
+        ) in removed_labels and not flat_index.is_header(self.index):
+            selected = None
+        else:
+            selected = self.index - bisect_left(removed, self.index)
+        self._apply_grouping_delta(
             tuple(
-                [
-                    (header, tuple([_[0] for _ in options]))
-                    for header, options in grouping
-                ]
+                (
+                    header,
+                    tuple(
+                        option for option in options if option[0] not in removed_labels
+                    ),
+                )
+                for header, options in self._current_grouping()
             ),
+            {"op": "remove_options", "labels": sorted(removed_labels)},
+            selected=selected,
         )
-        if not self._initializing_traits_:
-            for index, option in enumerate(self._flat_groupings()):
-                if (
-                    option not in self.disabled_options
-                    and option not in self._group_headers
-                ):
-                    if self.index == index:
-                        self._notify_trait("index", index, index)
-                    else:
-                        self.index = index
-                    break
+
+    def populate(
+        self, source: Any, batch_size: int = 1000, interval: float = 0.1
+    ) -> "asyncio.Task[None]":
+        """Add groups of options from an asynchronous source, as they arrive.
+
+        The groups are added on the running asyncio event loop, e.g., the kernel's, in
+        batches, sending only the added options to the frontend.
+        Options can be selected as soon as they have been added, and the first enabled
+        option is selected if nothing is selected.
+        `loading` is `True` until all groups have been added.
+
+        Adding options stops if `grouping`, `options` or `catalog` is set, if the widget
+        is closed, or if `populate()` is called again.
+
+        Example:
+            ```python
+            async def groups():
+                async for category in query_categories():
+                    yield category.name, await query_products(category)
+
+            dropdown.populate(groups())
+            await dropdown.wait_loaded()
+            ```
+
+        Parameters:
+            source: Asynchronous iterable of (header, options)-pairs, or an awaitable
+                returning an iterable of these, e.g., a coroutine.
+                Options with the same header as the last group, or an existing
+                (non-empty) header, are appended to that group, so the options of a
+                group can be streamed in chunks.
+            batch_size: The number of options to add in a single batch.
+                The batches grow with the number of options, so the dropdown is not
+                updated more often than needed for large sources.
+            interval: The time in seconds to wait for more options before adding the
+                options received so far.
+
+        Returns:
+            The task adding the options, which can be awaited or cancelled.
+
+        """
+        with self.hold_sync():
+            self._cancel_population()
+            population = asyncio.ensure_future(
+                self._populate(source, batch_size, interval)
+            )
+            population.add_done_callback(self._population_done)
+            self._population = population
+            self.set_trait("loading", True)
+        return population
+
+    async def wait_loaded(self) -> None:
+        """Wait until the options of `populate()` have been added.
+
+        Returns immediately if no options are being added, and when adding options is
+        stopped.
+
+        Raises:
+            Exception: Any error raised by the source of `populate()`.
+
+        """
+        population = self._population
+        if population is None:
+            return
+        try:
+            await asyncio.shield(population)
+        except asyncio.CancelledError:
+            if not population.cancelled():
+                raise
+
+    @traitlets.validate("index")
+    def _validate_index(self, proposal) -> Optional[int]:
+        """Keep track of selections made in `batch_update()`
+
+        This also covers re-selecting the current index, which is not observed.
+        """
+        index = super()._validate_index(proposal)
+        if self._batch_changes is not None:
+            self._batch_changes.add("selection")
+        return index
+
+    @traitlets.observe("index")
+    def _track_selection(self, _) -> None:
+        """Keep track of selections made in `batch_update()`
+
+        This also covers de-selecting, since `None` is not validated.
+        """
+        if self._batch_changes is not None:
+            self._batch_changes.add("selection")
+
+    def close(self) -> None:
+        """Stop `populate()` and following `disabled_when`, and close the widget"""
+        self._cancel_population()
+        if self.disabled_when is not None:
+            self.disabled_when.unobserve(self._disabled_dependency_changed)
+        super().close()
+
+    def get_state(self, key=None, drop_defaults=False) -> Dict[str, Any]:
+        """Leave out the traits not used by the current view, or taken from the catalog"""
+        state = super().get_state(key=key, drop_defaults=drop_defaults)
+        for name in _VIRTUAL_TRAITS if not self.virtual else _LABEL_TRAITS:
+            state.pop(name, None)
+        if self.catalog is not None:
+            for name in _CATALOG_TRAITS:
+                state.pop(name, None)
+        return state
+
+    def _should_send_property(self, key, value) -> bool:
+        """Do not sync traits that are patched through custom messages"""
+        if key in self._unsynced_traits:
+            return False
+        if key in (_LABEL_TRAITS if self.virtual else _VIRTUAL_TRAITS):
+            return False
+        if key in _CATALOG_TRAITS and self.catalog is not None:
+            return False
+        return super()._should_send_property(key, value)
+
+    def _handle_frontend_msg(self, _, content: Dict[str, Any], buffers) -> None:
+        """Handle custom messages from the frontend"""
+        if content.get("event") == "request_page":
+            self._send_page(int(content["page"]))
+        elif content.get("event") == "request_group":
+            self._send_group(content.get("header"))
+        elif content.get("event") == "search":
+            indices = self.search(content["query"], limit=int(content.get("limit", 10)))
+            self.send(
+                {
+                    "event": "search_results",
+                    "request_id": content.get("request_id"),
+                    "indices": indices,
+                    "labels": [self._flat_index.label(index) for index in indices],
+                }
+            )
+
+    def _update_virtual_state(self) -> None:
+        """Update the number of entries and selected label for the virtual view"""
+        self.set_trait("_virtual_count", len(self._flat_index))
+        self.set_trait("_selected_label", self.label)
+
+    def _send_page(self, page: int) -> None:
+        """Send a page of entries to the virtual view"""
+        flat_index = self._flat_index
+        disabled = self._disabled_state
+        start = page * self._virtual_page_size
+        stop = min(start + self._virtual_page_size, len(flat_index))
+
+        labels, headers, indented, disabled_offsets, levels = [], [], [], [], []
+        for offset, index in enumerate(range(start, stop)):
+            labels.append(flat_index.label(index))
+            if flat_index.group_depths:
+                group, position = flat_index.locate(index)
+                levels.append(
+                    flat_index.depth(group)
+                    + (
+                        1
+                        if position is not None and flat_index.group_headers[group]
+                        else 0
+                    )
+                )
+            if flat_index.is_header(index):
+                headers.append(offset)
+                continue
+            if (
+                flat_index.group_headers
+                and flat_index.group_headers[flat_index.locate(index)[0]]
+            ):
+                indented.append(offset)
+            if not disabled.is_enabled(index):
+                disabled_offsets.append(offset)
+
+        self.send(
+            {
+                "event": "page",
+                "version": self._pages_version,
+                "page": page,
+                "labels": labels,
+                "headers": headers,
+                "indented": indented,
+                "disabled": disabled_offsets,
+                # Indentation of nested groups, replacing `indented`
+                "levels": levels if flat_index.group_depths else None,
+            }
+        )
+
+    def _send_group(self, header: Optional[str]) -> None:
+        """Send the entries directly below a group to the tree view
+
+        The entries are the options of the group (and of its un-grouped sub-groups),
+        followed by the headers of its sub-groups, which are sent when expanded.
+        The top-level entries are sent for a `None` header.
+        """
+        flat_index = self._flat_index
+        disabled = self._disabled_state
+        labels, indices, headers, disabled_offsets = [], [], [], []
+
+        def add_options(start: int, stop: int) -> None:
+            for index in range(start, stop):
+                if not disabled.is_enabled(index):
+                    disabled_offsets.append(len(labels))
+                labels.append(flat_index.label(index))
+                indices.append(index)
+
+        if header is None:
+            children = flat_index.children()
+        else:
+            try:
+                group = flat_index.group(header)
+            except ValueError:
+                return  # Removed since requested
+            start, stop = flat_index.group_span(group)
+            add_options(start + 1, stop)
+            children = flat_index.children(group)
+
+        for child in children:
+            start, stop = flat_index.group_span(child)
+            if flat_index.group_headers[child]:
+                # Only the header, the options are sent when expanded
+                headers.append(len(labels))
+                labels.append(flat_index.label(start))
+                indices.append(start)
+            else:
+                add_options(start, stop)
+
+        self.send(
+            {
+                "event": "group",
+                "version": self._pages_version,
+                "header": header,
+                "labels": labels,
+                "indices": indices,
+                "headers": headers,
+                "disabled": disabled_offsets,
+            }
+        )
+
+    @contextmanager
+    def _without_sync(self, *names: str):
+        """Update traits without syncing them to the frontend"""
+        previous = self._unsynced_traits
+        self._unsynced_traits = previous | set(names)
+        try:
+            yield
+        finally:
+            self._unsynced_traits = previous
+
+    def _patch_disabled_options(
+        self, add: List[str] = None, remove: List[str] = None
+    ) -> None:
+        """Update `disabled_options`, sending only the change to the frontend"""
+        add, remove = add or [], remove or []
+        if not add and not remove:
+            return
+
+        removed = set(remove)
+        self._disabled = self._disabled_state.patched(add, remove)
+        with self.hold_sync():
+            # The added labels are known to be labels of options
+            with self._trusting(), self._without_sync("_disabled_options_labels"):
+                self.disabled_options = [
+                    label for label in self.disabled_options if label not in removed
+                ] + add
+            if not self.virtual:
+                self.send({"event": "disabled_patch", "add": add, "remove": remove})
+
+    def _current_grouping(self) -> Tuple[Tuple[str, Tuple[Tuple[str, Any]]]]:
+        """Get the full grouping, treating plain options as a single un-grouped group"""
+        if self._grouping_full:
+            return self._grouping_full
+        return (("", self._options_full),) if self._options_full else ()
+
+    def _shifted_selection(self, start: int, shift: int) -> Optional[int]:
+        """Return the selected index after shifting all entries from `start`"""
+        if self.index is None:
+            return None
+        return self.index + shift if self.index >= start else self.index
+
+    def _apply_grouping_delta(
+        self,
+        grouping: Tuple[Tuple[str, Tuple[Tuple[str, Any]]]],
+        delta: Dict[str, Any],
+        selected: Optional[int],
+        depths: Tuple[int] = None,
+    ) -> None:
+        """Update the grouping in place and send only `delta` to the frontend.
+
+        `selected` is the new index of the selected option, or `None` if it was removed
+        or nothing was selected.
+        `depths` are the new depths of nested groups, if the groups have changed.
+        """
+        if self.catalog is not None:
+            raise ValueError(
+                "The options of a dropdown using a `catalog` can not be changed. Change "
+                "the catalog, or set `catalog` to `None` first."
+            )
+        previous_index = self.index
+        previous_flat_index = self._flat_index
+        flat_index = GroupingIndex(
+            grouping, previous_flat_index.group_depths if depths is None else depths
+        )
+        with self._without_sync(
+            "_grouping_labels",
+            "_group_depths",
+            "_options_labels",
+            "_disabled_options_labels",
+        ):
+            self._replace_options(grouping, flat_index)
+        self._update_disabled_mask()
+
+        if self._search_index is not None:
+            previous_labels = previous_flat_index.option_labels()
+            labels = flat_index.option_labels()
+            previous_headers = set(previous_flat_index.group_headers)
+            headers = set(flat_index.group_headers)
+            self._search_index.discard(
+                previous_labels - labels, previous_headers - headers
+            )
+            self._search_index.add(labels - previous_labels, headers - previous_headers)
+
+        if not self.virtual:
+            self.send({"event": "grouping_delta", **delta})
+
+        if selected is None:
+            selected = (
+                self._disabled_state.nearest_enabled(previous_index)
+                if previous_index is not None
+                else self._disabled_state.first_enabled()
+            )
+            if selected == previous_index:
+                self._notify_trait("index", selected, selected)
+        if selected != previous_index:
+            self.index = selected
+        self._apply_disabled_rule()
+
+    async def _populate(self, source: Any, batch_size: int, interval: float) -> None:
+        """Add the groups of `source` in batches, see `populate()`"""
+        loop = asyncio.get_running_loop()
+        pending: List[Tuple[str, Tuple[Tuple[str, Any]]]] = []
+        pending_size = 0
+        timer: Optional[asyncio.TimerHandle] = None
+        population = asyncio.current_task()
+        error: Optional[Exception] = None
+
+        def flush_later() -> None:
+            """Flush from the timer, raising any error in the task instead of the loop"""
+            nonlocal error
+            try:
+                flush()
+            except Exception as exc:
+                error = exc
+                population.cancel()
+
+        def flush() -> None:
+            nonlocal pending, pending_size, timer
+            if timer is not None:
+                timer.cancel()
+                timer = None
+            if pending:
+                groups, pending, pending_size = pending, [], 0
+                self._extend_grouping(groups)
+
+        def receive(group: Any) -> None:
+            nonlocal pending_size, timer
+            try:
+                header, options = group
+            except (TypeError, ValueError) as exc:
+                raise ValueError(
+                    f"Expected (header, options)-pairs, got: {group!r}"
+                ) from exc
+            options = _make_interned_options(options)
+            pending.append((str(header), options))
+            pending_size += len(options)
+            if pending_size >= max(batch_size, len(self._flat_index)):
+                flush()
+            elif timer is None:
+                timer = loop.call_later(interval, flush_later)
+
+        try:
+            if isawaitable(source):
+                source = await source
+            if isinstance(source, AsyncIterable):
+                async for group in source:
+                    receive(group)
             else:
-                self.index = None
+                for group in source or ():
+                    receive(group)
+        except asyncio.CancelledError:
+            if error is not None:
+                raise error from None
+            raise
+        except Exception:
+            flush()  # Keep the groups received before the error
+            raise
+        else:
+            flush()
+        finally:
+            if timer is not None:
+                timer.cancel()
+
+    def _population_done(self, population: "asyncio.Task[None]") -> None:
+        """Reset `loading` when the options of `populate()` have been added"""
+        if population is self._population:
+            self.set_trait("loading", False)
+
+    def _cancel_population(self) -> None:
+        """Stop adding options from `populate()`"""
+        if self._population is not None and not self._population.done():
+            self._population.cancel()
+            self.set_trait("loading", False)
+
+    def _extend_grouping(
+        self, groups: List[Tuple[str, Tuple[Tuple[str, Any]]]]
+    ) -> None:
+        """Append groups of options, sending only the change to the frontend.
+
+        Options are appended to the last group if it has the same header, else to the
+        existing group with the same (non-empty) header, else as a new group.
+        """
+        grouping = list(self._current_grouping())
+        flat_index = self._flat_index
+        existing = len(grouping)
+        positions = {header: group for group, (header, _) in enumerate(grouping)}
+        changes: Dict[int, List[Any]] = {}
+        shifts: List[Tuple[int, int]] = []  # Flat start and size of appended options
+
+        for header, options in groups:
+            if grouping and grouping[-1][0] == header:
+                group = len(grouping) - 1
+            else:
+                group = positions.get(header) if header else None
+            if group is None:
+                group = positions[header] = len(grouping)
+                grouping.append((header, options))
+            else:
+                grouping[group] = (header, grouping[group][1] + options)
+                if group < existing:
+                    shifts.append((flat_index.group_span(group)[1], len(options)))
+            labels = [label for label, _ in options]
+            if group in changes:
+                changes[group][2].extend(labels)
+            else:
+                changes[group] = [group, header, labels]
+
+        selected = self.index
+        if selected is not None:
+            selected += sum(size for start, size in shifts if selected >= start)
+        depths = self._flat_index.group_depths
+        self._apply_grouping_delta(
+            tuple(grouping),
+            {"op": "extend", "groups": list(changes.values())},
+            selected=selected,
+            depths=depths + (0,) * (len(grouping) - existing) if depths else None,
+        )
 
     @property
-    def _group_headers(self) -> List[str]:
-        """Get group headers from self._grouping_labels"""
-        return [_[0] for _ in self._grouping_labels]
+    def _search(self) -> SearchIndex:
+        """Get the search index, building it if needed"""
+        if self._search_index is None:
+            flat_index = self._flat_index
+            self._search_index = SearchIndex(
+                flat_index.option_labels(), flat_index.group_headers
+            )
+        return self._search_index
+
+    @property
+    def _group_headers(self) -> Tuple[str]:
+        """Get group headers from the flat index"""
+        return self._flat_index.group_headers
 
     def _flat_groupings(
         self, grouping: Tuple[Tuple[str, Tuple[Tuple[str, Any]]]] = None
     ) -> List[Tuple[str, Any]]:
         """Get grouping similar to dropdown - a flat list of entries."""
-        grouping = grouping if grouping is not None else self._grouping_labels
+        if grouping is None:
+            return list(self._flat_index.entries)
 
         res = []
         for header, options in grouping:
@@ -243,9 +1486,10 @@ class DropdownExtended(Dropdown):
 
         The index is expected to match `_flat_groupings`, i.e., the actual dropdown.
         """
-        grouping = grouping if grouping is not None else self._grouping_full
-
-        res = self._flat_groupings(grouping)[index]
+        if grouping is None:
+            res = self._flat_index.entry(index)
+        else:
+            res = self._flat_groupings(grouping)[index]
         if not isinstance(res, tuple) or len(res) != 2:
             raise ValueError(
                 f"Found a grouped value that is not a tuple with length 2: {res!r}"
@@ -0,0 +1,543 @@
+"""Index structures for (grouped) options
+
+The structures are built to be compact for very large sets of options: they share the
+option tuples and label strings with the widget rather than copying them, and store
+flat indices in arrays or as plain integers rather than in lists of lists.
+"""
+from array import array
+from bisect import bisect_left, bisect_right
+import re
+from sys import intern
+from typing import (
+    Any,
+    Dict,
+    FrozenSet,
+    Iterable,
+    KeysView,
+    List,
+    Optional,
+    Tuple,
+    Union,
+)
+
+
+__all__ = ("DisabledState", "GroupingIndex", "SearchIndex")
+
+_TOKEN_PATTERN = re.compile(r"\w+")
+
+
+class GroupingIndex:
+    """Flat index of a dropdown's entries.
+
+    The flat positions match the entries of the actual dropdown, i.e., non-empty group
+    headers take up a position of their own, followed by the options of the group.
+
+    The index is built once, in a single pass, from an already normalized grouping or
+    list of options and must be replaced whenever these change.
+    The `entries` and `labels` tuples can be shared as the widget's options and labels,
+    as can the tuples of `values()` and `group_labels()`, which are built on first use.
+
+    Nested groups are given as the depth of each group in the depth-first order of the
+    grouping, where a group is below the closest preceding group of lower depth.
+    """
+
+    __slots__ = (
+        "entries",
+        "labels",
+        "group_headers",
+        "header_positions",
+        "group_positions",
+        "group_depths",
+        "_header_set",
+        "_label_positions",
+        "_values",
+        "_group_labels",
+        "__weakref__",  # Memoized rules, see `ipywidgets_extended.rules`
+    )
+
+    def __init__(
+        self,
+        grouping: Iterable[Tuple[str, Tuple[Tuple[str, Any]]]] = (),
+        depths: Iterable[int] = (),
+    ):
+        entries: List[Tuple[str, Any]] = []
+        labels: List[str] = []
+        # The flat index of a label, or a list of flat indices for non-unique labels
+        self._label_positions: Dict[str, Union[int, List[int]]] = {}
+        self.group_positions: List[int] = []
+        group_headers, header_positions = [], []
+        add_label = self._label_positions.setdefault
+
+        for header, options in grouping:
+            group_headers.append(header)
+            self.group_positions.append(len(entries))
+            if header:
+                header_positions.append(len(entries))
+                entries.append((header, None))
+                labels.append(header)
+            start = len(entries)
+            entries.extend(options)
+            labels.extend([label for label, _ in options])
+            for position in range(start, len(entries)):
+                existing = add_label(labels[position], position)
+                if existing != position:
+                    if type(existing) is list:
+                        existing.append(position)
+                    else:
+                        self._label_positions[labels[position]] = [existing, position]
+
+        self.entries: Tuple[Tuple[str, Any]] = tuple(entries)
+        self.labels: Tuple[str] = tuple(labels)
+        self.group_headers: Tuple[str] = tuple(group_headers)
+        self.header_positions: Tuple[int] = tuple(header_positions)
+        self._header_set = frozenset(header_positions)
+        # Empty for a single level of groups
+        self.group_depths: Tuple[int] = tuple(depths)
+        if self.group_depths and len(self.group_depths) != len(group_headers):
+            raise ValueError("There must be a depth for each group.")
+        self._values: Optional[Tuple[Any]] = None
+        self._group_labels: Optional[Tuple[Tuple[str, Tuple[str]]]] = None
+
+    @classmethod
+    def from_options(cls, options: Tuple[Tuple[str, Any]]) -> "GroupingIndex":
+        """Create index for un-grouped options"""
+        return cls((("", options),))
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def is_header(self, index: int) -> bool:
+        """Whether the flat index is the position of a group header"""
+        return index in self._header_set
+
+    def label(self, index: int) -> str:
+        """Return label of flat index"""
+        return self.labels[index]
+
+    def entry(self, index: int) -> Tuple[str, Any]:
+        """Return label,value-pair of flat index"""
+        return self.entries[index]
+
+    def index(self, label: str) -> int:
+        """Return the first flat index of the option with `label`
+
+        Raises:
+            ValueError: If there is no option with the given label.
+
+        """
+        try:
+            positions = self._label_positions[label]
+        except KeyError as exc:
+            raise ValueError(f"{label!r} is not an option") from exc
+        return positions[0] if type(positions) is list else positions
+
+    def values(self) -> Tuple[Any]:
+        """Return the values of all entries, `None` for group headers"""
+        if self._values is None:
+            self._values = tuple([value for _, value in self.entries])
+        return self._values
+
+    def option_labels(self) -> KeysView[str]:
+        """Return the (unique) labels of all options"""
+        return self._label_positions.keys()
+
+    def positions(self, label: str) -> List[int]:
+        """Return all flat indices of options with `label`"""
+        positions = self._label_positions.get(label)
+        if positions is None:
+            return []
+        return positions if type(positions) is list else [positions]
+
+    def group(self, header: str) -> int:
+        """Return the position of the (first) group with `header`
+
+        Raises:
+            ValueError: If there is no group with the given header.
+
+        """
+        try:
+            return self.group_headers.index(header)
+        except ValueError as exc:
+            raise ValueError(f"{header!r} is not a group header") from exc
+
+    def group_labels(self) -> Tuple[Tuple[str, Tuple[str]]]:
+        """Return (header, option labels)-pairs of all groups"""
+        if self._group_labels is None:
+            self._group_labels = tuple(
+                (header, tuple(self.labels[start + (1 if header else 0) : stop]))
+                for header, (start, stop) in zip(
+                    self.group_headers,
+                    zip(self.group_positions, self.group_positions[1:] + [len(self)]),
+                )
+            )
+        return self._group_labels
+
+    def depth(self, group: int) -> int:
+        """Return the nesting depth of a group, zero for top-level groups"""
+        return self.group_depths[group] if self.group_depths else 0
+
+    def children(self, group: Optional[int] = None) -> List[int]:
+        """Return the groups directly below `group`, or the top-level groups"""
+        if not self.group_depths:
+            return list(range(len(self.group_headers))) if group is None else []
+        start, depth = (0, 0) if group is None else (group + 1, self.depth(group) + 1)
+        children = []
+        for child in range(start, len(self.group_depths)):
+            if self.group_depths[child] < depth:
+                break
+            if self.group_depths[child] == depth:
+                children.append(child)
+        return children
+
+    def group_span(self, group: int) -> Tuple[int, int]:
+        """Return the flat (start, stop) of a group, including its header"""
+        start = self.group_positions[group]
+        stop = (
+            self.group_positions[group + 1]
+            if group + 1 < len(self.group_positions)
+            else len(self.entries)
+        )
+        return start, stop
+
+    def locate(self, index: int) -> Tuple[int, Optional[int]]:
+        """Return (group, offset) of flat index
+
+        The offset is `None` for group headers.
+        """
+        if not 0 <= index < len(self.entries):
+            raise IndexError(f"flat index out of range: {index}")
+        # Empty groups share their position with the following group
+        group = bisect_right(self.group_positions, index) - 1
+        offset = index - self.group_positions[group]
+        if self.group_headers[group]:
+            offset -= 1
+        return group, offset if offset >= 0 else None
+
+
+class DisabledState:
+    """Selectable state of a dropdown's flat entries.
+
+    Disabled option labels are kept in a hashed set, while a bitmask over the flat
+    indices marks all entries that cannot be selected, i.e., group headers and disabled
+    options.
+    A sorted array of the selectable flat indices is built on first use for O(log n)
+    navigation between selectable entries.
+    """
+
+    __slots__ = ("index", "labels", "_mask", "_enabled_positions")
+
+    def __init__(self, index: GroupingIndex, labels: Iterable[str] = ()):
+        self.index = index
+        self.labels: FrozenSet[str] = frozenset(labels)
+        self._mask = bytearray((len(index) + 7) // 8)
+
+        for position in index.header_positions:
+            self._mask[position >> 3] |= 1 << (position & 7)
+        for label in self.labels:
+            for position in index.positions(label):
+                self._mask[position >> 3] |= 1 << (position & 7)
+
+        self._enabled_positions: Optional["array[int]"] = None
+
+    @classmethod
+    def from_mask(
+        cls, index: GroupingIndex, mask: Any, labels: Iterable[str]
+    ) -> "DisabledState":
+        """Create the state from a NumPy boolean mask of the disabled flat entries
+
+        Parameters:
+            index: The flat index the mask is aligned with.
+            mask: Boolean mask of the disabled options, where no group headers and all
+                options sharing a label with a disabled option are set.
+            labels: The labels of the disabled options.
+
+        """
+        import numpy
+
+        new = cls.__new__(cls)
+        new.index = index
+        new.labels = frozenset(labels)
+        unselectable = numpy.array(mask, dtype=bool)
+        unselectable[list(index.header_positions)] = True
+        new._mask = bytearray(numpy.packbits(unselectable, bitorder="little"))
+        new._enabled_positions = array(
+            "I", numpy.flatnonzero(~unselectable).astype(numpy.uint32).tobytes()
+        )
+        return new
+
+    def __contains__(self, label: str) -> bool:
+        return label in self.labels
+
+    def disabled_bitmap(self) -> bytearray:
+        """Return a bitmask over the flat indices of the disabled options only
+
+        Contrary to the internal bitmask, group headers are not set.
+        """
+        bitmap = bytearray(self._mask)
+        for position in self.index.header_positions:
+            bitmap[position >> 3] &= ~(1 << (position & 7))
+        return bitmap
+
+    def to_mask(self) -> Any:
+        """Return a NumPy boolean mask over the flat indices of the disabled options"""
+        import numpy
+
+        return numpy.unpackbits(
+            numpy.frombuffer(self.disabled_bitmap(), dtype=numpy.uint8),
+            count=len(self.index),
+            bitorder="little",
+        ).astype(bool)
+
+    def patched(
+        self, add: Iterable[str] = (), remove: Iterable[str] = ()
+    ) -> "DisabledState":
+        """Return a copy with the labels in `add` disabled and in `remove` enabled"""
+        add, remove = frozenset(add), frozenset(remove)
+        new = DisabledState.__new__(DisabledState)
+        new.index = self.index
+        new.labels = (self.labels - remove) | add
+        new._mask = bytearray(self._mask)
+        new._enabled_positions = None
+
+        for label in remove - add:
+            for position in self.index.positions(label):
+                new._mask[position >> 3] &= ~(1 << (position & 7))
+        for label in add:
+            for position in self.index.positions(label):
+                new._mask[position >> 3] |= 1 << (position & 7)
+        return new
+
+    def is_enabled(self, index: int) -> bool:
+        """Whether the flat index is a selectable option"""
+        return not self._mask[index >> 3] & (1 << (index & 7))
+
+    def first_enabled(self) -> Optional[int]:
+        """Return the first selectable flat index, if any"""
+        if self._enabled_positions is not None:
+            return self._enabled_positions[0] if self._enabled_positions else None
+        for byte_index, byte in enumerate(self._mask):
+            if byte != 0xFF:
+                index = (byte_index << 3) + ((~byte & (byte + 1)).bit_length() - 1)
+                return index if index < len(self.index) else None
+        return None
+
+    @property
+    def _enabled(self) -> "array[int]":
+        """Sorted selectable flat indices"""
+        if self._enabled_positions is None:
+            enabled = array("I")
+            for byte_index, byte in enumerate(self._mask):
+                if byte == 0xFF:
+                    continue
+                start = byte_index << 3
+                if byte == 0:
+                    enabled.extend(range(start, start + 8))
+                else:
+                    enabled.extend(
+                        start + bit for bit in range(8) if not byte & (1 << bit)
+                    )
+            # Remove padding bits of the last byte
+            while enabled and enabled[-1] >= len(self.index):
+                enabled.pop()
+            self._enabled_positions = enabled
+        return self._enabled_positions
+
+    def enabled_between(self, start: int = 0, stop: int = None) -> "array[int]":
+        """Return the sorted selectable flat indices from `start` up to `stop`"""
+        enabled = self._enabled
+        return enabled[
+            bisect_left(enabled, start) : len(enabled)
+            if stop is None
+            else bisect_left(enabled, stop)
+        ]
+
+    def next_enabled(self, index: int) -> Optional[int]:
+        """Return the first selectable flat index after `index`, if any"""
+        position = bisect_right(self._enabled, index)
+        return self._enabled[position] if position < len(self._enabled) else None
+
+    def previous_enabled(self, index: int) -> Optional[int]:
+        """Return the last selectable flat index before `index`, if any"""
+        position = bisect_left(self._enabled, index)
+        return self._enabled[position - 1] if position > 0 else None
+
+    def nearest_enabled(self, index: int) -> Optional[int]:
+        """Return the selectable flat index closest to `index`, if any
+
+        If two selectable flat indices are equally close, the following one is returned.
+        """
+        position = bisect_left(self._enabled, index)
+        if position < len(self._enabled) and self._enabled[position] == index:
+            return index
+        following = self._enabled[position] if position < len(self._enabled) else None
+        previous = self._enabled[position - 1] if position > 0 else None
+        if following is None or (
+            previous is not None and index - previous < following - index
+        ):
+            return previous
+        return following
+
+
+def _tokenize(text: str) -> List[str]:
+    """Split text into lower-cased word tokens"""
+    return _TOKEN_PATTERN.findall(text.lower())
+
+
+class SearchIndex:
+    """Token-prefix index over option labels and group headers.
+
+    The index is keyed on labels and headers rather than flat indices, so it stays
+    valid when entries are shifted and can be updated incrementally.
+    Matching labels are resolved to flat indices through a `GroupingIndex`.
+    """
+
+    __slots__ = ("_labels", "_headers")
+
+    def __init__(self, labels: Iterable[str] = (), headers: Iterable[str] = ()):
+        # Tokens are interned, as most are shared by many labels
+        self._labels: List[Tuple[str, str]] = sorted(
+            (intern(token), label)
+            for label in set(labels)
+            for token in _tokenize(label)
+        )
+        self._headers: List[Tuple[str, str]] = sorted(
+            (intern(token), header)
+            for header in set(headers)
+            if header
+            for token in _tokenize(header)
+        )
+
+    def add(self, labels: Iterable[str] = (), headers: Iterable[str] = ()) -> None:
+        """Add labels and group headers to the index
+
+        The new entries are sorted and merged into the index in a single pass.
+        """
+        self._labels = self._merged(self._labels, labels)
+        self._headers = self._merged(self._headers, headers)
+
+    def discard(self, labels: Iterable[str] = (), headers: Iterable[str] = ()) -> None:
+        """Remove labels and group headers from the index, in a single pass each"""
+        for name, texts in (("_labels", labels), ("_headers", headers)):
+            texts = set(texts)
+            if texts:
+                setattr(
+                    self,
+                    name,
+                    [entry for entry in getattr(self, name) if entry[1] not in texts],
+                )
+
+    @staticmethod
+    def _merged(
+        entries: List[Tuple[str, str]], texts: Iterable[str]
+    ) -> List[Tuple[str, str]]:
+        """Return the sorted entries with the (token, text)-pairs of `texts` merged in"""
+        added = []
+        for entry in sorted(
+            {(token, text) for text in set(texts) for token in _tokenize(text)}
+        ):
+            position = bisect_left(entries, entry)
+            if position == len(entries) or entries[position] != entry:
+                added.append((intern(entry[0]), entry[1]))
+        if not added:
+            return entries
+        # Timsort merges the two sorted runs in a single pass
+        merged = entries + added
+        merged.sort()
+        return merged
+
+    @staticmethod
+    def _prefixed(entries: List[Tuple[str, str]], prefix: str) -> Tuple[int, int]:
+        """Return the (start, stop) range of entries with a token starting with `prefix`"""
+        return (
+            bisect_left(entries, (prefix, "")),
+            bisect_left(entries, (prefix + "\U0010ffff", "")),
+        )
+
+    def search(self, query: str, state: DisabledState, limit: int = None) -> List[int]:
+        """Return flat indices of the enabled options matching all words of `query`
+
+        Options match a word if a word of their label or group header starts with it.
+        Results are ordered by exact label matches, label prefix matches, label word
+        matches and group header matches, and then by flat index.
+
+        Candidates are taken from the most selective word only, and then checked
+        against the remaining words.
+        """
+        tokens = _tokenize(query)
+        if not tokens:
+            return []
+        query = query.strip().lower()
+        index = state.index
+
+        def candidates(token: str) -> Tuple[List[str], List[int]]:
+            start, stop = self._prefixed(self._labels, token)
+            labels = [label for _, label in self._labels[start:stop]]
+            start, stop = self._prefixed(self._headers, token)
+            groups = []
+            for _, header in self._headers[start:stop]:
+                try:
+                    groups.append(index.group(header))
+                except ValueError:
+                    pass  # Removed header
+            return labels, groups
+
+        def size(token: str) -> int:
+            start, stop = self._prefixed(self._labels, token)
+            size = stop - start
+            start, stop = self._prefixed(self._headers, token)
+            for _, header in self._headers[start:stop]:
+                try:
+                    group_start, group_stop = index.group_span(index.group(header))
+                except ValueError:
+                    continue
+                size += group_stop - group_start
+            return size
+
+        driver = min(tokens, key=size)
+        others = [token for token in tokens if token != driver]
+        group_tokens: Dict[int, List[str]] = {}
+
+        def matches(tokens: List[str], group: int) -> bool:
+            """Whether all other query words match the label or group header"""
+            if group not in group_tokens:
+                group_tokens[group] = _tokenize(index.group_headers[group])
+            return all(
+                any(word.startswith(token) for word in tokens)
+                or any(word.startswith(token) for word in group_tokens[group])
+                for token in others
+            )
+
+        labels, groups = candidates(driver)
+        ranked = []
+        for label in set(labels):
+            label_tokens = _tokenize(label)
+            for position in index.positions(label):
+                if state.is_enabled(position) and matches(
+                    label_tokens, index.locate(position)[0]
+                ):
+                    ranked.append((self._rank(label, query, tokens), position))
+        matched = set(labels)
+        for group in set(groups):
+            start, stop = index.group_span(group)
+            for position in range(start, stop):
+                if not state.is_enabled(position):
+                    continue
+                label = index.label(position)
+                if label not in matched and matches(_tokenize(label), group):
+                    ranked.append((3, position))
+
+        ranked.sort()
+        return [position for _, position in ranked[:limit]]
+
+    @staticmethod
+    def _rank(label: str, query: str, tokens: List[str]) -> int:
+        """Rank a matched label, lower is better"""
+        label = label.lower()
+        if label == query:
+            return 0
+        if label.startswith(query):
+            return 1
+        words = _tokenize(label)
+        if all(any(word.startswith(token) for word in words) for token in tokens):
+            return 2
+        return 3
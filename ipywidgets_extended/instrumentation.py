@@ -0,0 +1,232 @@
+"""Comm traffic instrumentation
+
+Opt-in counting of the messages and bytes sent to and received from the frontend, per
+trait, for the extended widgets.
+Custom messages are counted per event as `"custom:<event>"`.
+
+Example:
+    ```python
+    from ipywidgets_extended import enable_sync_stats, sync_stats
+
+    enable_sync_stats()
+    ...
+    sync_stats()  # Aggregate over all live extended widgets
+    dropdown.sync_stats()  # For a single widget
+    ```
+
+"""
+import json
+import time
+from typing import Any, Dict, Iterable, List, Optional
+from weakref import WeakSet
+
+from ipywidgets.widgets.widget import _remove_buffers
+
+
+__all__ = (
+    "disable_sync_stats",
+    "enable_sync_stats",
+    "reset_sync_stats",
+    "sync_stats",
+)
+
+_ENABLED = False
+_INSTRUMENTED: "WeakSet[SyncStatsMixin]" = WeakSet()
+
+
+def enable_sync_stats() -> None:
+    """Start counting the comm traffic of the extended widgets"""
+    global _ENABLED
+    _ENABLED = True
+
+
+def disable_sync_stats() -> None:
+    """Stop counting the comm traffic of the extended widgets
+
+    Already counted traffic is kept until reset.
+    """
+    global _ENABLED
+    _ENABLED = False
+
+
+def reset_sync_stats() -> None:
+    """Reset the counted comm traffic of all extended widgets"""
+    for widget in list(_INSTRUMENTED):
+        widget.reset_sync_stats()
+
+
+def sync_stats() -> Dict[str, Dict[str, Any]]:
+    """Return the counted comm traffic per trait, summed over all live extended widgets
+
+    See `SyncStatsMixin.sync_stats()` for the format.
+    """
+    total: Dict[str, TraitStats] = {}
+    for widget in list(_INSTRUMENTED):
+        if widget.comm is None:
+            continue  # Closed
+        for name, stats in widget._sync_stats.items():
+            total.setdefault(name, TraitStats()).merge(stats)
+    return {name: stats.as_dict() for name, stats in sorted(total.items())}
+
+
+def _size(value: Any) -> int:
+    """Return the size of the JSON serialized value in bytes"""
+    return len(json.dumps(value, default=str, separators=(",", ":")).encode("utf-8"))
+
+
+def _buffer_sizes(
+    buffer_paths: Iterable[List[Any]], buffers: Optional[List[Any]]
+) -> Dict[str, int]:
+    """Return the size of the binary buffers in bytes per (top-level) trait"""
+    sizes: Dict[str, int] = {}
+    for path, buffer in zip(buffer_paths or (), buffers or ()):
+        sizes[path[0]] = sizes.get(path[0], 0) + memoryview(buffer).nbytes
+    return sizes
+
+
+class TraitStats:
+    """Counted comm traffic of a single trait (or custom event)"""
+
+    __slots__ = (
+        "sent",
+        "sent_bytes",
+        "last_sent",
+        "received",
+        "received_bytes",
+        "last_received",
+    )
+
+    def __init__(self):
+        self.sent = 0
+        self.sent_bytes = 0
+        self.last_sent: Optional[float] = None
+        self.received = 0
+        self.received_bytes = 0
+        self.last_received: Optional[float] = None
+
+    def merge(self, other: "TraitStats") -> None:
+        """Add the counts of another `TraitStats`"""
+        self.sent += other.sent
+        self.sent_bytes += other.sent_bytes
+        self.received += other.received
+        self.received_bytes += other.received_bytes
+        self.last_sent = max(
+            (_ for _ in (self.last_sent, other.last_sent) if _ is not None),
+            default=None,
+        )
+        self.last_received = max(
+            (_ for _ in (self.last_received, other.last_received) if _ is not None),
+            default=None,
+        )
+
+    def as_dict(self) -> Dict[str, Any]:
+        """Return the counts as a dictionary"""
+        return {name: getattr(self, name) for name in self.__slots__}
+
+
+class SyncStatsMixin:
+    """Count the comm traffic of a widget per trait, when enabled
+
+    Must be mixed in before `ipywidgets.Widget`.
+    """
+
+    _sync_stats: Dict[str, TraitStats] = None
+    _opening_ = False
+    _opening_state: Optional[Dict[str, Any]] = None
+
+    def sync_stats(self) -> Dict[str, Dict[str, Any]]:
+        """Return the counted comm traffic per trait.
+
+        The counts are only recorded while enabled with `enable_sync_stats()`.
+
+        Returns:
+            A dictionary of trait names (or `"custom:<event>"` for custom messages) to
+            the number of messages sent to (`sent`) and received from (`received`) the
+            frontend, their serialized size in bytes (`sent_bytes` and
+            `received_bytes`), and the time (`time.time()`) of the latest message
+            (`last_sent` and `last_received`).
+
+        """
+        return {name: stats.as_dict() for name, stats in sorted(self._stats().items())}
+
+    def reset_sync_stats(self) -> None:
+        """Reset the counted comm traffic"""
+        self._sync_stats = {}
+
+    def _stats(self) -> Dict[str, TraitStats]:
+        """Get the counted comm traffic, registering the widget if needed"""
+        if self._sync_stats is None:
+            self._sync_stats = {}
+            _INSTRUMENTED.add(self)
+        return self._sync_stats
+
+    def _count(self, sent: bool, sizes: Dict[str, int]) -> None:
+        """Count a message with the given sizes per trait"""
+        stats, now = self._stats(), time.time()
+        for name, size in sizes.items():
+            trait = stats.get(name)
+            if trait is None:
+                trait = stats[name] = TraitStats()
+            if sent:
+                trait.sent += 1
+                trait.sent_bytes += size
+                trait.last_sent = now
+            else:
+                trait.received += 1
+                trait.received_bytes += size
+                trait.last_received = now
+
+    def _count_message(self, sent: bool, data: Dict[str, Any], buffers) -> None:
+        """Count a comm message, split per trait"""
+        if "state" in data:
+            sizes = _buffer_sizes(data.get("buffer_paths"), buffers)
+            for name, value in data["state"].items():
+                sizes[name] = sizes.get(name, 0) + _size(value)
+        elif data.get("method") == "custom":
+            content = data.get("content") or {}
+            sizes = {
+                f"custom:{content.get('event')}": _size(content)
+                + sum(memoryview(buffer).nbytes for buffer in buffers or ())
+            }
+        else:
+            return
+        self._count(sent, sizes)
+
+    def open(self) -> None:
+        """Count the initial state sent when opening the comm
+
+        The state serialized for the opening message is counted, see `get_state()`,
+        instead of serializing the state again.
+        """
+        if not _ENABLED or self.comm is not None:
+            super().open()
+            return
+        self._opening_ = True
+        try:
+            super().open()
+            state = self._opening_state
+        finally:
+            self._opening_, self._opening_state = False, None
+        if self.comm is not None and state is not None:
+            state, buffer_paths, buffers = _remove_buffers(state)
+            self._count_message(
+                True, {"state": state, "buffer_paths": buffer_paths}, buffers
+            )
+
+    def get_state(self, key=None, drop_defaults=False) -> Dict[str, Any]:
+        """Get the serialized state, keeping it when opening the comm to count it"""
+        state = super().get_state(key=key, drop_defaults=drop_defaults)
+        if self._opening_ and key is None:
+            self._opening_state = state
+        return state
+
+    def _send(self, msg, buffers=None) -> None:
+        if _ENABLED and self.comm is not None:
+            self._count_message(True, msg, buffers)
+        super()._send(msg, buffers=buffers)
+
+    def _handle_msg(self, msg) -> None:
+        if _ENABLED:
+            data = msg.get("content", {}).get("data", {})
+            self._count_message(False, data, msg.get("buffers"))
+        super()._handle_msg(msg)
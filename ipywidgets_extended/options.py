@@ -0,0 +1,569 @@
+"""Grouped options with disabled options, shared by the extended selection widgets
+
+The options, or grouping, are normalized and indexed once in a flat `GroupingIndex`, and
+the disabled options are held in a `DisabledState` over the same flat indices.
+The labels are synced to the browser in the (optionally compact) format of
+`ipywidgets_extended.serialization`, where they are rendered by the shared TypeScript
+helpers.
+"""
+from collections.abc import Mapping
+from contextlib import contextmanager
+from sys import intern
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+from ipywidgets.widgets.trait_types import TypedTuple
+from ipywidgets.widgets.widget_selection import _make_options
+from traitlets import traitlets
+
+from ipywidgets_extended.grouping import DisabledState, GroupingIndex
+from ipywidgets_extended.serialization import (
+    disabled_to_json,
+    grouping_to_json,
+    labels_to_json,
+)
+
+
+__all__ = ("GroupedOptionsMixin",)
+
+
+class _TrustedList(traitlets.List):
+    """List trait not validating its elements while the widget is trusted"""
+
+    def validate_elements(self, obj, value):
+        if obj._trusted_:
+            return value
+        return super().validate_elements(obj, value)
+
+
+class _TrustedTuple(traitlets.Tuple):
+    """Tuple trait not validating its elements while the widget is trusted"""
+
+    def validate_elements(self, obj, value):
+        if obj._trusted_:
+            return value
+        return super().validate_elements(obj, value)
+
+
+class _TrustedTypedTuple(TypedTuple):
+    """Typed tuple trait not validating its elements while the widget is trusted"""
+
+    def validate_elements(self, obj, value):
+        if obj._trusted_:
+            return value
+        return super().validate_elements(obj, value)
+
+
+def _make_interned_options(options: Iterable[Any]) -> Tuple[Tuple[str, Any]]:
+    """Standardize options similar to `_make_options()`, interning the labels
+
+    Equal labels are thereby shared, also between widgets, instead of being held once
+    for each widget.
+    """
+    if isinstance(options, Mapping):
+        options = _make_options(options)
+    options = tuple(options)
+    if all(
+        isinstance(option, (list, tuple)) and len(option) == 2 for option in options
+    ):
+        return tuple([(intern(str(label)), value) for label, value in options])
+    return tuple([(intern(str(value)), value) for value in options])
+
+
+def _make_grouping(
+    grouping: List[Tuple[str, List[str]]]
+) -> Tuple[Tuple[str, Tuple[Tuple[str, Any]]]]:
+    """Utilize `_make_interned_options()` to set inner options in grouping"""
+    return tuple(
+        [(header, _make_interned_options(options)) for header, options in grouping]
+    )
+
+
+def _checked_groups(
+    grouping: Iterable[Tuple[str, Iterable[Any]]]
+) -> Iterator[Tuple[str, Iterable[Any]]]:
+    """Yield the groups of a grouping, checking them as they are consumed
+
+    Raises:
+        TraitError: If a group is not a (header, options)-pair with a string header, or
+            if a non-empty group header is not unique.
+
+    """
+    headers: Set[str] = set()
+    for group in grouping:
+        if (
+            not isinstance(group, (tuple, list))
+            or len(group) != 2
+            or not isinstance(group[0], str)
+        ):
+            raise traitlets.TraitError(
+                f"Expected (header, options)-pairs, got: {group!r}"
+            )
+        header = group[0]
+        if header:
+            if header in headers:
+                raise traitlets.TraitError(
+                    "Group headers must be unique (ignoring empty un-grouping "
+                    f"headers - empty strings). Duplicated group header: {header!r}"
+                )
+            headers.add(header)
+        yield group
+
+
+def _flatten_tree(tree: Mapping, depth: int = 0) -> Iterator[Tuple[str, Any, int]]:
+    """Yield (header, options, depth) of the groups of a nested grouping, depth first
+
+    Raises:
+        TraitError: If un-grouped options (an empty header) are given sub-groups.
+
+    """
+    for header, children in tree.items():
+        if isinstance(children, Mapping):
+            if not header:
+                raise traitlets.TraitError(
+                    "Un-grouped options (an empty header) can not have sub-groups."
+                )
+            yield header, (), depth
+            yield from _flatten_tree(children, depth + 1)
+        else:
+            yield header, children, depth
+
+
+def _split_tree(
+    grouping: Iterable[Any],
+) -> Tuple[Iterable[Tuple[str, Iterable[Any]]], Tuple[int]]:
+    """Return the groups of a, possibly nested, grouping and their depths
+
+    A nested grouping is a mapping of headers to options or to a mapping of sub-groups.
+    The depths are empty for a single level of groups.
+    """
+    if not isinstance(grouping, Mapping):
+        return grouping, ()
+    groups = list(_flatten_tree(grouping))
+    depths = tuple([depth for _, _, depth in groups])
+    return [(header, options) for header, options, _ in groups], (
+        depths if any(depths) else ()
+    )
+
+
+def _nest_grouping(
+    grouping: Tuple[Tuple[str, Tuple[Tuple[str, Any]]]], depths: Tuple[int]
+) -> Dict[str, Any]:
+    """Return the nested grouping of groups and their depths, see `_split_tree()`"""
+    nested: Dict[str, Any] = {}
+    parents = [nested]  # The mapping of each depth
+    for position, ((header, options), depth) in enumerate(zip(grouping, depths)):
+        del parents[depth + 1 :]
+        siblings = parents[depth]
+        if position + 1 < len(depths) and depths[position + 1] > depth:
+            siblings[header] = {"": options} if options else {}
+            parents.append(siblings[header])
+        elif not header and header in siblings:
+            siblings[header] += options
+        else:
+            siblings[header] = options
+    return nested
+
+
+def _grouping_value(
+    grouping: Tuple[Tuple[str, Tuple[Tuple[str, Any]]]], depths: Tuple[int]
+) -> Any:
+    """Return the value of the `grouping` trait for a normalized grouping
+
+    The value is the normalized grouping, or the nested grouping for nested groups,
+    however the grouping was given.
+    """
+    return _nest_grouping(grouping, depths) if depths else grouping
+
+
+def _make_grouping_index(
+    grouping: Iterable[Tuple[str, Iterable[Any]]], validate: bool = True
+) -> Tuple[Tuple[Tuple[str, Tuple[Tuple[str, Any]]]], GroupingIndex]:
+    """Normalize, validate and index a grouping in a single pass
+
+    Parameters:
+        grouping: Iterable of (header, options)-pairs, or a nested grouping, see
+            `_split_tree()`.
+        validate: Whether to check the groups, see `_checked_groups()`.
+
+    Returns:
+        The normalized grouping, similar to `_make_grouping()`, and its flat index.
+
+    """
+    normalized = []
+    grouping, depths = _split_tree(grouping)
+
+    def groups():
+        for header, options in _checked_groups(grouping) if validate else grouping:
+            normalized.append((header, _make_interned_options(options)))
+            yield normalized[-1]
+
+    flat_index = GroupingIndex(groups(), depths)
+    return tuple(normalized), flat_index
+
+
+class GroupedOptionsMixin(traitlets.HasTraits):
+    """Grouping and disabled options of an extended selection widget
+
+    Provides the `grouping`, `disabled_options`, `compact_sync` and `validate` traits,
+    and keeps the synced labels, the flat index and the disabled state up to date when
+    `options` or `grouping` change.
+
+    Widgets using the mixin create the flat index with `_prepare_options()` in
+    `__init__()`, and extend `_reset_options()` to resolve their selection when the
+    options change, and `_resolve_disabled()` when options are disabled.
+    The `_options_changing()` and `_defer()` hooks let them refuse or postpone changes.
+    """
+
+    # Additional widget properties used in the TypeScript code
+    _options_labels = traitlets.Tuple(read_only=True).tag(
+        sync=True, to_json=labels_to_json
+    )
+    _disabled_options_labels = _TrustedTuple(
+        trait=traitlets.Unicode(),
+        read_only=True,
+    ).tag(sync=True, to_json=disabled_to_json)
+    _grouping_labels = traitlets.Tuple(
+        trait=traitlets.Tuple(
+            traitlets.Unicode(),
+            traitlets.Tuple(traitlets.Unicode()),  # Similar to `_options_labels`
+        ),
+        read_only=True,
+    ).tag(sync=True, to_json=grouping_to_json)
+    _group_depths = traitlets.Tuple(read_only=True).tag(sync=True)
+
+    # The equivalent Python changeable traits
+    disabled_options = _TrustedList(
+        traitlets.Unicode(),
+        default_value=[],
+        help="The labels for the disabled options.",
+    )
+    grouping = traitlets.Any(  # Similar to `options`
+        default_value=(),
+        help=(
+            "Iterable of values, (header, ((label, value), (label, value), ...)), where the inner "
+            "iterable of labels and values can be an iterable of values only, which will result "
+            "in labels being auto-generated.\n\nAn empty string header can be used to implement "
+            "ungrouped options.\n\nGroups can be nested by passing a mapping of headers to "
+            "options, or to mappings of sub-groups, in which case the headers must be unique "
+            "across all levels.\n\nThe grouping is kept normalized, i.e., as (header, "
+            "((label, value), ...))-pairs, or for nested groups as a mapping of headers to "
+            "((label, value), ...) or to mappings of sub-groups."
+        ),
+    )
+    compact_sync = traitlets.Bool(
+        False,
+        help=(
+            "Send the labels to the browser as binary buffers (a UTF-8 blob with offsets, "
+            "and a bitmap of the disabled options) instead of JSON lists of strings."
+        ),
+    )
+    validate = traitlets.Bool(
+        True,
+        help=(
+            "Check that group headers are unique and that disabled options are options, "
+            "raising a `TraitError` otherwise.\n\nSet to `False` to skip all checks for "
+            "bulk loads from known-good sources. Invalid values then lead to undefined "
+            "behavior."
+        ),
+    )
+
+    _grouping_full: Tuple[Tuple[str, Tuple[Tuple[str, Any]]]] = ()
+    _flat_index: GroupingIndex = GroupingIndex()
+    _disabled: Optional[DisabledState] = None
+    _labels_buffers: Optional[Tuple[GroupingIndex, Dict[str, memoryview]]] = None
+    _value_positions: Optional[Dict[Any, int]] = None
+    _trusted_ = False
+    _replacing_options_ = False
+
+    @contextmanager
+    def _trusting(self):
+        """Set traits without validating nor propagating them again"""
+        previous, self._trusted_ = self._trusted_, True
+        try:
+            yield
+        finally:
+            self._trusted_ = previous
+
+    def _prepare_options(
+        self, kwargs: Dict[str, Any]
+    ) -> Tuple[Tuple[Tuple[str, Tuple[Tuple[str, Any]]]], GroupingIndex]:
+        """Normalize and index the `options` or `grouping` passed to `__init__()`
+
+        Non-mapping iterables of options are replaced by a tuple in `kwargs`, so they
+        can be iterated again.
+
+        Returns:
+            The normalized grouping, empty for `options`, and its flat index.
+
+        """
+        if "options" in kwargs and "grouping" in kwargs:
+            raise ValueError(
+                "Either `options` or `grouping` must be specified. Not both."
+            )
+        if "grouping" in kwargs:
+            return _make_grouping_index(
+                kwargs["grouping"], validate=kwargs.get("validate", True)
+            )
+        options = kwargs.get("options", ())
+        if isinstance(options, Iterable) and not isinstance(options, Mapping):
+            # Similar to `_Selection._validate_options()`
+            options = tuple(options)
+            if "options" in kwargs:
+                kwargs["options"] = options
+        return (), GroupingIndex.from_options(_make_interned_options(options))
+
+    def _init_options(self, kwargs: Dict[str, Any]) -> None:
+        """Index the options and disabled options passed to `__init__()`
+
+        The options and disabled options are then already validated and propagated,
+        when passing `kwargs` on to `__init__()` while trusted.
+        """
+        self._use_index(*self._prepare_options(kwargs))
+        if self._grouping_full:
+            # The normalized grouping, not the passed (possibly consumed) iterable
+            kwargs["grouping"] = _grouping_value(
+                self._grouping_full, self._flat_index.group_depths
+            )
+            kwargs["options"] = self._grouped_options()
+        disabled_options = kwargs.get("disabled_options", [])
+        if disabled_options and kwargs.get("validate", True):
+            self._check_disabled_options(disabled_options)
+        self.set_trait("_disabled_options_labels", tuple(disabled_options))
+        self._reset_options(disabled_options)
+
+    def _grouped_options(self) -> Tuple[Any]:
+        """The value of `options` for the entries of a grouping"""
+        return self._flat_index.entries
+
+    def _use_index(
+        self,
+        grouping: Tuple[Tuple[str, Tuple[Tuple[str, Any]]]],
+        flat_index: GroupingIndex,
+    ) -> None:
+        """Use the grouping and its flat index, taking the options and values from it
+
+        Done before the `options` trait changes, so its observers see the new values.
+        The tuples of the flat index are shared, not copied.
+        """
+        self._grouping_full, self._flat_index = grouping, flat_index
+        self._options_full = flat_index.entries
+        self._options_values = flat_index.values()
+        self._value_positions = None
+
+    def _index_options(self, disabled_options: Iterable[str] = None) -> None:
+        """Take the labels from the flat index, and update the disabled state
+
+        The tuples of the flat index are shared, not copied.
+        """
+        flat_index = self._flat_index
+        disabled_options = (
+            self.disabled_options if disabled_options is None else disabled_options
+        )
+        disabled = self._disabled
+        if (
+            disabled is None
+            or disabled.index is not flat_index
+            or disabled.labels != frozenset(disabled_options)
+        ):
+            self._disabled = DisabledState(flat_index, disabled_options)
+        self.set_trait("_options_labels", flat_index.labels)
+        self.set_trait("_group_depths", flat_index.group_depths)
+        self.set_trait(
+            "_grouping_labels", flat_index.group_labels() if self._grouping_full else ()
+        )
+
+    def _reset_options(self, disabled_options: Iterable[str] = None) -> None:
+        """Update the widget after the options have changed
+
+        Extended by the widgets to resolve their selection.
+        """
+        self._index_options(disabled_options)
+
+    def _replace_options(
+        self,
+        grouping: Tuple[Tuple[str, Tuple[Tuple[str, Any]]]],
+        flat_index: GroupingIndex,
+    ) -> None:
+        """Use an already normalized grouping and its flat index as the options
+
+        The grouping is empty for plain options. Neither the grouping nor the options
+        are validated, nor propagated, again, and the disabled options that are not
+        options of the flat index are left out.
+        The selection is left to the caller.
+        """
+        disabled_options = [
+            label for label in self.disabled_options if flat_index.positions(label)
+        ]
+        self._use_index(grouping, flat_index)
+        self._index_options(disabled_options)
+        self._replacing_options_ = True
+        try:
+            with self._trusting():
+                self.grouping = _grouping_value(grouping, flat_index.group_depths)
+                self.options = self._grouped_options()
+                if len(disabled_options) != len(self.disabled_options):
+                    self.disabled_options = disabled_options
+        finally:
+            self._replacing_options_ = False
+
+    @property
+    def _disabled_state(self) -> DisabledState:
+        """Get the selectable state of the entries, (re)building it if needed"""
+        flat_index = self._flat_index
+        if self._disabled is None or self._disabled.index is not flat_index:
+            self._disabled = DisabledState(flat_index, self.disabled_options)
+        return self._disabled
+
+    def _resolve_disabled(self) -> None:
+        """Update the selection after options have been disabled"""
+
+    def _options_changing(self, name: str) -> None:
+        """Prepare for `options` or `grouping` (`name`) being replaced by the user
+
+        Raises:
+            TraitError: If the options can not be changed.
+
+        """
+
+    def _defer(self, change: str) -> bool:
+        """Whether to defer validating and resolving a change
+
+        `change` is either `"options"` or `"disabled_options"`.
+        Widgets deferring changes, e.g., to the end of a batch update, keep track of
+        them and resolve them later.
+        """
+        return False
+
+    def _positions(self, values: Iterable[Any]) -> Tuple[int]:
+        """Return the flat indices of the (first) options with the given values
+
+        Hashable values are looked up in a dictionary built on first use, while other
+        values are compared to the option values with `equals`.
+
+        Raises:
+            TraitError: If a value is not the value of an option.
+
+        """
+        flat_index = self._flat_index
+        if self._value_positions is None:
+            self._value_positions = {}
+            for position, value in enumerate(self._options_values):
+                if flat_index.is_header(position):
+                    continue
+                try:
+                    self._value_positions.setdefault(value, position)
+                except TypeError:
+                    pass  # Unhashable
+        positions = []
+        for value in values:
+            try:
+                positions.append(self._value_positions[value])
+                continue
+            except (KeyError, TypeError):
+                pass
+            for position, option in enumerate(self._options_values):
+                if not flat_index.is_header(position) and self.equals(option, value):
+                    positions.append(position)
+                    break
+            else:
+                raise traitlets.TraitError("Invalid selection: value not found")
+        return tuple(positions)
+
+    @traitlets.validate("disabled_options")
+    def _validate_disabled_options(self, proposal) -> List[str]:
+        """Ensure disabled_options values are part of the list of options"""
+        if proposal.value is None or not proposal.value:
+            return []
+        if self._trusted_ or not self.validate or self._defer("disabled_options"):
+            return proposal.value
+        self._check_disabled_options(proposal.value)
+        return proposal.value
+
+    def _check_disabled_options(self, disabled_options: Iterable[str]) -> None:
+        """Check disabled_options values are labels of options
+
+        Only the given labels are looked up in the flat index.
+
+        Raises:
+            TraitError: If any of the values is not the label of an option.
+
+        """
+        option_labels = self._flat_index.option_labels()
+        unknown = [label for label in disabled_options if label not in option_labels]
+        if unknown:
+            raise traitlets.TraitError(
+                f"Invalid passed options for 'disabled_options': {unknown}"
+            )
+
+    @traitlets.observe("disabled_options")
+    def _set_disabled_options(self, change) -> None:
+        """Disable the options, updating the selection
+
+        A deferred change is only resolved later, and the disabled state is then
+        rebuilt on first use.
+        """
+        if self._initializing_traits_:
+            return
+        disabled_options = change.new
+        disabled = self._disabled
+        deferred = self._defer("disabled_options")
+        if deferred:
+            if disabled is not None and disabled.labels != frozenset(disabled_options):
+                self._disabled = None
+        elif (
+            disabled is None
+            or disabled.index is not self._flat_index
+            or disabled.labels != frozenset(disabled_options)
+        ):
+            self._disabled = DisabledState(self._flat_index, disabled_options)
+        # Set after the disabled state, from which the labels may be serialized
+        self.set_trait("_disabled_options_labels", tuple(disabled_options))
+        if not deferred and not self._replacing_options_:
+            self._resolve_disabled()
+
+    @traitlets.validate("grouping")
+    def _validate_grouping(self, proposal) -> Any:
+        """Normalize, validate and index the grouping
+
+        The grouping is kept in its normalized form, see `_grouping_value()`.
+        """
+        if self._trusted_:
+            return proposal.value
+        self._options_changing("grouping")
+        self._use_index(
+            *_make_grouping_index(proposal.value or (), validate=self.validate)
+        )
+        return _grouping_value(self._grouping_full, self._flat_index.group_depths)
+
+    @traitlets.observe("grouping")
+    def _set_grouping(self, _) -> None:
+        """Put options into desired grouping, updating `options`"""
+        if self._trusted_:
+            return
+        # Reset first, so observers of `options` see the updated widget
+        with self.hold_sync():
+            self._reset_options()
+            with self._trusting():
+                self.options = self._grouped_options()
+
+    @traitlets.validate("options")
+    def _validate_options(self, proposal) -> Any:
+        """Normalize the options, interning the labels, and index them"""
+        if self._trusted_:
+            return proposal.value
+        self._options_changing("options")
+        value = proposal.value
+        if isinstance(value, Iterable) and not isinstance(value, Mapping):
+            value = tuple(value)
+        self._use_index((), GroupingIndex.from_options(_make_interned_options(value)))
+        return value
+
+    @traitlets.observe("options")
+    def _propagate_options(self, _) -> None:
+        """Clear the grouping"""
+        if self._trusted_:
+            return
+        with self.hold_sync():
+            with self._trusting():
+                self.grouping = ()
+            self._reset_options()
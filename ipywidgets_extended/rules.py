@@ -0,0 +1,189 @@
+"""Rules disabling options by their values
+
+A rule is a predicate over the option values and the values of declared dependencies,
+i.e., traits of other widgets.
+Its result is memoized per state of the dependencies, so it is only evaluated again for
+a new combination of dependency values, or new options.
+"""
+from collections import OrderedDict
+from typing import Any, Callable, Iterable, Optional, Tuple
+from weakref import WeakKeyDictionary, ref
+
+from traitlets import traitlets
+
+from ipywidgets_extended.columnar import _numpy
+from ipywidgets_extended.grouping import GroupingIndex
+
+
+__all__ = ("DisabledRule",)
+
+
+def _dependency(dependency: Any) -> Tuple[traitlets.HasTraits, str]:
+    """Normalize a dependency to an (owner, trait name)-pair
+
+    A widget (or other `HasTraits` object) by itself stands for its `value` trait.
+
+    Raises:
+        ValueError: If the dependency is not a widget or a (widget, trait name)-pair, or
+            the widget has no such trait.
+
+    """
+    if isinstance(dependency, traitlets.HasTraits):
+        owner, name = dependency, "value"
+    else:
+        try:
+            owner, name = dependency
+        except (TypeError, ValueError) as exc:
+            raise ValueError(
+                "Dependencies must be widgets or (widget, trait name)-pairs, got: "
+                f"{dependency!r}"
+            ) from exc
+    if not isinstance(owner, traitlets.HasTraits) or not owner.has_trait(name):
+        raise ValueError(f"{owner!r} has no trait {name!r} to depend on")
+    return owner, name
+
+
+class DisabledRule:
+    """Disable the options for which a predicate over their values is true
+
+    The predicate is called with an option value followed by the current values of the
+    dependencies, and returns whether the option is disabled.
+    With `vectorized=True`, it is instead called once with a NumPy array of the values
+    of all options (not including group headers), and returns a boolean mask over them.
+
+    The disabled labels are memoized per state of the dependencies, for up to
+    `cache_size` states of each flat index of options, and shared by all dropdowns with
+    the same options, e.g., from an `OptionCatalog`.
+    The memoized labels of options are dropped with the options, i.e., the rule does not
+    keep replaced options alive.
+    Unhashable dependency values are not memoized.
+
+    Example:
+        ```python
+        budget = IntSlider(100, max=1000)
+        dropdown = DropdownExtended(
+            options=[("Apple", 80), ("Pear", 120)],
+            disabled_when=DisabledRule(
+                lambda price, budget: price > budget, depends_on=[budget]
+            ),
+        )
+        ```
+
+    Parameters:
+        predicate: Called with an option value, or the array of all option values if
+            `vectorized`, followed by the values of the dependencies.
+        depends_on: Widgets, whose `value` is passed to the predicate, or
+            (widget, trait name)-pairs.
+        vectorized: Whether the predicate is called once with all option values.
+        cache_size: The number of dependency states to memoize the result for.
+
+    """
+
+    def __init__(
+        self,
+        predicate: Callable[..., Any],
+        depends_on: Iterable[Any] = (),
+        vectorized: bool = False,
+        cache_size: int = 32,
+    ):
+        if not callable(predicate):
+            raise ValueError(f"The predicate must be callable, got: {predicate!r}")
+        self.predicate = predicate
+        self.dependencies = tuple(_dependency(dependency) for dependency in depends_on)
+        self.vectorized = vectorized
+        self.cache_size = cache_size
+        self._cache: "WeakKeyDictionary[GroupingIndex, OrderedDict]" = (
+            WeakKeyDictionary()
+        )
+        self._option_values: Tuple[Optional[ref], Any, Any] = (None, None, None)
+
+    def state(self) -> Tuple[Any]:
+        """Return the current values of the dependencies"""
+        return tuple(getattr(owner, name) for owner, name in self.dependencies)
+
+    def observe(self, handler: Callable[[Any], None]) -> None:
+        """Call `handler` whenever a dependency changes"""
+        for owner, name in self.dependencies:
+            owner.observe(handler, names=name)
+
+    def unobserve(self, handler: Callable[[Any], None]) -> None:
+        """Stop calling `handler` when a dependency changes"""
+        for owner, name in self.dependencies:
+            try:
+                owner.unobserve(handler, names=name)
+            except ValueError:
+                pass  # Not observed, e.g., for a widget closed before
+
+    def disabled_labels(self, index: GroupingIndex) -> Tuple[str]:
+        """Return the labels of the disabled options, in the order of the entries
+
+        The result is memoized per state of the dependencies and flat index.
+        """
+        state = self.state()
+        cache = self._cache.get(index)
+        if cache is None:
+            cache = self._cache[index] = OrderedDict()
+        try:
+            labels = cache.get(state)
+        except TypeError:  # Unhashable dependency values
+            return self._evaluate(index, state)
+        if labels is not None:
+            cache.move_to_end(state)
+            return labels
+
+        labels = self._evaluate(index, state)
+        cache[state] = labels
+        while len(cache) > self.cache_size:
+            cache.popitem(last=False)
+        return labels
+
+    def _evaluate(self, index: GroupingIndex, state: Tuple[Any]) -> Tuple[str]:
+        """Evaluate the predicate for the options of the flat index"""
+        if not self.vectorized:
+            predicate = self.predicate
+            return tuple(
+                dict.fromkeys(
+                    label
+                    for position, (label, value) in enumerate(index.entries)
+                    if not index.is_header(position) and predicate(value, *state)
+                )
+            )
+
+        numpy = _numpy()
+        positions, values = self._values(index)
+        mask = numpy.asarray(self.predicate(values, *state), dtype=bool)
+        if mask.shape != values.shape:
+            raise ValueError(
+                "A vectorized predicate must return a boolean mask with an entry for each "
+                f"of the {len(values)} options, got shape {mask.shape}."
+            )
+        labels = index.labels
+        return tuple(dict.fromkeys(labels[position] for position in positions[mask]))
+
+    def _values(self, index: GroupingIndex) -> Tuple[Any, Any]:
+        """Return the flat indices and a NumPy array of the values of the options
+
+        Kept for the latest flat index, while it is alive, since they do not depend on
+        the dependencies.
+        """
+        latest = self._option_values[0]
+        if latest is None or latest() is not index:
+            numpy = _numpy()
+            positions = numpy.array(
+                [
+                    position
+                    for position in range(len(index))
+                    if not index.is_header(position)
+                ],
+                dtype=numpy.intp,
+            )
+            entries = index.entries
+            option_values = [entries[position][1] for position in positions]
+            values = numpy.asarray(option_values)
+            if values.ndim != 1:
+                # E.g., tuples as values
+                values = numpy.empty(len(option_values), dtype=object)
+                for position, value in enumerate(option_values):
+                    values[position] = value
+            self._option_values = (ref(index), positions, values)
+        return self._option_values[1], self._option_values[2]
@@ -0,0 +1,269 @@
+"""SelectMultiple Widget Extension"""
+from typing import Any, Iterable, Iterator, List, Set, Tuple
+
+from ipywidgets.widgets.widget_selection import SelectMultiple, _MultipleSelection
+from traitlets import traitlets
+
+from ipywidgets_extended.instrumentation import SyncStatsMixin
+from ipywidgets_extended.options import GroupedOptionsMixin, _TrustedTypedTuple
+from ipywidgets_extended.version import __version__
+
+
+__all__ = ("SelectMultipleExtended",)
+
+
+def _bitmap_from_json(value: Any, _) -> bytes:
+    """Deserialize the selection bitmap, received as a binary buffer"""
+    return bytes(value) if value is not None else b""
+
+
+def _bitmap_positions(bitmap: bytes, length: int) -> Iterator[int]:
+    """Yield the flat indices set in a bitmap, skipping empty bytes"""
+    for byte_index, byte in enumerate(bitmap):
+        if not byte:
+            continue
+        start = byte_index << 3
+        for bit in range(8):
+            if byte & (1 << bit) and start + bit < length:
+                yield start + bit
+
+
+class SelectMultipleExtended(GroupedOptionsMixin, SyncStatsMixin, SelectMultiple):
+    """Extended Widget of SelectMultiple
+
+    Extensions:
+    - Disable individual options (`disabled_options`), which are de-selected.
+    - Create groupings within the list, similar to `DropdownExtended`.
+    - The selection is held as a set of flat indices and synced as a bitmap, instead of
+      a list of indices.
+    - Select all enabled options of a group (`select_group()`), or of the whole list
+      (`select_all_enabled()`), at once.
+    - Compact binary serialization of the labels (`compact_sync=True`).
+    - Opt-in counting of the comm traffic per trait (`sync_stats()`).
+
+    As for `DropdownExtended`, `index` holds flat indices, i.e., positions in the list
+    including the group headers, in ascending order.
+
+    """
+
+    _model_name = traitlets.Unicode("SelectMultipleExtendedModel").tag(sync=True)
+    _model_module = traitlets.Unicode("ipywidgets-extended").tag(sync=True)
+    _model_module_version = traitlets.Unicode(f"^{__version__}").tag(sync=True)
+    _view_name = traitlets.Unicode("SelectMultipleExtendedView").tag(sync=True)
+    _view_module = traitlets.Unicode("ipywidgets-extended").tag(sync=True)
+    _view_module_version = traitlets.Unicode(f"^{__version__}").tag(sync=True)
+
+    # Not validated per element when derived from the selection, and `index` is synced
+    # as `_selected_bitmap` instead
+    value = _TrustedTypedTuple(trait=traitlets.Any(), help="Selected values")
+    label = _TrustedTypedTuple(trait=traitlets.Unicode(), help="Selected labels")
+    index = _TrustedTypedTuple(trait=traitlets.Int(), help="Selected indices")
+
+    # Additional widget properties used in the TypeScript code, see also
+    # `GroupedOptionsMixin`
+    _selected_bitmap = traitlets.Bytes(
+        b"",
+        help=(
+            "Bitmap of the selected flat indices, where bit `i & 7` of byte `i >> 3` is "
+            "set if the entry at flat index `i` is selected."
+        ),
+    ).tag(sync=True, from_json=_bitmap_from_json)
+
+    _syncing_selection_ = False
+
+    def __init__(self, *args, **kwargs):
+        self._initializing_traits_ = True
+        self.equals = kwargs.pop("equals", lambda x, y: x == y)
+        self._selection: Set[int] = set()
+        self._init_options(kwargs)
+
+        # The options and disabled options are already validated and propagated
+        with self._trusting():
+            super(_MultipleSelection, self).__init__(*args, **kwargs)
+        self._initializing_traits_ = False
+
+    def select_group(self, header: str) -> None:
+        """Select all enabled options of a group, including those of its sub-groups
+
+        Only the entries of the group are visited.
+
+        Parameters:
+            header: The header of the group.
+
+        Raises:
+            ValueError: If there is no group with the given header.
+
+        """
+        flat_index = self._flat_index
+        disabled = self._disabled_state
+        selection = self._selection
+        added: List[int] = []
+        groups = [flat_index.group(header)]
+        while groups:
+            group = groups.pop()
+            start, stop = flat_index.group_span(group)
+            added.extend(
+                position
+                for position in range(start, stop)
+                if disabled.is_enabled(position) and position not in selection
+            )
+            groups.extend(flat_index.children(group))
+        if added:
+            selection.update(added)
+            self._sync_selection(added=added)
+
+    def select_all_enabled(self) -> None:
+        """Select all enabled options"""
+        selection = self._selection
+        added = [
+            position
+            for position in self._disabled_state.enabled_between()
+            if position not in selection
+        ]
+        if added:
+            selection.update(added)
+            self._sync_selection(added=added)
+
+    def _reset_options(self, disabled_options: Iterable[str] = None) -> None:
+        """Take the labels and values from the flat index, and clear the selection"""
+        super()._reset_options(disabled_options)
+        self._selection = set()
+        self._bitmap = bytearray((len(self._flat_index) + 7) // 8)
+        if self._initializing_traits_:
+            self.set_trait("_selected_bitmap", bytes(self._bitmap))
+        else:
+            self._sync_selection()
+
+    def _sync_selection(
+        self,
+        added: Iterable[int] = (),
+        removed: Iterable[int] = (),
+        index: Tuple[int] = None,
+    ) -> None:
+        """Update the bitmap, `index`, `label` and `value` from the selection
+
+        Only the bits of the added and removed flat indices are changed in the bitmap.
+        Unless the sorted flat indices of the selection are given as `index`, they are
+        found by merging the added flat indices into the current `index`.
+        """
+        bitmap = self._bitmap
+        for position in removed:
+            bitmap[position >> 3] &= ~(1 << (position & 7))
+        for position in added:
+            bitmap[position >> 3] |= 1 << (position & 7)
+
+        if index is None:
+            index = self.index if self._selection else ()
+            if removed and index:
+                removed = set(removed)
+                index = tuple(
+                    [position for position in index if position not in removed]
+                )
+            if added:
+                # Sorting the already sorted runs is linear
+                index = tuple(sorted(index + tuple(added)))
+        entries = self._flat_index.entries
+        # Also synced while creating the widget, which must stay trusted
+        trusted, self._trusted_ = self._trusted_, True
+        self._syncing_selection_ = True
+        try:
+            with self.hold_sync():
+                self.set_trait("_selected_bitmap", bytes(bitmap))
+                self.index = index
+                self.label = tuple([entries[position][0] for position in index])
+                self.value = tuple([entries[position][1] for position in index])
+        finally:
+            self._syncing_selection_, self._trusted_ = False, trusted
+
+    def _select(self, index: Tuple[int]) -> None:
+        """Replace the selection by the sorted flat indices of `index`
+
+        Only the changed positions of the bitmap are updated.
+        """
+        selection = set(index)
+        added = selection - self._selection
+        removed = self._selection - selection
+        self._selection = selection
+        self._sync_selection(added=added, removed=removed, index=index)
+
+    @traitlets.observe("_selected_bitmap")
+    def _set_selected_bitmap(self, change) -> None:
+        """Select the entries of a bitmap sent from the frontend
+
+        Group headers and disabled options are left out.
+        """
+        if self._syncing_selection_ or self._initializing_traits_:
+            return
+        disabled = self._disabled_state
+        self._select(
+            tuple(
+                [
+                    position
+                    for position in _bitmap_positions(change.new, len(self._flat_index))
+                    if disabled.is_enabled(position)
+                ]
+            )
+        )
+
+    @traitlets.validate("index")
+    def _validate_index(self, proposal) -> Tuple[int]:
+        """Ensure the indices are enabled options, putting them in ascending order"""
+        if self._syncing_selection_:
+            return proposal.value
+        disabled = self._disabled_state
+        length = len(self._flat_index)
+        for position in proposal.value:
+            if not 0 <= position < length:
+                raise traitlets.TraitError("Invalid selection: index out of bounds")
+            if not disabled.is_enabled(position):
+                raise traitlets.TraitError(
+                    f"Invalid selection: {position} is a group header or a disabled "
+                    "option"
+                )
+        return tuple(sorted(set(proposal.value)))
+
+    @traitlets.observe("index")
+    def _propagate_index(self, change) -> None:
+        """Update the selection, and thereby `label` and `value`"""
+        if not self._syncing_selection_:
+            self._select(change.new)
+
+    @traitlets.validate("value")
+    def _validate_value(self, proposal) -> Tuple[Any]:
+        """Replace all values with the actual objects in the options list"""
+        if self._syncing_selection_:
+            return proposal.value
+        values = self._options_values
+        return tuple([values[position] for position in self._positions(proposal.value)])
+
+    @traitlets.observe("value")
+    def _propagate_value(self, change) -> None:
+        if not self._syncing_selection_:
+            self.index = self._positions(change.new)
+
+    @traitlets.validate("label")
+    def _validate_label(self, proposal) -> Tuple[str]:
+        if self._syncing_selection_:
+            return proposal.value
+        option_labels = self._flat_index.option_labels()
+        if any(label not in option_labels for label in proposal.value):
+            raise traitlets.TraitError("Invalid selection: label not found")
+        return proposal.value
+
+    @traitlets.observe("label")
+    def _propagate_label(self, change) -> None:
+        if not self._syncing_selection_:
+            flat_index = self._flat_index
+            self.index = tuple([flat_index.index(label) for label in change.new])
+
+    def _resolve_disabled(self) -> None:
+        """De-select the disabled options"""
+        disabled = self._disabled_state
+        removed = [
+            position
+            for position in self._selection
+            if not disabled.is_enabled(position)
+        ]
+        if removed:
+            self._selection.difference_update(removed)
+            self._sync_selection(removed=removed)
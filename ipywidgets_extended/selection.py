@@ -0,0 +1,179 @@
+"""Select, RadioButtons and ToggleButtons Widget Extensions"""
+from typing import Any, Iterable, Optional
+
+from ipywidgets.widgets.widget_selection import (
+    RadioButtons,
+    Select,
+    ToggleButtons,
+    _Selection,
+)
+from traitlets import traitlets
+
+from ipywidgets_extended.instrumentation import SyncStatsMixin
+from ipywidgets_extended.options import GroupedOptionsMixin
+from ipywidgets_extended.version import __version__
+
+
+__all__ = ("SelectExtended", "RadioButtonsExtended", "ToggleButtonsExtended")
+
+
+class SelectionExtendedMixin(GroupedOptionsMixin):
+    """Single selection of an enabled option among grouped options
+
+    Group headers and disabled options cannot be selected.
+    By default, the first enabled option is selected, and if the selected option is
+    disabled, the closest enabled option is selected instead.
+    """
+
+    def __init__(self, *args, **kwargs):
+        self._initializing_traits_ = True
+        self.equals = kwargs.pop("equals", lambda x, y: x == y)
+        self._init_options(kwargs)
+
+        # Ensure initialized 'index' is an enabled option (if possible)
+        if "index" not in kwargs and "value" not in kwargs and "label" not in kwargs:
+            index = self._disabled_state.first_enabled()
+            kwargs["index"] = index
+            kwargs["label"], kwargs["value"] = (
+                self._flat_index.entry(index) if index is not None else (None, None)
+            )
+
+        # The options and disabled options are already validated and propagated
+        with self._trusting():
+            super(_Selection, self).__init__(*args, **kwargs)
+        self._initializing_traits_ = False
+
+    def _reset_options(self, disabled_options: Iterable[str] = None) -> None:
+        """Take the labels and values from the flat index, and select the first enabled
+        option"""
+        super()._reset_options(disabled_options)
+        if self._initializing_traits_:
+            return
+        index = self._disabled_state.first_enabled()
+        if index is not None and self.index == index:
+            # Explicitly trigger the observers to pick up the new value and label,
+            # similar to `_Selection._propagate_options()`
+            self._notify_trait("index", index, index)
+        else:
+            self.index = index
+
+    def _resolve_disabled(self) -> None:
+        """Move the selection to the closest enabled option, if it is disabled"""
+        disabled = self._disabled_state
+        if self.index is None:
+            self.index = disabled.first_enabled()
+        elif not disabled.is_enabled(self.index):
+            self.index = disabled.nearest_enabled(self.index)
+
+    @traitlets.validate("index")
+    def _validate_index(self, proposal) -> Optional[int]:
+        """Ensure the index is an enabled option"""
+        index = proposal.value
+        if index is None:
+            return index
+        if not 0 <= index < len(self._flat_index):
+            raise traitlets.TraitError("Invalid selection: index out of bounds")
+        if not self._disabled_state.is_enabled(index):
+            raise traitlets.TraitError(
+                f"Invalid selection: {index} is a group header or a disabled option"
+            )
+        return index
+
+    @traitlets.validate("value")
+    def _validate_value(self, proposal) -> Any:
+        """Replace the value with the actual object in the options list"""
+        if proposal.value is None:
+            return None
+        return self._options_values[self._positions((proposal.value,))[0]]
+
+    @traitlets.observe("value")
+    def _propagate_value(self, change) -> None:
+        if change.new is None:
+            index = None
+        elif self.index is not None and self.equals(
+            self._options_values[self.index], change.new
+        ):
+            index = self.index
+        else:
+            index = self._positions((change.new,))[0]
+        if self.index != index:
+            self.index = index
+
+    @traitlets.validate("label")
+    def _validate_label(self, proposal) -> Optional[str]:
+        if (
+            proposal.value is not None
+            and proposal.value not in self._flat_index.option_labels()
+        ):
+            raise traitlets.TraitError("Invalid selection: label not found")
+        return proposal.value
+
+    @traitlets.observe("label")
+    def _propagate_label(self, change) -> None:
+        if change.new is None:
+            index = None
+        elif self.index is not None and self._options_labels[self.index] == change.new:
+            index = self.index
+        else:
+            index = self._flat_index.index(change.new)
+        if self.index != index:
+            self.index = index
+
+
+class SelectExtended(SelectionExtendedMixin, SyncStatsMixin, Select):
+    """Extended Widget of Select
+
+    Extensions:
+    - Disable individual options (`disabled_options`).
+    - Create groupings within the list, similar to `DropdownExtended`.
+    - Compact binary serialization of the labels (`compact_sync=True`).
+    - Opt-in counting of the comm traffic per trait (`sync_stats()`).
+
+    """
+
+    _model_name = traitlets.Unicode("SelectExtendedModel").tag(sync=True)
+    _model_module = traitlets.Unicode("ipywidgets-extended").tag(sync=True)
+    _model_module_version = traitlets.Unicode(f"^{__version__}").tag(sync=True)
+    _view_name = traitlets.Unicode("SelectExtendedView").tag(sync=True)
+    _view_module = traitlets.Unicode("ipywidgets-extended").tag(sync=True)
+    _view_module_version = traitlets.Unicode(f"^{__version__}").tag(sync=True)
+
+
+class RadioButtonsExtended(SelectionExtendedMixin, SyncStatsMixin, RadioButtons):
+    """Extended Widget of RadioButtons
+
+    Extensions:
+    - Disable individual options (`disabled_options`).
+    - Create groupings of the buttons, where the group headers are shown as labels.
+    - Compact binary serialization of the labels (`compact_sync=True`).
+    - Opt-in counting of the comm traffic per trait (`sync_stats()`).
+
+    """
+
+    _model_name = traitlets.Unicode("RadioButtonsExtendedModel").tag(sync=True)
+    _model_module = traitlets.Unicode("ipywidgets-extended").tag(sync=True)
+    _model_module_version = traitlets.Unicode(f"^{__version__}").tag(sync=True)
+    _view_name = traitlets.Unicode("RadioButtonsExtendedView").tag(sync=True)
+    _view_module = traitlets.Unicode("ipywidgets-extended").tag(sync=True)
+    _view_module_version = traitlets.Unicode(f"^{__version__}").tag(sync=True)
+
+
+class ToggleButtonsExtended(SelectionExtendedMixin, SyncStatsMixin, ToggleButtons):
+    """Extended Widget of ToggleButtons
+
+    Extensions:
+    - Disable individual options (`disabled_options`).
+    - Create groupings of the buttons, where the group headers are shown as labels.
+    - Compact binary serialization of the labels (`compact_sync=True`).
+    - Opt-in counting of the comm traffic per trait (`sync_stats()`).
+
+    `tooltips` and `icons` are given per option, i.e., not including group headers.
+
+    """
+
+    _model_name = traitlets.Unicode("ToggleButtonsExtendedModel").tag(sync=True)
+    _model_module = traitlets.Unicode("ipywidgets-extended").tag(sync=True)
+    _model_module_version = traitlets.Unicode(f"^{__version__}").tag(sync=True)
+    _view_name = traitlets.Unicode("ToggleButtonsExtendedView").tag(sync=True)
+    _view_module = traitlets.Unicode("ipywidgets-extended").tag(sync=True)
+    _view_module_version = traitlets.Unicode(f"^{__version__}").tag(sync=True)
@@ -0,0 +1,159 @@
+"""Compact binary serialization of labels
+
+When `compact_sync` is enabled for a widget, its label traits are sent as binary buffers
+instead of nested JSON lists:
+
+- Labels are sent as a UTF-8 blob of all labels concatenated together with a `uint32`
+  array of the byte offsets of each label, i.e., label `i` is `blob[offsets[i]:offsets[i + 1]]`.
+- Groupings are sent as the labels of all group headers and all options, together with a
+  `uint32` array of the option offsets of each group.
+- Disabled options are sent as a bitmap over the positions of `_options_labels`, where
+  bit `i & 7` of byte `i >> 3` is set if the option at position `i` is disabled.
+  This is also the case, regardless of `compact_sync`, when the disabled options are set
+  with a `disabled_mask`.
+- The mapping table of a `CascadeLink` is always sent compactly, as the unique labels of
+  all its groupings, with `uint32` arrays of label numbers and offsets, see
+  `cascade_to_json()`.
+
+The encoders work directly on the trait values (and the widget's flat index), without
+building intermediate label tuples.
+"""
+from array import array
+from itertools import accumulate, chain
+import sys
+from typing import Any, Dict, Iterable, Optional, Sequence, Tuple, Union
+
+
+__all__ = (
+    "cascade_to_json",
+    "disabled_to_json",
+    "grouping_to_json",
+    "labels_to_json",
+    "positions_to_json",
+)
+
+_NO_POSITION = 0xFFFFFFFF
+"""`uint32` standing in for a missing position"""
+
+
+def _uint32s(values: Iterable[int]) -> memoryview:
+    """Return the values as a little-endian `uint32` array"""
+    values = array("I", values)
+    if sys.byteorder == "big":
+        values.byteswap()
+    return memoryview(values).cast("B")
+
+
+def _offsets(lengths: Iterable[int]) -> memoryview:
+    """Return little-endian `uint32` offsets, starting at 0, for the given lengths"""
+    return _uint32s(chain([0], accumulate(lengths)))
+
+
+def _encode_labels(labels: Sequence[str]) -> Dict[str, Union[bytes, memoryview]]:
+    """Encode labels as a UTF-8 blob and byte offsets"""
+    text = "".join(labels)
+    if text.isascii():
+        # Byte offsets are character offsets, so there is no need to encode each label
+        return {"blob": text.encode("ascii"), "offsets": _offsets(map(len, labels))}
+    encoded = [label.encode("utf-8") for label in labels]
+    return {"blob": b"".join(encoded), "offsets": _offsets(map(len, encoded))}
+
+
+def labels_to_json(value: Tuple[str], widget) -> Any:
+    """Serialize a tuple of labels, compactly if `compact_sync` is enabled"""
+    if not widget.compact_sync:
+        return value
+    return _encode_labels(value)
+
+
+def grouping_to_json(value: Tuple[Tuple[str, Tuple[str]]], widget) -> Any:
+    """Serialize grouping labels, compactly if `compact_sync` is enabled"""
+    if not widget.compact_sync:
+        return value
+    labels_buffers = widget._labels_buffers
+    if labels_buffers is not None and labels_buffers[0] is widget._flat_index:
+        # The option labels are still those of a columnar source
+        option_labels = labels_buffers[1]
+    else:
+        option_labels = _encode_labels(
+            list(chain.from_iterable(labels for _, labels in value))
+        )
+    return {
+        "headers": _encode_labels([header for header, _ in value]),
+        "labels": option_labels,
+        "groups": _offsets(len(labels) for _, labels in value),
+    }
+
+
+def disabled_to_json(value: Tuple[str], widget) -> Any:
+    """Serialize disabled option labels, as a bitmap if `compact_sync` is enabled
+
+    The bitmap is always used with a `disabled_mask`, and then taken directly from the
+    widget's disabled state.
+    Widgets without a `disabled_mask` trait are serialized as without a mask.
+    """
+    if getattr(widget, "disabled_mask", None) is not None:
+        state = widget._disabled_state
+        if state.labels == frozenset(value):
+            return {"bitmap": state.disabled_bitmap()}
+    if not widget.compact_sync:
+        return value
+    flat_index = widget._flat_index
+    bitmap = bytearray((len(flat_index) + 7) // 8)
+    for label in value:
+        for position in flat_index.positions(label):
+            bitmap[position >> 3] |= 1 << (position & 7)
+    return {"bitmap": bitmap}
+
+
+def positions_to_json(value: Tuple[Optional[int]], _) -> memoryview:
+    """Serialize positions as a `uint32` array, where `None` is `_NO_POSITION`"""
+    return _uint32s(
+        _NO_POSITION if position is None else position for position in value
+    )
+
+
+def cascade_to_json(
+    value: Tuple[Tuple[Tuple[Tuple[str, Tuple[str]]], Tuple[int]]], _
+) -> Dict[str, Any]:
+    """Serialize the groupings of a cascade mapping table
+
+    The groupings are given as their (grouping labels, group depths)-pairs.
+    Each label is only sent once, however many groupings it is part of:
+
+    - `labels`: The unique labels, as a UTF-8 blob with byte offsets.
+    - `headers`: The label number of the header of each group, of all groupings.
+    - `options`: The label numbers of the options of all groups.
+    - `groups`: The offsets in `options` of each group.
+    - `depths`: The depth of each group, zero for groupings without group depths.
+    - `nested`: A byte for each grouping, which is 1 if it was given as nested groups,
+      i.e., has group depths.
+    - `groupings`: The offsets in `headers` of each grouping.
+    """
+    unique = dict.fromkeys(
+        chain.from_iterable(
+            chain((header,), labels)
+            for grouping_labels, _ in value
+            for header, labels in grouping_labels
+        )
+    )
+    number = {label: number for number, label in enumerate(unique)}.__getitem__
+    headers, options, group_sizes, depths, grouping_sizes = [], [], [], [], []
+    nested = bytearray(len(value))
+    for grouping, (grouping_labels, group_depths) in enumerate(value):
+        nested[grouping] = 1 if group_depths else 0
+        grouping_sizes.append(len(grouping_labels))
+        depths.extend(group_depths or [0] * len(grouping_labels))
+        for header, labels in grouping_labels:
+            headers.append(number(header))
+            options.extend(map(number, labels))
+            group_sizes.append(len(labels))
+    return {
+        "labels": _encode_labels(list(unique)),
+        "headers": _uint32s(headers),
+        "options": _uint32s(options),
+        "groups": _offsets(group_sizes),
+        "depths": _uint32s(depths),
+        "nested": nested,
+        "groupings": _offsets(grouping_sizes),
+    }
@@ -1,10 +1,521 @@
-import { ISerializers, WidgetView } from '@jupyter-widgets/base';
-import { DropdownModel, DropdownView } from '@jupyter-widgets/controls';
+import { ISerializers, WidgetModel, WidgetView, unpack_models } from '@jupyter-widgets/base';
+import {
+    ComboboxModel, ComboboxView, DescriptionView, DropdownModel, DropdownView,
+    RadioButtonsModel, RadioButtonsView, SelectModel, SelectMultipleModel,
+    SelectMultipleView, SelectView, ToggleButtonsModel, ToggleButtonsView,
+} from '@jupyter-widgets/controls';
 
 import { MODULE_NAME, MODULE_VERSION } from './version';
 
+export
+interface IDisabledPatch {
+    add: string[];
+    remove: string[];
+}
+
+/**
+ * Layout of the virtual dropdown list.
+ */
+const ROW_HEIGHT = 20;
+const VISIBLE_ROWS = 12;
+const OVERSCAN_ROWS = 6;
+const TREE_INDENT = 12;
+const MAX_CACHED_PAGES = 50;
+const SEARCH_HEIGHT = 24;
+const SEARCH_DELAY = 150;
+const SEARCH_LIMIT = 50;
+
+/**
+ * Labels sent as a UTF-8 blob with the byte offsets of each label.
+ */
+interface ICompactLabels {
+    blob: DataView;
+    offsets: DataView;
+}
+
+/**
+ * Disabled options sent as a bitmap over the positions of `_options_labels`.
+ */
+export
+class DisabledBitmap {
+    constructor(bitmap: Uint8Array) {
+        this.bitmap = bitmap;
+    }
+
+    /**
+     * Return the (unique) labels of the disabled options.
+     */
+    labels(options: string[]): string[] {
+        const labels = new Set<string>();
+        for (let byte = 0; byte < this.bitmap.length; byte++) {
+            if (!this.bitmap[byte]) { continue; }
+            for (let bit = 0; bit < 8; bit++) {
+                if (this.bitmap[byte] & (1 << bit) && (byte << 3) + bit < options.length) {
+                    labels.add(options[(byte << 3) + bit]);
+                }
+            }
+        }
+        return Array.from(labels);
+    }
+
+    bitmap: Uint8Array;
+}
+
+function bytesOf(view: DataView): Uint8Array {
+    return new Uint8Array(view.buffer, view.byteOffset, view.byteLength);
+}
+
+function uint32sOf(view: DataView): Uint32Array {
+    if (view.byteOffset % 4) {
+        // Typed arrays must be aligned, so copy the buffer
+        return new Uint32Array(bytesOf(view).slice().buffer);
+    }
+    return new Uint32Array(view.buffer, view.byteOffset, view.byteLength / 4);
+}
+
+const utf8Decoder = new TextDecoder('utf-8');
+
+/**
+ * Decode labels sent as a UTF-8 blob with byte offsets.
+ */
+function decodeLabels(value: ICompactLabels): string[] {
+    const blob = bytesOf(value.blob);
+    const offsets = uint32sOf(value.offsets);
+    const text = utf8Decoder.decode(blob);
+    const labels: string[] = new Array(Math.max(offsets.length - 1, 0));
+    if (text.length === blob.length) {
+        // Only ASCII, so the byte offsets can be used on the decoded text
+        for (let i = 0; i < labels.length; i++) {
+            labels[i] = text.slice(offsets[i], offsets[i + 1]);
+        }
+    } else {
+        for (let i = 0; i < labels.length; i++) {
+            labels[i] = utf8Decoder.decode(blob.subarray(offsets[i], offsets[i + 1]));
+        }
+    }
+    return labels;
+}
+
+export
+function deserializeLabels(value: string[] | ICompactLabels): string[] {
+    return Array.isArray(value) ? value : decodeLabels(value);
+}
+
+export
+function deserializeGrouping(
+    value: [string, string[]][] | {headers: ICompactLabels, labels: ICompactLabels, groups: DataView}
+): [string, string[]][] {
+    if (Array.isArray(value)) { return value; }
+    const headers = decodeLabels(value.headers);
+    const labels = decodeLabels(value.labels);
+    const groups = uint32sOf(value.groups);
+    return headers.map(
+        (header, group): [string, string[]] => [header, labels.slice(groups[group], groups[group + 1])]
+    );
+}
+
+export
+function deserializeDisabled(value: string[] | {bitmap: DataView}): string[] | DisabledBitmap {
+    return Array.isArray(value) ? value : new DisabledBitmap(bytesOf(value.bitmap));
+}
+
+/**
+ * Replace a disabled options bitmap in `state` with the labels of the options.
+ */
+function resolveDisabled(state: any, current: any): any {
+    const disabled = state._disabled_options_labels;
+    if (!(disabled instanceof DisabledBitmap)) { return state; }
+    const options = state._options_labels || current._options_labels || [];
+    return {...state, _disabled_options_labels: disabled.labels(options)};
+}
+
+interface ICatalogLabels {
+    _grouping_labels: [string, string[]][];
+    _group_depths: number[];
+    _options_labels: string[];
+}
+
+/**
+ * Grouped options shared by several dropdowns.
+ *
+ * The grouping is only sent and deserialized once, and the flat option labels derived
+ * from it once, however many dropdowns use the catalog.
+ */
+export
+class OptionCatalogModel extends WidgetModel {
+    defaults() {
+        return {
+            ...super.defaults(),
+            _model_name: OptionCatalogModel.model_name,
+            _model_module: OptionCatalogModel.model_module,
+            _model_module_version: OptionCatalogModel.model_module_version,
+            _grouping_labels: [],
+            _group_depths: [],
+        };
+    }
+
+    /**
+     * Return the grouping and flat option labels for the dropdowns using the catalog.
+     */
+    labels(): ICatalogLabels {
+        const grouping: [string, string[]][] = this.get('_grouping_labels');
+        const depths: number[] = this.get('_group_depths');
+        if (this._labels === null || this._labels._grouping_labels !== grouping) {
+            const options: string[] = [];
+            for (const [header, labels] of grouping) {
+                if (header) { options.push(header); }
+                for (const label of labels) { options.push(label); }
+            }
+            this._labels = {
+                _grouping_labels: grouping, _group_depths: depths, _options_labels: options,
+            };
+        } else if (this._labels._group_depths !== depths) {
+            this._labels = {...this._labels, _group_depths: depths};
+        }
+        return this._labels;
+    }
+
+    _labels: ICatalogLabels | null = null;
+
+    static serializers: ISerializers = {
+        ...WidgetModel.serializers,
+        _grouping_labels: {deserialize: deserializeGrouping},
+    }
+
+    static model_name = 'OptionCatalogModel';
+    static model_module = MODULE_NAME;
+    static model_module_version = MODULE_VERSION;
+}
+
+/**
+ * The distinct groupings of a cascade mapping table, see `cascade_to_json()`.
+ */
+interface ICascadeTable {
+    labels: string[];
+    headers: Uint32Array;
+    options: Uint32Array;
+    groups: Uint32Array;
+    depths: Uint32Array;
+    nested: Uint8Array;
+    groupings: Uint32Array;
+}
+
+/**
+ * Position standing in for a parent entry without a grouping.
+ */
+const NO_POSITION = 0xFFFFFFFF;
+
+function deserializeCascadeTable(value: any): ICascadeTable {
+    return {
+        labels: decodeLabels(value.labels),
+        headers: uint32sOf(value.headers),
+        options: uint32sOf(value.options),
+        groups: uint32sOf(value.groups),
+        depths: uint32sOf(value.depths),
+        nested: bytesOf(value.nested),
+        groupings: uint32sOf(value.groupings),
+    };
+}
+
+function deserializePositions(value: DataView): Uint32Array {
+    return uint32sOf(value);
+}
+
+/**
+ * Switch the options of a child dropdown with the selection of a parent widget.
+ *
+ * The mapping table is only sent once, and the options of the child are switched here,
+ * so only the selections made by the user are sent to the kernel.
+ */
+export
+class CascadeLinkModel extends WidgetModel {
+    defaults() {
+        return {
+            ...super.defaults(),
+            _model_name: CascadeLinkModel.model_name,
+            _model_module: CascadeLinkModel.model_module,
+            _model_module_version: CascadeLinkModel.model_module_version,
+            parent: null,
+            child: null,
+            _groupings: null,
+            _parent_groupings: new Uint32Array(0),
+        };
+    }
+
+    initialize(attributes: any, options: any): void {
+        super.initialize(attributes, options);
+        this.on('change:parent', this._follow, this);
+        this.on('change:child change:_groupings change:_parent_groupings', this._apply, this);
+        this._follow();
+    }
+
+    /**
+     * Follow the selection of the parent, if any.
+     */
+    _follow(): void {
+        const previous = this.previous('parent');
+        if (previous) {
+            this.stopListening(previous, 'change:index');
+        }
+        const parent = this.get('parent');
+        if (parent) {
+            this.listenTo(parent, 'change:index', this._apply);
+        }
+        this._apply();
+    }
+
+    /**
+     * Return the grouping and flat option labels of a grouping of the mapping table.
+     */
+    labels(grouping: number): ICatalogLabels {
+        const table: ICascadeTable = this.get('_groupings');
+        const groupings: [string, string[]][] = [];
+        const depths: number[] = [];
+        const options: string[] = [];
+        for (let group = table.groupings[grouping]; group < table.groupings[grouping + 1]; group++) {
+            const header = table.labels[table.headers[group]];
+            const labels: string[] = [];
+            for (let option = table.groups[group]; option < table.groups[group + 1]; option++) {
+                labels.push(table.labels[table.options[option]]);
+            }
+            groupings.push([header, labels]);
+            depths.push(table.depths[group]);
+            if (header) { options.push(header); }
+            for (const label of labels) { options.push(label); }
+        }
+        return {
+            _grouping_labels: groupings,
+            // Only nested groupings have depths
+            _group_depths: table.nested[grouping] ? depths : [],
+            _options_labels: options,
+        };
+    }
+
+    /**
+     * Switch the options of the child to the grouping of the selected parent entry.
+     *
+     * The options and selection are set as state from the kernel, so they are not
+     * synced back. The selection is resolved the same way as in the kernel: It is kept
+     * if the labels are unchanged, and otherwise the first enabled option is selected.
+     */
+    _apply(): void {
+        const parent = this.get('parent');
+        const child = this.get('child');
+        if (!parent || !child || !this.get('_groupings')) { return; }
+        const positions: Uint32Array = this.get('_parent_groupings');
+        const index: number | null = parent.get('index');
+        const grouping = index !== null && index < positions.length ? positions[index] : NO_POSITION;
+        const labels: ICatalogLabels = grouping === NO_POSITION
+            ? {_grouping_labels: [], _group_depths: [], _options_labels: []}
+            : this.labels(grouping);
+
+        const option_labels = new Set<string>();
+        labels._grouping_labels.forEach(([, group_labels]) => {
+            for (const label of group_labels) { option_labels.add(label); }
+        });
+        const disabled: string[] = child.get('_disabled_options_labels').filter(
+            (label: string) => option_labels.has(label)
+        );
+
+        let selected: number | null = child.get('index');
+        if (!sameLabels(child, labels)) {
+            selected = null;
+            const disabled_labels = new Set<string>(disabled);
+            let position = 0;
+            for (const [header, group_labels] of labels._grouping_labels) {
+                if (header) { position++; }
+                const offset = group_labels.findIndex((label) => !disabled_labels.has(label));
+                if (offset !== -1) {
+                    selected = position + offset;
+                    break;
+                }
+                position += group_labels.length;
+            }
+        }
+        child.set_state({...labels, _disabled_options_labels: disabled, index: selected});
+    }
+
+    static serializers: ISerializers = {
+        ...WidgetModel.serializers,
+        parent: {deserialize: unpack_models},
+        child: {deserialize: unpack_models},
+        _groupings: {deserialize: deserializeCascadeTable},
+        _parent_groupings: {deserialize: deserializePositions},
+    }
+
+    static model_name = 'CascadeLinkModel';
+    static model_module = MODULE_NAME;
+    static model_module_version = MODULE_VERSION;
+}
+
+/**
+ * Whether the flat option labels, group headers and depths of a model are `labels`.
+ */
+function sameLabels(model: WidgetModel, labels: ICatalogLabels): boolean {
+    const same = (a: any[], b: any[]): boolean => (
+        a.length === b.length && a.every((value, i) => value === b[i])
+    );
+    return (
+        same(model.get('_options_labels'), labels._options_labels)
+        && same(model.get('_group_depths'), labels._group_depths)
+        && same(
+            model.get('_grouping_labels').map((group: [string, string[]]) => group[0]),
+            labels._grouping_labels.map((group) => group[0])
+        )
+    );
+}
+
+interface IOptionEntry {
+    key: string;
+    label: string;
+    item: string;
+    group: string;
+    header: boolean;
+    disabled: boolean;
+}
+
+/**
+ * The wanted entries of a listbox, keyed by group header and label.
+ *
+ * Group headers and the options of (nested) groups are indented by their depth.
+ */
+function groupedEntries(model: WidgetModel): IOptionEntry[] {
+    const grouping = model.get('_grouping_labels');
+    const depths: number[] = model.get('_group_depths') || [];
+    const disabled_items = new Set<string>(model.get('_disabled_options_labels'));
+    const occurrences = new Map<string, number>();
+    const entries: IOptionEntry[] = [];
+    const addEntry = (header: string, label: string, is_header: boolean, depth = 0): void => {
+        const base_key = JSON.stringify([header, is_header ? null : label]);
+        const occurrence = occurrences.get(base_key) || 0;
+        occurrences.set(base_key, occurrence + 1);
+        const level = depth + (header && !is_header ? 1 : 0);
+        entries.push({
+            key: `${base_key}#${occurrence}`,
+            label: label,
+            item: ' '.repeat(level) + label,
+            group: header,
+            header: is_header,
+            disabled: is_header || disabled_items.has(label),
+        });
+    };
+
+    if (grouping && grouping.length) {
+        grouping.forEach(([header, labels]: [string, string[]], group: number) => {
+            const depth = depths[group] || 0;
+            if (header) { addEntry(header, header, true, depth); }
+            for (const label of labels) { addEntry(header, label, false, depth); }
+        });
+    } else {
+        for (const label of model.get('_options_labels')) {
+            addEntry('', label, false);
+        }
+    }
+    return entries;
+}
+
+/**
+ * Render the entries as the options of a listbox, with bold group headers.
+ */
+function renderListbox(listbox: HTMLSelectElement, entries: IOptionEntry[]): void {
+    listbox.textContent = '';
+    const fragment = document.createDocumentFragment();
+    for (const entry of entries) {
+        const option = document.createElement('option');
+        option.textContent = entry.item.replace(/ /g, '\xa0'); // space -> &nbsp; (no-break space)
+        option.setAttribute('data-value', encodeURIComponent(entry.item));
+        option.value = entry.item;
+        option.disabled = entry.disabled;
+        if (entry.header) {
+            option.style.fontWeight = 'bold';
+            option.style.color = 'black';
+        }
+        fragment.appendChild(option);
+    }
+    listbox.appendChild(fragment);
+}
+
+/**
+ * Resolve a disabled options bitmap in the initial attributes of a model to labels.
+ *
+ * Called before the model is initialized, so the labels are not synced back.
+ */
+function resolveInitialDisabled(model: WidgetModel): void {
+    if (model.get('_disabled_options_labels') instanceof DisabledBitmap) {
+        model.set(resolveDisabled(model.attributes, model.attributes));
+    }
+}
+
+/**
+ * Serializers of the models of widgets using `GroupedOptionsMixin`.
+ */
+const groupedSerializers: ISerializers = {
+    _options_labels: {deserialize: deserializeLabels},
+    _grouping_labels: {deserialize: deserializeGrouping},
+    _disabled_options_labels: {deserialize: deserializeDisabled},
+};
+
+/**
+ * Defaults of the models of widgets using `GroupedOptionsMixin`.
+ */
+const groupedDefaults = {
+    _grouping_labels: [],
+    _group_depths: [],
+    _disabled_options_labels: [],
+};
+
+/**
+ * The state changes requiring grouped options to be rendered again.
+ */
+const GROUPED_LABEL_CHANGES = (
+    'change:_options_labels change:_grouping_labels change:_group_depths change:_disabled_options_labels'
+);
+
 export
 class DropdownExtendedModel extends DropdownModel {
+    initialize(attributes: any, options: any): void {
+        // Set before changes are tracked, so the labels are not synced back
+        if (this.get('catalog')) {
+            this.set(this.get('catalog').labels());
+        }
+        if (this.get('_disabled_options_labels') instanceof DisabledBitmap) {
+            this.set(this._resolveDisabled(this.attributes, this.attributes));
+        }
+        super.initialize(attributes, options);
+        this.on('msg:custom', this._handleCustomMessage, this);
+        this.on('change:catalog', this._listenToCatalog, this);
+        this._listenToCatalog();
+    }
+
+    set_state(state: any): void {
+        if (state.catalog) {
+            state = {...state, ...state.catalog.labels()};
+        }
+        super.set_state(this._resolveDisabled(state, this.attributes));
+    }
+
+    /**
+     * Follow the changes of the options of the catalog, if any.
+     *
+     * The labels are set as state from the kernel, so they are not synced back.
+     */
+    _listenToCatalog(): void {
+        const previous = this.previous('catalog');
+        if (previous) {
+            this.stopListening(previous, 'change:_grouping_labels change:_group_depths');
+        }
+        const catalog = this.get('catalog');
+        if (catalog) {
+            this.listenTo(catalog, 'change:_grouping_labels change:_group_depths', () => {
+                this.set_state(catalog.labels());
+            });
+        }
+    }
+
+    _resolveDisabled(state: any, current: any): any {
+        return resolveDisabled(state, current);
+    }
+
     defaults() {
         return {
             ...super.defaults(),
@@ -14,10 +525,124 @@ class DropdownExtendedModel extends DropdownModel {
             _view_name: DropdownExtendedModel.view_name,
             _view_module: DropdownExtendedModel.view_module,
             _view_module_version: DropdownExtendedModel.view_module_version,
+            loading: false,
+            continuous_update: true,
+            debounce: 0,
+            _group_depths: [],
+            _pages_version: 0,
         };
     }
 
-    static serializers: ISerializers = {...DropdownModel.serializers}
+    _handleCustomMessage(content: any): void {
+        if (content.event === 'grouping_delta') {
+            this._applyGroupingDelta(content);
+        } else if (content.event === 'disabled_patch') {
+            this._applyDisabledPatch(content);
+        }
+    }
+
+    /**
+     * Apply a change of the disabled options sent from the kernel.
+     *
+     * While the state is set, `disabledPatch` holds the change, so views can patch the
+     * affected options only.
+     */
+    _applyDisabledPatch(patch: IDisabledPatch): void {
+        const removed = new Set<string>(patch.remove);
+        const disabled = this.get('_disabled_options_labels').filter(
+            (label: string) => !removed.has(label)
+        ).concat(patch.add);
+        this.disabledPatch = patch;
+        try {
+            this.set_state({_disabled_options_labels: disabled});
+        } finally {
+            this.disabledPatch = null;
+        }
+    }
+
+    /**
+     * Apply an in-place change of the grouping sent from the kernel.
+     *
+     * The grouping, flat options and disabled options are updated locally, as the
+     * kernel only sends the change itself.
+     */
+    _applyGroupingDelta(delta: any): void {
+        let grouping: [string, string[]][] = this.get('_grouping_labels').map(
+            (group: [string, string[]]) => [group[0], group[1]]
+        );
+        if (!grouping.length && this.get('_options_labels').length) {
+            grouping = [['', this.get('_options_labels')]];
+        }
+        // Depths are only kept for nested groupings
+        const depths: number[] = this.get('_group_depths').slice();
+
+        switch (delta.op) {
+            case 'add_group':
+                grouping.splice(delta.group, 0, [delta.header, delta.labels]);
+                if (depths.length) { depths.splice(delta.group, 0, 0); }
+                break;
+            case 'remove_group':
+                grouping.splice(delta.group, 1);
+                if (depths.length) { depths.splice(delta.group, 1); }
+                break;
+            case 'insert_options': {
+                const labels = grouping[delta.group][1];
+                grouping[delta.group] = [
+                    grouping[delta.group][0],
+                    labels.slice(0, delta.offset).concat(delta.labels, labels.slice(delta.offset)),
+                ];
+                break;
+            }
+            case 'extend':
+                for (const [group, header, labels] of delta.groups) {
+                    if (group < grouping.length) {
+                        grouping[group] = [header, grouping[group][1].concat(labels)];
+                    } else {
+                        grouping.push([header, labels]);
+                        if (depths.length) { depths.push(0); }
+                    }
+                }
+                break;
+            case 'remove_options': {
+                const removed = new Set<string>(delta.labels);
+                grouping = grouping.map(
+                    (group): [string, string[]] => [
+                        group[0], group[1].filter((label) => !removed.has(label)),
+                    ]
+                );
+                break;
+            }
+            default:
+                return;
+        }
+
+        const options: string[] = [];
+        const option_labels = new Set<string>();
+        for (const [header, labels] of grouping) {
+            if (header) { options.push(header); }
+            for (const label of labels) {
+                options.push(label);
+                option_labels.add(label);
+            }
+        }
+        const disabled = this.get('_disabled_options_labels').filter(
+            (label: string) => option_labels.has(label)
+        );
+        this.set_state({
+            _grouping_labels: grouping,
+            _group_depths: depths,
+            _options_labels: options,
+            _disabled_options_labels: disabled,
+        });
+    }
+
+    disabledPatch: IDisabledPatch | null = null;
+
+    static serializers: ISerializers = {
+        ...DropdownModel.serializers,
+        ...groupedSerializers,
+        catalog: {deserialize: unpack_models},
+    }
 
     static model_name = 'DropdownExtendedModel';
     static model_module = MODULE_NAME;
@@ -31,45 +656,1307 @@ export
 class DropdownExtendedView extends DropdownView {
     initialize(parameters: WidgetView.InitializeParameters): void {
         super.initialize(parameters);
-        this.listenTo(this.model, 'change:_disabled_options_labels', () => this._updateOptions());
-        this.listenTo(this.model, 'change:_grouping_labels', () => this._updateOptions());
+        // Changes of the labels are only recorded here and rendered once in update(),
+        // which is called after all attributes of a state message have been set
+        this.stopListening(this.model, 'change:_options_labels');
+        this.listenTo(this.model, 'change:_options_labels change:_grouping_labels change:_group_depths', () => {
+            this._optionsStale = true;
+        });
+        this.listenTo(this.model, 'change:_disabled_options_labels', () => {
+            const patch = (this.model as DropdownExtendedModel).disabledPatch;
+            if (patch && !this._optionsStale) {
+                this._pendingPatches.push(patch);
+            } else {
+                this._optionsStale = true;
+            }
+        });
+        // A selection from the kernel replaces an uncommitted selection
+        this.listenTo(this.model, 'change:index', () => this._cancelSelection());
+    }
+
+    // @ts-ignore
+    events(): {[e: string]: string} {
+        return {
+            'change select': '_handle_change',
+            'keydown select': '_handleKeydown',
+            'mousedown select': '_handleMousedown',
+            'blur select': '_commitSelection',
+        };
+    }
+
+    /**
+     * Handle a selection made in the listbox, by mouse or keyboard.
+     */
+    _handle_change(): void {
+        const index = this.listbox.selectedIndex;
+        this._select(index === -1 ? null : index);
     }
 
+    /**
+     * Move the selection with the arrow, Home and End keys, skipping group headers and
+     * disabled options, and commit it with Enter.
+     */
+    _handleKeydown(event: KeyboardEvent): void {
+        this._keyboard = true;
+        if (event.altKey || event.ctrlKey || event.metaKey) { return; }
+        const current = this.listbox.selectedIndex;
+        let index: number | null;
+        switch (event.key) {
+            case 'ArrowDown':
+                index = this._enabledFrom(current + 1, 1);
+                break;
+            case 'ArrowUp':
+                index = this._enabledFrom(current - 1, -1);
+                break;
+            case 'Home':
+                index = this._enabledFrom(0, 1);
+                break;
+            case 'End':
+                index = this._enabledFrom(this.listbox.options.length - 1, -1);
+                break;
+            case 'Enter':
+                this._commitSelection();
+                return;
+            default:
+                return;
+        }
+        event.preventDefault();
+        if (index !== null && index !== current) {
+            this.listbox.selectedIndex = index;
+            this._select(index);
+        }
+    }
+
+    _handleMousedown(): void {
+        this._keyboard = false;
+    }
+
+    /**
+     * The first enabled option from `start` in the direction of `step`, if any.
+     */
+    _enabledFrom(start: number, step: number): number | null {
+        const options = this.listbox.options;
+        for (let index = start; index >= 0 && index < options.length; index += step) {
+            if (!options[index].disabled) { return index; }
+        }
+        return null;
+    }
+
+    /**
+     * Select an option in the view, sending it to the kernel once settled.
+     *
+     * With `continuous_update` disabled, selections made with the keyboard are only
+     * sent when committed.
+     * With `debounce`, the selection is sent once unchanged for that many milliseconds.
+     */
+    _select(index: number | null): void {
+        this._pendingIndex = index;
+        window.clearTimeout(this._commitTimeout);
+        if (this._keyboard && !this.model.get('continuous_update')) { return; }
+        const debounce: number = this.model.get('debounce');
+        if (debounce > 0) {
+            this._commitTimeout = window.setTimeout(() => this._commitSelection(), debounce);
+        } else {
+            this._commitSelection();
+        }
+    }
+
+    /**
+     * Send the selection made in the view to the kernel, if any.
+     */
+    _commitSelection(): void {
+        window.clearTimeout(this._commitTimeout);
+        if (this._pendingIndex === undefined) { return; }
+        const index = this._pendingIndex;
+        this._pendingIndex = undefined;
+        if (index !== this.model.get('index')) {
+            this.model.set('index', index);
+            this.touch();
+        }
+    }
+
+    _cancelSelection(): void {
+        window.clearTimeout(this._commitTimeout);
+        this._pendingIndex = undefined;
+    }
+
+    remove(): any {
+        this._commitSelection();
+        return super.remove();
+    }
+
+    update(): void {
+        if (this._optionsStale) {
+            this._updateOptions();
+        } else if (this._pendingPatches.length) {
+            for (const patch of this._pendingPatches) {
+                this._patchDisabledOptions(patch);
+            }
+            this._pendingPatches = [];
+        }
+        this._updateLoading();
+        super.update();
+        if (this._pendingIndex !== undefined) {
+            // Keep the uncommitted selection
+            this.listbox.selectedIndex = this._pendingIndex === null ? -1 : this._pendingIndex;
+        }
+    }
+
+    /**
+     * Show a disabled "Loading…" entry after the options while they are being added.
+     *
+     * The entry is not one of the reconciled nodes, so it stays after all options.
+     */
+    _updateLoading(): void {
+        const loading: boolean = this.model.get('loading');
+        this.listbox.setAttribute('aria-busy', String(loading));
+        if (loading && this._loadingOption === null) {
+            this._loadingOption = document.createElement('option');
+            this._loadingOption.textContent = 'Loading\u2026';
+            this._loadingOption.disabled = true;
+            this._loadingOption.style.fontStyle = 'italic';
+            this.listbox.appendChild(this._loadingOption);
+        } else if (!loading && this._loadingOption !== null) {
+            this._loadingOption.remove();
+            this._loadingOption = null;
+        }
+    }
+
+    _patchDisabledOptions(patch: IDisabledPatch): void {
+        for (const label of patch.remove) {
+            for (const option of this._optionNodes.get(label) || []) {
+                option.disabled = false;
+            }
+        }
+        for (const label of patch.add) {
+            for (const option of this._optionNodes.get(label) || []) {
+                option.disabled = true;
+            }
+        }
+    }
+
+    /**
+     * Reconcile the <option> nodes with the model.
+     *
+     * Nodes are keyed by their group header and label, so existing nodes are reused and
+     * only updated if their disabled state or item, e.g., the indentation of a regrouped
+     * option, changed, while new nodes are created in document fragments.
+     */
     _updateOptions(): void {
-        this.listbox.textContent = '';
-        const grouping = this.model.get('_grouping_labels');
-        const items = this.model.get('_options_labels');
-        const disabled_items = this.model.get('_disabled_options_labels');
-        if (grouping && grouping.length) {
-            for (let i = 0; i < grouping.length; i++) {
-                const header = grouping[i][0];
-                if (header) { this._updateOptionsUtility(header, true, true); }
-                for (let j = 0; j < grouping[i][1].length; j++) {
-                    let item = grouping[i][1][j];
-                    if (header) { item = ' ' + item; }
-                    const disabled = disabled_items.includes(grouping[i][1][j]);
-                    this._updateOptionsUtility(item, disabled, false);
+        this._optionsStale = false;
+        this._pendingPatches = [];
+        const entries = this._entries();
+        const keys = new Set<string>(entries.map((entry) => entry.key));
+
+        // Remove stale nodes first, so they are not encountered while walking the list
+        this._nodes.forEach((option, key) => {
+            if (!keys.has(key)) {
+                option.remove();
+                this._nodes.delete(key);
+            }
+        });
+
+        const nodes = new Map<string, HTMLOptionElement>();
+        this._optionNodes = new Map();
+        let current = this.listbox.firstChild;
+        let fragment: DocumentFragment | null = null;
+        for (const entry of entries) {
+            let option = this._nodes.get(entry.key);
+            if (option === undefined) {
+                option = this._createOption(entry.item, entry.header);
+                if (fragment === null) { fragment = document.createDocumentFragment(); }
+                fragment.appendChild(option);
+            } else {
+                if (fragment !== null) {
+                    this.listbox.insertBefore(fragment, current);
+                    fragment = null;
                 }
+                if (option === current) {
+                    current = current.nextSibling;
+                } else {
+                    this.listbox.insertBefore(option, current);
+                }
+                if (option.value !== entry.item) { this._setItem(option, entry.item); }
             }
-        } else {
-            for (let i = 0; i < items.length; i++) {
-                const item = items[i];
-                const disabled = disabled_items.includes(item);
-                this._updateOptionsUtility(item, disabled, false);
+            if (option.disabled !== entry.disabled) { option.disabled = entry.disabled; }
+            nodes.set(entry.key, option);
+
+            if (!entry.header) {
+                const labelNodes = this._optionNodes.get(entry.label);
+                if (labelNodes) {
+                    labelNodes.push(option);
+                } else {
+                    this._optionNodes.set(entry.label, [option]);
+                }
             }
         }
+        if (fragment !== null) { this.listbox.insertBefore(fragment, current); }
+        this._nodes = nodes;
+    }
+
+    /**
+     * The wanted entries of the listbox, see `groupedEntries()`.
+     */
+    _entries(): IOptionEntry[] {
+        return groupedEntries(this.model);
     }
 
-    _updateOptionsUtility(item: string, disabled: boolean, bold_and_black: boolean): void {
+    _createOption(item: string, bold_and_black: boolean): HTMLOptionElement {
         const option = document.createElement('option');
-        option.textContent = item.replace(/ /g, '\xa0'); // space -> &nbsp; (no-break space)
         if (bold_and_black) {
             option.style.fontWeight = 'bold';
             option.style.color = 'black';
         }
+        this._setItem(option, item);
+        return option;
+    }
+
+    /**
+     * Set the (indented) item shown by an <option> node.
+     */
+    _setItem(option: HTMLOptionElement, item: string): void {
+        option.textContent = item.replace(/ /g, '\xa0'); // space -> &nbsp; (no-break space)
         option.setAttribute('data-value', encodeURIComponent(item));
-        option.disabled = disabled;
         option.value = item;
-        this.listbox.appendChild(option);
     }
+
+    _nodes: Map<string, HTMLOptionElement> = new Map();
+    _optionNodes: Map<string, HTMLOptionElement[]> = new Map();
+    _optionsStale = false;
+    _pendingPatches: IDisabledPatch[] = [];
+    _loadingOption: HTMLOptionElement | null = null;
+    _pendingIndex: number | null | undefined = undefined;
+    _commitTimeout = 0;
+    _keyboard = false;
+}
+
+
+/**
+ * A page of entries of a virtual dropdown, as sent from the kernel.
+ */
+interface IPage {
+    labels: string[];
+    headers: Set<number>;
+    indented: Set<number>;
+    disabled: Set<number>;
+    levels: number[] | null;
+}
+
+/**
+ * Options matching a search, as sent from the kernel.
+ */
+interface ISearchResults {
+    indices: number[];
+    labels: string[];
+}
+
+/**
+ * Least-recently-used cache of pages.
+ */
+class PageCache {
+    constructor(max_pages: number) {
+        this._max_pages = max_pages;
+    }
+
+    get(page: number): IPage | undefined {
+        const value = this._pages.get(page);
+        if (value !== undefined) {
+            // Move to the end, marking it as the most recently used page
+            this._pages.delete(page);
+            this._pages.set(page, value);
+        }
+        return value;
+    }
+
+    set(page: number, value: IPage): void {
+        this._pages.delete(page);
+        this._pages.set(page, value);
+        if (this._pages.size > this._max_pages) {
+            this._pages.delete(this._pages.keys().next().value);
+        }
+    }
+
+    clear(): void {
+        this._pages.clear();
+    }
+
+    private _max_pages: number;
+    private _pages: Map<number, IPage> = new Map();
+}
+
+export
+class DropdownExtendedVirtualView extends DescriptionView {
+    initialize(parameters: WidgetView.InitializeParameters): void {
+        super.initialize(parameters);
+        this.listenTo(this.model, 'msg:custom', this._handleCustomMessage);
+        this.listenTo(this.model, 'change:_virtual_count', () => this._invalidate());
+        this.listenTo(this.model, 'change:_pages_version', () => {
+            this._invalidate();
+            if (this._results !== null) { this._sendSearch(); }
+        });
+        this.listenTo(this.model, 'change:loading', () => this._scheduleRender());
+    }
+
+    render(): void {
+        super.render();
+        this.el.classList.add('jupyter-widgets');
+        this.el.classList.add('widget-inline-hbox');
+        this.el.classList.add('widget-dropdown');
+        this.el.style.position = 'relative';
+
+        this.button = document.createElement('button');
+        this.button.className = 'widget-dropdown-virtual-button';
+        this.button.style.textAlign = 'left';
+        this.button.style.overflow = 'hidden';
+        this.button.style.textOverflow = 'ellipsis';
+        this.button.style.whiteSpace = 'nowrap';
+        this.button.addEventListener('click', () => this._togglePopup());
+        this.el.appendChild(this.button);
+
+        this.popup = document.createElement('div');
+        this.popup.className = 'widget-dropdown-virtual-popup';
+        this.popup.style.display = 'none';
+        this.popup.style.position = 'absolute';
+        this.popup.style.top = '100%';
+        this.popup.style.right = '0';
+        this.popup.style.zIndex = '1000';
+        this.popup.style.overflowY = 'auto';
+        this.popup.style.background = 'white';
+        this.popup.style.border = '1px solid #9e9e9e';
+        this.popup.style.maxHeight = `${VISIBLE_ROWS * ROW_HEIGHT}px`;
+        this.popup.addEventListener('scroll', () => this._scheduleRender());
+        this.popup.addEventListener('click', (event) => this._handleRowClick(event));
+
+        this.search = document.createElement('input');
+        this.search.type = 'search';
+        this.search.placeholder = 'Search\u2026';
+        this.search.style.position = 'sticky';
+        this.search.style.top = '0';
+        this.search.style.zIndex = '1';
+        this.search.style.width = '100%';
+        this.search.style.height = `${SEARCH_HEIGHT}px`;
+        this.search.style.boxSizing = 'border-box';
+        this.search.addEventListener('input', () => this._scheduleSearch());
+        this.popup.appendChild(this.search);
+
+        this.rows = document.createElement('div');
+        this.rows.style.position = 'relative';
+        this.popup.appendChild(this.rows);
+        this.el.appendChild(this.popup);
+
+        this.update();
+    }
+
+    update(): void {
+        this.button.disabled = this.model.get('disabled');
+        this.el.setAttribute('aria-busy', String(this.model.get('loading')));
+        const label = this.model.get('_selected_label');
+        this.button.textContent = label === null ? '\xa0' : label.replace(/ /g, '\xa0');
+        return super.update();
+    }
+
+    _handleCustomMessage(content: any): void {
+        if (content.event === 'page') {
+            if (content.version !== this.model.get('_pages_version')) { return; }
+            this._pending.delete(content.page);
+            this._pages.set(content.page, {
+                labels: content.labels,
+                headers: new Set<number>(content.headers),
+                indented: new Set<number>(content.indented),
+                disabled: new Set<number>(content.disabled),
+                levels: content.levels || null,
+            });
+            this._scheduleRender();
+        } else if (content.event === 'search_results') {
+            if (content.request_id !== this._search_request) { return; }
+            this._results = {indices: content.indices, labels: content.labels};
+            this._scheduleRender();
+        }
+    }
+
+    /**
+     * Search on the kernel once the user stops typing.
+     */
+    _scheduleSearch(): void {
+        window.clearTimeout(this._search_timeout);
+        this._search_timeout = window.setTimeout(() => this._sendSearch(), SEARCH_DELAY);
+    }
+
+    _sendSearch(): void {
+        const query = this.search.value.trim();
+        this._search_request++;
+        if (!query) {
+            this._results = null;
+            this._scheduleRender();
+            return;
+        }
+        this.send({
+            event: 'search',
+            query: query,
+            limit: SEARCH_LIMIT,
+            request_id: this._search_request,
+        });
+    }
+
+    /**
+     * Drop all cached pages and render the visible entries anew.
+     */
+    _invalidate(): void {
+        this._pages.clear();
+        this._pending.clear();
+        this._scheduleRender();
+    }
+
+    _togglePopup(): void {
+        if (this.popup.style.display === 'none') {
+            this.popup.style.display = '';
+            this.search.value = '';
+            this._results = null;
+            this.popup.scrollTop = this._initialScrollTop();
+            this._renderWindow();
+        } else {
+            this.popup.style.display = 'none';
+        }
+    }
+
+    /**
+     * The scroll position when opening the list, centering the selected entry.
+     */
+    _initialScrollTop(): number {
+        const index = this.model.get('index');
+        if (index === null) { return 0; }
+        return Math.max(0, (index - Math.floor(VISIBLE_ROWS / 2)) * ROW_HEIGHT);
+    }
+
+    /**
+     * Render at most once per animation frame.
+     */
+    _scheduleRender(): void {
+        if (this._render_scheduled || this.popup === undefined) { return; }
+        this._render_scheduled = true;
+        window.requestAnimationFrame(() => {
+            this._render_scheduled = false;
+            this._renderWindow();
+        });
+    }
+
+    /**
+     * Render the rows in view, requesting the pages that are not cached.
+     */
+    _renderWindow(): void {
+        if (this.popup.style.display === 'none') { return; }
+        if (this._results !== null) {
+            this._renderResults(this._results);
+            return;
+        }
+        const count: number = this.model.get('_virtual_count');
+        const page_size: number = this.model.get('_virtual_page_size');
+        const loading: boolean = this.model.get('loading');
+        this.rows.style.height = `${(loading ? count + 1 : count) * ROW_HEIGHT}px`;
+
+        const start = Math.max(0, Math.floor((this.popup.scrollTop - SEARCH_HEIGHT) / ROW_HEIGHT) - OVERSCAN_ROWS);
+        const stop = Math.min(count, start + VISIBLE_ROWS + 2 * OVERSCAN_ROWS);
+        const selected = this.model.get('index');
+
+        const fragment = document.createDocumentFragment();
+        for (let index = start; index < stop; index++) {
+            const page_number = Math.floor(index / page_size);
+            const page = this._pages.get(page_number);
+            if (page === undefined) {
+                this._requestPage(page_number);
+            }
+            const offset = index - page_number * page_size;
+            const row = document.createElement('div');
+            row.style.position = 'absolute';
+            row.style.top = `${index * ROW_HEIGHT}px`;
+            row.style.height = `${ROW_HEIGHT}px`;
+            row.style.lineHeight = `${ROW_HEIGHT}px`;
+            row.style.left = row.style.right = '0';
+            row.style.padding = '0 4px';
+            row.style.whiteSpace = 'nowrap';
+            row.style.overflow = 'hidden';
+            row.style.textOverflow = 'ellipsis';
+            row.setAttribute('data-index', String(index));
+
+            if (page === undefined) {
+                row.textContent = '\u2026';
+                row.style.color = '#9e9e9e';
+            } else {
+                const header = page.headers.has(offset);
+                const level = page.levels !== null
+                    ? page.levels[offset]
+                    : (page.indented.has(offset) ? 1 : 0);
+                const label = ' '.repeat(level) + page.labels[offset];
+                row.textContent = label.replace(/ /g, '\xa0');
+                if (header) {
+                    row.style.fontWeight = 'bold';
+                    row.style.color = 'black';
+                } else if (page.disabled.has(offset)) {
+                    row.style.color = '#9e9e9e';
+                } else {
+                    row.setAttribute('data-enabled', '');
+                    row.style.cursor = 'pointer';
+                    if (index === selected) { row.style.background = '#e0e0e0'; }
+                }
+            }
+            fragment.appendChild(row);
+        }
+        if (loading && stop === count) {
+            const row = document.createElement('div');
+            row.style.position = 'absolute';
+            row.style.top = `${count * ROW_HEIGHT}px`;
+            row.style.height = `${ROW_HEIGHT}px`;
+            row.style.lineHeight = `${ROW_HEIGHT}px`;
+            row.style.padding = '0 4px';
+            row.style.color = '#9e9e9e';
+            row.style.fontStyle = 'italic';
+            row.textContent = 'Loading\u2026';
+            fragment.appendChild(row);
+        }
+        this.rows.textContent = '';
+        this.rows.appendChild(fragment);
+    }
+
+    /**
+     * Render the search results instead of the windowed list.
+     */
+    _renderResults(results: ISearchResults): void {
+        const selected = this.model.get('index');
+        const fragment = document.createDocumentFragment();
+        for (let i = 0; i < results.indices.length; i++) {
+            const row = document.createElement('div');
+            row.style.height = `${ROW_HEIGHT}px`;
+            row.style.lineHeight = `${ROW_HEIGHT}px`;
+            row.style.padding = '0 4px';
+            row.style.whiteSpace = 'nowrap';
+            row.style.overflow = 'hidden';
+            row.style.textOverflow = 'ellipsis';
+            row.style.cursor = 'pointer';
+            row.setAttribute('data-index', String(results.indices[i]));
+            row.setAttribute('data-enabled', '');
+            row.textContent = results.labels[i].replace(/ /g, '\xa0');
+            if (results.indices[i] === selected) { row.style.background = '#e0e0e0'; }
+            fragment.appendChild(row);
+        }
+        if (!results.indices.length) {
+            const row = document.createElement('div');
+            row.style.padding = '0 4px';
+            row.style.color = '#9e9e9e';
+            row.textContent = 'No matches';
+            fragment.appendChild(row);
+        }
+        this.rows.style.height = '';
+        this.rows.textContent = '';
+        this.rows.appendChild(fragment);
+    }
+
+    _requestPage(page: number): void {
+        if (this._pending.has(page)) { return; }
+        this._pending.add(page);
+        this.send({event: 'request_page', page: page});
+    }
+
+    _handleRowClick(event: MouseEvent): void {
+        const row = (event.target as HTMLElement).closest('[data-index]');
+        if (row === null || !row.hasAttribute('data-enabled')) { return; }
+        this.button.textContent = row.textContent!.replace(/^\xa0+/, '');
+        this.popup.style.display = 'none';
+        this.model.set('index', Number(row.getAttribute('data-index')));
+        this.touch();
+    }
+
+    button!: HTMLButtonElement;
+    popup!: HTMLDivElement;
+    search!: HTMLInputElement;
+    rows!: HTMLDivElement;
+
+    private _pages = new PageCache(MAX_CACHED_PAGES);
+    private _pending = new Set<number>();
+    private _render_scheduled = false;
+    protected _results: ISearchResults | null = null;
+    private _search_request = 0;
+    private _search_timeout = 0;
+}
+
+
+/**
+ * The entries directly below a group of a tree view, as sent from the kernel.
+ */
+interface ITreeGroup {
+    labels: string[];
+    indices: number[];
+    headers: Set<number>;
+    disabled: Set<number>;
+}
+
+/**
+ * A row of the expanded tree.
+ */
+interface ITreeRow {
+    label: string;
+    index: number | null;
+    depth: number;
+    header: string | null;
+    disabled: boolean;
+}
+
+/**
+ * Virtual dropdown showing nested groups as a collapsible tree.
+ *
+ * Only the top-level entries are requested when opened, while the entries of a group
+ * are requested from the kernel when it is expanded.
+ */
+export
+class DropdownExtendedTreeView extends DropdownExtendedVirtualView {
+    _handleCustomMessage(content: any): void {
+        if (content.event !== 'group') {
+            super._handleCustomMessage(content);
+            return;
+        }
+        if (content.version !== this.model.get('_pages_version')) { return; }
+        const key = content.header === null ? '' : content.header;
+        this._requested.delete(key);
+        this._groups.set(key, {
+            labels: content.labels,
+            indices: content.indices,
+            headers: new Set<number>(content.headers),
+            disabled: new Set<number>(content.disabled),
+        });
+        this._scheduleRender();
+    }
+
+    /**
+     * Drop all cached groups, keeping expanded groups expanded.
+     */
+    _invalidate(): void {
+        this._groups.clear();
+        this._requested.clear();
+        super._invalidate();
+    }
+
+    _initialScrollTop(): number {
+        return 0;
+    }
+
+    _requestGroup(key: string): void {
+        if (this._requested.has(key)) { return; }
+        this._requested.add(key);
+        this.send({event: 'request_group', header: key === '' ? null : key});
+    }
+
+    /**
+     * The visible rows, i.e., the top-level entries and the entries of expanded groups.
+     */
+    _treeRows(): ITreeRow[] {
+        const rows: ITreeRow[] = [];
+        const addGroup = (key: string, depth: number): void => {
+            const group = this._groups.get(key);
+            if (group === undefined) {
+                this._requestGroup(key);
+                rows.push({label: '\u2026', index: null, depth: depth, header: null, disabled: true});
+                return;
+            }
+            for (let offset = 0; offset < group.labels.length; offset++) {
+                const label = group.labels[offset];
+                if (group.headers.has(offset)) {
+                    rows.push({label: label, index: group.indices[offset], depth: depth, header: label, disabled: true});
+                    if (this._expanded.has(label)) { addGroup(label, depth + 1); }
+                } else {
+                    rows.push({
+                        label: label,
+                        index: group.indices[offset],
+                        depth: depth,
+                        header: null,
+                        disabled: group.disabled.has(offset),
+                    });
+                }
+            }
+        };
+        addGroup('', 0);
+        return rows;
+    }
+
+    _renderWindow(): void {
+        if (this.popup.style.display === 'none') { return; }
+        if (this._results !== null) {
+            this._renderResults(this._results);
+            return;
+        }
+        const rows = this._treeRows();
+        const loading: boolean = this.model.get('loading');
+        if (loading) {
+            rows.push({label: 'Loading\u2026', index: null, depth: 0, header: null, disabled: true});
+        }
+        this.rows.style.height = `${rows.length * ROW_HEIGHT}px`;
+
+        const start = Math.max(0, Math.floor((this.popup.scrollTop - SEARCH_HEIGHT) / ROW_HEIGHT) - OVERSCAN_ROWS);
+        const stop = Math.min(rows.length, start + VISIBLE_ROWS + 2 * OVERSCAN_ROWS);
+        const selected = this.model.get('index');
+
+        const fragment = document.createDocumentFragment();
+        for (let position = start; position < stop; position++) {
+            const entry = rows[position];
+            const row = document.createElement('div');
+            row.style.position = 'absolute';
+            row.style.top = `${position * ROW_HEIGHT}px`;
+            row.style.height = `${ROW_HEIGHT}px`;
+            row.style.lineHeight = `${ROW_HEIGHT}px`;
+            row.style.left = row.style.right = '0';
+            row.style.padding = `0 4px 0 ${4 + entry.depth * TREE_INDENT}px`;
+            row.style.whiteSpace = 'nowrap';
+            row.style.overflow = 'hidden';
+            row.style.textOverflow = 'ellipsis';
+
+            if (entry.header !== null) {
+                const expanded = this._expanded.has(entry.header);
+                row.textContent = `${expanded ? '\u25be' : '\u25b8'}\xa0${entry.label.replace(/ /g, '\xa0')}`;
+                row.setAttribute('data-group', entry.header);
+                row.setAttribute('aria-expanded', String(expanded));
+                row.style.fontWeight = 'bold';
+                row.style.color = 'black';
+                row.style.cursor = 'pointer';
+            } else {
+                row.textContent = entry.label.replace(/ /g, '\xa0');
+                if (entry.index === null) {
+                    row.style.color = '#9e9e9e';
+                    if (loading && position === rows.length - 1) { row.style.fontStyle = 'italic'; }
+                } else {
+                    row.setAttribute('data-index', String(entry.index));
+                    if (entry.disabled) {
+                        row.style.color = '#9e9e9e';
+                    } else {
+                        row.setAttribute('data-enabled', '');
+                        row.style.cursor = 'pointer';
+                        if (entry.index === selected) { row.style.background = '#e0e0e0'; }
+                    }
+                }
+            }
+            fragment.appendChild(row);
+        }
+        this.rows.textContent = '';
+        this.rows.appendChild(fragment);
+    }
+
+    /**
+     * Expand or collapse a group when its header is clicked, otherwise select the option.
+     */
+    _handleRowClick(event: MouseEvent): void {
+        const row = (event.target as HTMLElement).closest('[data-group]');
+        if (row === null) {
+            super._handleRowClick(event);
+            return;
+        }
+        const header = row.getAttribute('data-group')!;
+        if (this._expanded.has(header)) {
+            this._expanded.delete(header);
+        } else {
+            this._expanded.add(header);
+        }
+        this._renderWindow();
+    }
+
+    private _groups: Map<string, ITreeGroup> = new Map();
+    private _requested = new Set<string>();
+    private _expanded = new Set<string>();
+}
+
+
+export
+class SelectMultipleExtendedModel extends SelectMultipleModel {
+    initialize(attributes: any, options: any): void {
+        resolveInitialDisabled(this);
+        super.initialize(attributes, options);
+    }
+
+    set_state(state: any): void {
+        super.set_state(resolveDisabled(state, this.attributes));
+    }
+
+    defaults() {
+        return {
+            ...super.defaults(),
+            _model_name: SelectMultipleExtendedModel.model_name,
+            _model_module: SelectMultipleExtendedModel.model_module,
+            _model_module_version: SelectMultipleExtendedModel.model_module_version,
+            _view_name: SelectMultipleExtendedModel.view_name,
+            _view_module: SelectMultipleExtendedModel.view_module,
+            _view_module_version: SelectMultipleExtendedModel.view_module_version,
+            ...groupedDefaults,
+            _selected_bitmap: new Uint8Array(0),
+        };
+    }
+
+    static serializers: ISerializers = {
+        ...SelectMultipleModel.serializers,
+        ...groupedSerializers,
+        _selected_bitmap: {deserialize: bytesOf},
+    }
+
+    static model_name = 'SelectMultipleExtendedModel';
+    static model_module = MODULE_NAME;
+    static model_module_version = MODULE_VERSION;
+    static view_name = 'SelectMultipleExtendedView';
+    static view_module = MODULE_NAME;
+    static view_module_version = MODULE_VERSION;
+}
+
+/**
+ * Multiple selection listbox with groups and disabled options.
+ *
+ * The selection is synced as a bitmap over the entries, instead of a list of indices.
+ */
+export
+class SelectMultipleExtendedView extends SelectMultipleView {
+    initialize(parameters: WidgetView.InitializeParameters): void {
+        super.initialize(parameters);
+        // Rendered once in update(), after all attributes of a state message are set
+        this.stopListening(this.model, 'change:_options_labels');
+        this.stopListening(this.model, 'change:index');
+        this.listenTo(this.model, GROUPED_LABEL_CHANGES, () => { this._optionsStale = true; });
+        this.listenTo(this.model, 'change:_selected_bitmap', (model: any, value: any, options: any) => {
+            this.updateSelection(options);
+        });
+    }
+
+    update(): void {
+        if (this._optionsStale) {
+            this._updateOptions();
+            this.updateSelection();
+        }
+        super.update();
+    }
+
+    _updateOptions(): void {
+        this._optionsStale = false;
+        renderListbox(this.listbox, groupedEntries(this.model));
+    }
+
+    updateSelection(options: any = {}): void {
+        if (options.updated_view === this) { return; }
+        const bitmap: Uint8Array = this.model.get('_selected_bitmap');
+        const listboxOptions = this.listbox.options;
+        for (let index = 0; index < listboxOptions.length; index++) {
+            const selected = ((bitmap[index >> 3] || 0) & (1 << (index & 7))) !== 0;
+            if (listboxOptions[index].selected !== selected) {
+                listboxOptions[index].selected = selected;
+            }
+        }
+    }
+
+    /**
+     * Send the selected options to the kernel as a bitmap.
+     */
+    _handle_change(): void {
+        const listboxOptions = this.listbox.options;
+        const bitmap = new Uint8Array((listboxOptions.length + 7) >> 3);
+        for (const option of Array.from(this.listbox.selectedOptions || [])) {
+            bitmap[option.index >> 3] |= 1 << (option.index & 7);
+        }
+        this.model.set('_selected_bitmap', bitmap, {updated_view: this});
+        this.touch();
+    }
+
+    _optionsStale = true;
+}
+
+
+export
+class SelectExtendedModel extends SelectModel {
+    initialize(attributes: any, options: any): void {
+        resolveInitialDisabled(this);
+        super.initialize(attributes, options);
+    }
+
+    set_state(state: any): void {
+        super.set_state(resolveDisabled(state, this.attributes));
+    }
+
+    defaults() {
+        return {
+            ...super.defaults(),
+            _model_name: SelectExtendedModel.model_name,
+            _model_module: SelectExtendedModel.model_module,
+            _model_module_version: SelectExtendedModel.model_module_version,
+            _view_name: SelectExtendedModel.view_name,
+            _view_module: SelectExtendedModel.view_module,
+            _view_module_version: SelectExtendedModel.view_module_version,
+            ...groupedDefaults,
+        };
+    }
+
+    static serializers: ISerializers = {
+        ...SelectModel.serializers,
+        ...groupedSerializers,
+    }
+
+    static model_name = 'SelectExtendedModel';
+    static model_module = MODULE_NAME;
+    static model_module_version = MODULE_VERSION;
+    static view_name = 'SelectExtendedView';
+    static view_module = MODULE_NAME;
+    static view_module_version = MODULE_VERSION;
+}
+
+/**
+ * Single selection listbox with groups and disabled options.
+ */
+export
+class SelectExtendedView extends SelectView {
+    initialize(parameters: WidgetView.InitializeParameters): void {
+        super.initialize(parameters);
+        // Rendered once in update(), after all attributes of a state message are set
+        this.stopListening(this.model, 'change:_options_labels');
+        this.listenTo(this.model, GROUPED_LABEL_CHANGES, () => { this._optionsStale = true; });
+    }
+
+    update(): void {
+        if (this._optionsStale) {
+            this._updateOptions();
+            this.updateSelection();
+        }
+        super.update();
+    }
+
+    _updateOptions(): void {
+        this._optionsStale = false;
+        renderListbox(this.listbox, groupedEntries(this.model));
+    }
+
+    _optionsStale = true;
+}
+
+export
+class RadioButtonsExtendedModel extends RadioButtonsModel {
+    initialize(attributes: any, options: any): void {
+        resolveInitialDisabled(this);
+        super.initialize(attributes, options);
+    }
+
+    set_state(state: any): void {
+        super.set_state(resolveDisabled(state, this.attributes));
+    }
+
+    defaults() {
+        return {
+            ...super.defaults(),
+            _model_name: RadioButtonsExtendedModel.model_name,
+            _model_module: RadioButtonsExtendedModel.model_module,
+            _model_module_version: RadioButtonsExtendedModel.model_module_version,
+            _view_name: RadioButtonsExtendedModel.view_name,
+            _view_module: RadioButtonsExtendedModel.view_module,
+            _view_module_version: RadioButtonsExtendedModel.view_module_version,
+            ...groupedDefaults,
+        };
+    }
+
+    static serializers: ISerializers = {
+        ...RadioButtonsModel.serializers,
+        ...groupedSerializers,
+    }
+
+    static model_name = 'RadioButtonsExtendedModel';
+    static model_module = MODULE_NAME;
+    static model_module_version = MODULE_VERSION;
+    static view_name = 'RadioButtonsExtendedView';
+    static view_module = MODULE_NAME;
+    static view_module_version = MODULE_VERSION;
+}
+
+/**
+ * Radio buttons with groups and disabled options, where the group headers are labels.
+ *
+ * The buttons are held by flat index, so a change of the selection only updates the
+ * previously and newly checked buttons, instead of looking up every button.
+ */
+export
+class RadioButtonsExtendedView extends RadioButtonsView {
+    initialize(parameters: WidgetView.InitializeParameters): void {
+        super.initialize(parameters);
+        this.listenTo(this.model, GROUPED_LABEL_CHANGES, () => { this._optionsStale = true; });
+    }
+
+    update(options?: any): void {
+        if (this._optionsStale) {
+            this._updateOptions();
+        } else if (this.model.hasChanged('disabled')) {
+            this._updateDisabled();
+        }
+        this._updateChecked();
+        // Schedule adjustPadding asynchronously to
+        // allow dom elements to be created properly
+        setTimeout(this.adjustPadding, 0, this);
+        // Skip the rendering of RadioButtonsView
+        return DescriptionView.prototype.update.call(this, options);
+    }
+
+    _updateOptions(): void {
+        this._optionsStale = false;
+        this.container.textContent = '';
+        const fragment = document.createDocumentFragment();
+        this._entries = groupedEntries(this.model);
+        this._radios = this._entries.map((entry: IOptionEntry, index: number) => {
+            const label = document.createElement('label');
+            label.textContent = entry.item.replace(/ /g, '\xa0'); // space -> &nbsp; (no-break space)
+            fragment.appendChild(label);
+            if (entry.header) {
+                label.style.fontWeight = 'bold';
+                return null;
+            }
+            const radio = document.createElement('input');
+            radio.setAttribute('type', 'radio');
+            radio.value = index.toString();
+            radio.setAttribute('data-value', encodeURIComponent(entry.label));
+            label.appendChild(radio);
+            return radio;
+        });
+        this.container.appendChild(fragment);
+        this._checked = null;
+        this._updateDisabled();
+    }
+
+    _updateDisabled(): void {
+        const disabled: boolean = this.model.get('disabled');
+        this._radios.forEach((radio: HTMLInputElement | null, index: number) => {
+            if (radio) { radio.disabled = disabled || this._entries[index].disabled; }
+        });
+    }
+
+    _updateChecked(): void {
+        const index: number | null = this.model.get('index');
+        if (index === this._checked) { return; }
+        const previous = this._checked === null ? null : this._radios[this._checked];
+        if (previous) { previous.checked = false; }
+        const radio = index === null ? null : this._radios[index];
+        if (radio) { radio.checked = true; }
+        this._checked = index;
+    }
+
+    _optionsStale = true;
+    private _entries: IOptionEntry[] = [];
+    private _radios: (HTMLInputElement | null)[] = [];
+    private _checked: number | null = null;
+}
+
+export
+class ToggleButtonsExtendedModel extends ToggleButtonsModel {
+    initialize(attributes: any, options: any): void {
+        resolveInitialDisabled(this);
+        super.initialize(attributes, options);
+    }
+
+    set_state(state: any): void {
+        super.set_state(resolveDisabled(state, this.attributes));
+    }
+
+    defaults() {
+        return {
+            ...super.defaults(),
+            _model_name: ToggleButtonsExtendedModel.model_name,
+            _model_module: ToggleButtonsExtendedModel.model_module,
+            _model_module_version: ToggleButtonsExtendedModel.model_module_version,
+            _view_name: ToggleButtonsExtendedModel.view_name,
+            _view_module: ToggleButtonsExtendedModel.view_module,
+            _view_module_version: ToggleButtonsExtendedModel.view_module_version,
+            ...groupedDefaults,
+        };
+    }
+
+    static serializers: ISerializers = {
+        ...ToggleButtonsModel.serializers,
+        ...groupedSerializers,
+    }
+
+    static model_name = 'ToggleButtonsExtendedModel';
+    static model_module = MODULE_NAME;
+    static model_module_version = MODULE_VERSION;
+    static view_name = 'ToggleButtonsExtendedView';
+    static view_module = MODULE_NAME;
+    static view_module_version = MODULE_VERSION;
+}
+
+/**
+ * Toggle buttons with groups and disabled options, where the group headers are labels.
+ *
+ * The buttons are held by flat index, so a change of the selection only updates the
+ * previously and newly active buttons, instead of looking up every button.
+ * The `icons` and `tooltips` are given per option, i.e., not including group headers.
+ */
+export
+class ToggleButtonsExtendedView extends ToggleButtonsView {
+    initialize(parameters: WidgetView.InitializeParameters): void {
+        super.initialize(parameters);
+        this.listenTo(this.model, `${GROUPED_LABEL_CHANGES} change:icons change:tooltips`, () => {
+            this._optionsStale = true;
+        });
+    }
+
+    update(options?: any): void {
+        if (this._optionsStale) {
+            this._updateOptions();
+        } else if (this.model.hasChanged('disabled')) {
+            this._updateDisabled();
+        }
+        this._updateActive();
+        this.stylePromise.then(function(style) {
+            if (style) {
+                style.style();
+            }
+        });
+        // Skip the rendering of ToggleButtonsView
+        return DescriptionView.prototype.update.call(this, options);
+    }
+
+    _updateOptions(): void {
+        this._optionsStale = false;
+        this.buttongroup.textContent = '';
+        const fragment = document.createDocumentFragment();
+        const icons: string[] = this.model.get('icons') || [];
+        const tooltips: string[] = this.model.get('tooltips') || [];
+        let option = 0;
+        this._entries = groupedEntries(this.model);
+        this._buttons = this._entries.map((entry: IOptionEntry, index: number) => {
+            if (entry.header) {
+                const header = document.createElement('span');
+                header.textContent = entry.item.replace(/ /g, '\xa0'); // space -> &nbsp; (no-break space)
+                header.style.fontWeight = 'bold';
+                header.style.alignSelf = 'center';
+                fragment.appendChild(header);
+                return null;
+            }
+            const icon = icons[option];
+            const tooltip = tooltips[option];
+            option++;
+            const empty = entry.label.trim().length === 0 && (!icon || icon.trim().length === 0);
+            const button = document.createElement('button');
+            button.setAttribute('type', 'button');
+            button.className = 'widget-toggle-button jupyter-button';
+            button.textContent = empty ? '\xa0' : entry.label;
+            const icon_element = document.createElement('i');
+            if (icon) {
+                icon_element.className = 'fa fa-' + icon;
+            }
+            button.appendChild(icon_element);
+            button.setAttribute('data-value', encodeURIComponent(entry.label));
+            button.setAttribute('value', index.toString());
+            if (tooltip) {
+                button.setAttribute('title', tooltip);
+            }
+            this.set_mapped_classes(ToggleButtonsView.classMap, 'button_style', button);
+            this.update_style_traits(button);
+            fragment.appendChild(button);
+            return button;
+        });
+        this.buttongroup.appendChild(fragment);
+        this._active = null;
+        this._updateDisabled();
+    }
+
+    _updateDisabled(): void {
+        const disabled: boolean = this.model.get('disabled');
+        this._buttons.forEach((button: HTMLButtonElement | null, index: number) => {
+            if (button) { button.disabled = disabled || this._entries[index].disabled; }
+        });
+    }
+
+    _updateActive(): void {
+        const index: number | null = this.model.get('index');
+        if (index === this._active) { return; }
+        const previous = this._active === null ? null : this._buttons[this._active];
+        if (previous) { previous.classList.remove('mod-active'); }
+        const button = index === null ? null : this._buttons[index];
+        if (button) { button.classList.add('mod-active'); }
+        this._active = index;
+    }
+
+    _optionsStale = true;
+    private _entries: IOptionEntry[] = [];
+    private _buttons: (HTMLButtonElement | null)[] = [];
+    private _active: number | null = null;
+}
+
+export
+class ComboboxExtendedModel extends ComboboxModel {
+    initialize(attributes: any, options: any): void {
+        resolveInitialDisabled(this);
+        super.initialize(attributes, options);
+    }
+
+    set_state(state: any): void {
+        super.set_state(resolveDisabled(state, this.attributes));
+    }
+
+    defaults() {
+        return {
+            ...super.defaults(),
+            _model_name: ComboboxExtendedModel.model_name,
+            _model_module: ComboboxExtendedModel.model_module,
+            _model_module_version: ComboboxExtendedModel.model_module_version,
+            _view_name: ComboboxExtendedModel.view_name,
+            _view_module: ComboboxExtendedModel.view_module,
+            _view_module_version: ComboboxExtendedModel.view_module_version,
+            ...groupedDefaults,
+        };
+    }
+
+    static serializers: ISerializers = {
+        ...ComboboxModel.serializers,
+        ...groupedSerializers,
+    }
+
+    static model_name = 'ComboboxExtendedModel';
+    static model_module = MODULE_NAME;
+    static model_module_version = MODULE_VERSION;
+    static view_name = 'ComboboxExtendedView';
+    static view_module = MODULE_NAME;
+    static view_module_version = MODULE_VERSION;
+}
+
+/**
+ * Combobox suggesting the enabled options, with the group header next to each option.
+ *
+ * With `ensure_option`, the value is looked up in a set of the enabled labels instead
+ * of the list of options.
+ */
+export
+class ComboboxExtendedView extends ComboboxView {
+    initialize(parameters: WidgetView.InitializeParameters): void {
+        super.initialize(parameters);
+        this.listenTo(this.model, GROUPED_LABEL_CHANGES, () => { this._optionsStale = true; });
+    }
+
+    update(options?: any): void {
+        // The suggestions of ComboboxView, from `options`, are replaced afterwards
+        super.update(options);
+        if (this.datalist && this._optionsStale) {
+            this._updateOptions();
+            this.highlightValidState(this.isValid(this.model.get('value')));
+        }
+    }
+
+    _updateOptions(): void {
+        this._optionsStale = false;
+        const datalist = this.datalist as HTMLDataListElement;
+        datalist.textContent = '';
+        const fragment = document.createDocumentFragment();
+        const valid = new Set<string>();
+        for (const entry of groupedEntries(this.model)) {
+            if (entry.disabled) { continue; }
+            const option = document.createElement('option');
+            option.value = entry.label;
+            if (entry.group) {
+                option.label = entry.group;
+            }
+            fragment.appendChild(option);
+            valid.add(entry.label);
+        }
+        datalist.appendChild(fragment);
+        this._validLabels = valid;
+    }
+
+    isValid(value: string): boolean {
+        return !this.model.get('ensure_option') || this._validLabels.has(value);
+    }
+
+    _optionsStale = true;
+    private _validLabels = new Set<string>();
 }
@@ -45,3 +45,25 @@ def update_version(_, version):
     )
 
     print(f"Bumped version to {version} !")
+
+
+@task(
+    help={
+        "compare": (
+            "Compare with the latest saved run, failing if the mean time of any "
+            "benchmark regressed by more than the given percentage, e.g., 10."
+        ),
+    }
+)
+def benchmark(context, compare=None):
+    """Run the benchmarks, saving the results to the local history in `.benchmarks/`"""
+    options = "--benchmark-autosave --benchmark-columns=min,mean,max,rounds"
+    if compare is not None:
+        options += f" --benchmark-compare --benchmark-compare-fail=mean:{compare}%"
+    context.run(f"pytest {TOP_DIR.joinpath('benchmarks')} {options}")
+
+
+@task
+def test(context):
+    """Run the tests"""
+    context.run(f"pytest {TOP_DIR.joinpath('tests')}")
@@ -0,0 +1,85 @@
+"""Tests for `CascadeLink`"""
+import pytest
+from traitlets import TraitError
+
+from ipywidgets_extended import CascadeLink, DropdownExtended
+
+
+CITIES = [("Jutland", ["Aarhus", "Aalborg"]), ("Zealand", ["Copenhagen"])]
+MAPPING = {
+    "Denmark": CITIES,
+    "Danmark": CITIES,
+    "Sweden": [("", ["Stockholm", "Gothenburg"])],
+}
+
+
+def test_child_follows_parent_selection():
+    """The child switches to the grouping of the selected parent value"""
+    country = DropdownExtended(options=["Denmark", "Sweden", "Norway", "Danmark"])
+    city = DropdownExtended()
+    link = CascadeLink(country, city, MAPPING)
+    city.disabled_options = ["Aarhus"]
+
+    assert link._parent_groupings == (0, 1, None, 0)
+    assert city._options_labels == (
+        "Jutland",
+        "Aarhus",
+        "Aalborg",
+        "Zealand",
+        "Copenhagen",
+    )
+    assert city.value == "Aalborg"
+    assert city.disabled_options == ["Aarhus"]
+
+    country.value = "Sweden"
+    assert city.grouping == (
+        ("", (("Stockholm", "Stockholm"), ("Gothenburg", "Gothenburg"))),
+    )
+    assert city.value == "Stockholm"
+    assert city.disabled_options == []
+
+    country.value = "Norway"
+    assert city._options_labels == ()
+    assert city.value is None
+
+
+def test_shared_grouping_keeps_selection(monkeypatch):
+    """Parent values sharing a grouping keep the selection, without sending options"""
+    country = DropdownExtended(options=["Denmark", "Danmark"])
+    city = DropdownExtended()
+    CascadeLink(country, city, MAPPING)
+    city.value = "Copenhagen"
+    flat_index = city._flat_index
+
+    sent = []
+    monkeypatch.setattr(city, "_send", lambda msg, buffers=None: sent.append(msg))
+    country.value = "Danmark"
+    assert city._flat_index is flat_index
+    assert city.value == "Copenhagen"
+    assert sent == []
+
+
+def test_parent_options_change():
+    """The mapping of the parent entries follows the options of the parent"""
+    country = DropdownExtended(options=["Norway"])
+    city = DropdownExtended()
+    link = CascadeLink(country, city, MAPPING)
+    assert city._options_labels == ()
+
+    country.grouping = [("Nordic", ["Sweden", "Denmark"])]
+    assert link._parent_groupings == (None, 1, 0)
+    assert city.value == "Stockholm"
+
+    link.unlink()
+    country.value = "Denmark"
+    assert city.value == "Stockholm"
+
+
+def test_invalid_child():
+    """The child must render its own options"""
+    with pytest.raises(TraitError, match="virtual"):
+        CascadeLink(
+            DropdownExtended(options=["Denmark"]),
+            DropdownExtended(virtual=True),
+            MAPPING,
+        )
@@ -0,0 +1,63 @@
+"""Tests for `OptionCatalog`"""
+import pytest
+from traitlets import TraitError
+
+from ipywidgets_extended import DropdownExtended, OptionCatalog
+
+
+def test_dropdowns_share_catalog_options():
+    """Dropdowns using a catalog share its options and keep their own selection"""
+    catalog = OptionCatalog(grouping=[("Fruits", ["Apple", "Pear"]), ("", ["None"])])
+    first = DropdownExtended(catalog=catalog)
+    second = DropdownExtended(catalog=catalog, value="Pear", disabled_options=["Apple"])
+
+    assert first.value == "Apple"
+    assert second.value == "Pear"
+    for dropdown in (first, second):
+        assert dropdown._options_labels is catalog._flat_index.labels
+        assert dropdown._options_values is catalog._options_values
+        assert dropdown._grouping_labels is catalog._grouping_labels
+        assert "_options_labels" not in dropdown.get_state()
+
+    with pytest.raises(TraitError):
+        first.options = ["x"]
+
+
+def test_changed_catalog_updates_dropdowns():
+    """Changing the catalog keeps the selected and disabled options that are left"""
+    catalog = OptionCatalog(grouping=[("A", ["a", "b", "c"])])
+    dropdown = DropdownExtended(catalog=catalog, value="c", disabled_options=["a", "b"])
+
+    catalog.grouping = [("A", ["b", "c"]), ("D", ["d"])]
+    assert dropdown._flat_index is catalog._flat_index
+    assert dropdown.grouping == catalog._grouping_full
+    assert dropdown.value == "c"
+    assert dropdown.disabled_options == ["b"]
+
+    catalog.grouping = [("D", ["b", "d"])]
+    assert dropdown.value == "d"
+    assert dropdown.disabled_options == ["b"]
+
+
+def test_catalog_grouping_from_iterator():
+    """A grouping passed as an iterator is kept materialized, not as the iterator"""
+    catalog = OptionCatalog(grouping=(group for group in [("A", ["a", "b"])]))
+    dropdown = DropdownExtended(catalog=catalog)
+
+    assert catalog.grouping == (("A", (("a", "a"), ("b", "b"))),)
+    assert dropdown._options_labels == ("A", "a", "b")
+    assert dropdown.value == "a"
+
+
+def test_leaving_catalog_keeps_options():
+    """Setting the catalog to `None` keeps its options as the dropdown's own"""
+    catalog = OptionCatalog(grouping=[("A", ["a", "b"])])
+    dropdown = DropdownExtended(catalog=catalog, value="b")
+
+    dropdown.catalog = None
+    assert dropdown.value == "b"
+    assert "_options_labels" in dropdown.get_state()
+
+    dropdown.add_group("B", ["c"])
+    assert dropdown._options_labels == ("A", "a", "b", "B", "c")
+    assert catalog._flat_index.labels == ("A", "a", "b")
@@ -0,0 +1,139 @@
+"""Tests for columnar option sources"""
+import pytest
+
+from ipywidgets_extended import DropdownExtended
+from ipywidgets_extended.columnar import ColumnarGrouping
+from ipywidgets_extended.serialization import grouping_to_json
+
+numpy = pytest.importorskip("numpy")
+
+
+def _address(view: memoryview) -> int:
+    """Return the memory address of a buffer"""
+    return numpy.frombuffer(view, dtype=numpy.uint8).ctypes.data
+
+
+def _sent_labels(dropdown: DropdownExtended) -> bytes:
+    """Return the UTF-8 blob of the option labels sent to the browser"""
+    return bytes(
+        grouping_to_json(dropdown._grouping_labels, dropdown)["labels"]["blob"]
+    )
+
+
+def test_rows_ordered_by_group():
+    """Rows are ordered by group, keeping their order within each group"""
+    columns = ColumnarGrouping(
+        numpy.array(["a", "b", "c", "d", "e"]),
+        values=numpy.arange(5),
+        groups=numpy.array([1, -1, 0, 1, 0]),
+        headers=["X", "Y"],
+        disabled=numpy.array([False, False, True, False, False]),
+    )
+
+    assert columns.grouping == (
+        ("", (("b", 1),)),
+        ("X", (("c", 2), ("e", 4))),
+        ("Y", (("a", 0), ("d", 3))),
+    )
+    assert columns.flat_index.labels == ("b", "X", "c", "e", "Y", "a", "d")
+    assert columns.disabled_options == ["c"]
+    assert columns.labels_buffers is None
+
+
+def test_invalid_columns():
+    """Columns of different lengths and invalid group codes are refused"""
+    with pytest.raises(ValueError, match="same length"):
+        ColumnarGrouping(["a", "b"], values=[1])
+    with pytest.raises(ValueError, match="headers"):
+        ColumnarGrouping(["a", "b"], groups=[0, 0])
+    with pytest.raises(ValueError, match="valid indices"):
+        ColumnarGrouping(["a", "b"], groups=[0, 2], headers=["X", "Y"])
+    with pytest.raises(ValueError, match="unique"):
+        ColumnarGrouping(["a", "b"], groups=[0, 1], headers=["X", "X"])
+
+
+def test_dropdown_from_columns():
+    """A dropdown created from columns matches one created from its grouping"""
+    dropdown = DropdownExtended.from_columns(
+        ["a", "b", "c"],
+        values=[10, 20, 30],
+        groups=[0, 1, 0],
+        headers=["X", "Y"],
+        disabled=[True, False, False],
+    )
+    expected = DropdownExtended(
+        grouping=[("X", [("a", 10), ("c", 30)]), ("Y", [("b", 20)])],
+        disabled_options=["a"],
+    )
+
+    assert dropdown.grouping == expected.grouping
+    assert dropdown._options_labels == expected._options_labels
+    assert dropdown.disabled_options == ["a"]
+    assert dropdown.value == 30
+
+
+@pytest.mark.parametrize("type_name", ["string", "large_string"])
+def test_labels_sent_from_arrow_buffers(type_name):
+    """The labels of an Arrow string column are sent from its UTF-8 data"""
+    pyarrow = pytest.importorskip("pyarrow")
+    labels = pyarrow.array(["a", "bb", "ccc"], type=pyarrow.type_for_alias(type_name))
+    dropdown = DropdownExtended.from_columns(labels, compact_sync=True)
+
+    buffers = grouping_to_json(dropdown._grouping_labels, dropdown)["labels"]
+    assert _address(buffers["blob"]) == labels.buffers()[2].address
+    assert bytes(buffers["blob"]) == b"abbccc"
+    assert numpy.frombuffer(buffers["offsets"], dtype="<u4").tolist() == [0, 1, 3, 6]
+
+
+def test_sliced_arrow_labels():
+    """The labels of a sliced Arrow column are sent from its UTF-8 data"""
+    pyarrow = pytest.importorskip("pyarrow")
+    labels = pyarrow.array(["a", "bb", "ccc", "dddd"]).slice(1, 2)
+    dropdown = DropdownExtended.from_columns(labels, compact_sync=True)
+
+    buffers = dropdown._labels_buffers[1]
+    assert numpy.frombuffer(buffers["offsets"], dtype="<u4").tolist() == [0, 2, 5]
+    assert _sent_labels(dropdown) == b"bbccc"
+
+
+def test_reordered_arrow_labels_are_gathered():
+    """The labels of rows reordered by group are gathered from the Arrow buffers"""
+    pyarrow = pytest.importorskip("pyarrow")
+    labels = pyarrow.array(["a", "bb", "ccc", "d"])
+    dropdown = DropdownExtended.from_columns(
+        labels, groups=[1, 0, 1, 0], headers=["X", "Y"], compact_sync=True
+    )
+
+    assert dropdown._labels_buffers is not None
+    assert dropdown._options_labels == ("X", "bb", "d", "Y", "a", "ccc")
+    assert _sent_labels(dropdown) == b"bbdaccc"
+
+
+def test_dictionary_encoded_labels():
+    """The labels of a dictionary-encoded column share the dictionary's strings and
+    are gathered from its UTF-8 data"""
+    pyarrow = pytest.importorskip("pyarrow")
+    labels = pyarrow.array(["a", "bb", "a", "ü"]).dictionary_encode()
+    dropdown = DropdownExtended.from_columns(
+        labels, groups=[1, 1, 0, 0], headers=["X", "Y"], compact_sync=True
+    )
+
+    assert dropdown._labels_buffers is not None
+    assert dropdown._options_labels == ("X", "a", "ü", "Y", "a", "bb")
+    assert dropdown._options_labels[1] is dropdown._options_labels[4]
+    assert _sent_labels(dropdown) == "aüabb".encode("utf-8")
+
+    dropdown.remove_options("bb")
+    assert _sent_labels(dropdown) == "aüa".encode("utf-8")
+
+
+def test_labels_with_nulls_are_encoded():
+    """Labels of columns with nulls are encoded when sent"""
+    pyarrow = pytest.importorskip("pyarrow")
+    dropdown = DropdownExtended.from_columns(
+        pyarrow.array(["a", None, "b"]).dictionary_encode(), compact_sync=True
+    )
+
+    assert dropdown._labels_buffers is None
+    assert dropdown._options_labels == ("a", "None", "b")
+    assert _sent_labels(dropdown) == b"aNoneb"
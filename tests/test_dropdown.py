@@ -0,0 +1,348 @@
+"""Tests for `DropdownExtended`"""
+import pytest
+from traitlets import TraitError
+
+from ipywidgets_extended import DropdownExtended
+
+
+def test_options_replace_grouping():
+    """Setting `options` on a grouped dropdown clears the grouping"""
+    dropdown = DropdownExtended(grouping=[("X", ["x", "y"])])
+    dropdown.options = ["p", "q"]
+
+    assert dropdown._flat_index.labels == ("p", "q")
+    assert dropdown.grouping == ()
+    assert dropdown._grouping_labels == ()
+    assert dropdown.value == "p"
+
+    dropdown.disabled_options = ["p"]
+    assert dropdown.value == "q"
+    assert dropdown.search("p") == []
+
+
+def test_options_replace_grouping_in_batch_update():
+    """Setting `options` in `batch_update()` clears the grouping as well"""
+    dropdown = DropdownExtended(grouping=[("X", ["x", "y"])])
+    with dropdown.batch_update():
+        dropdown.options = ["m", "n"]
+
+    assert dropdown._flat_index.labels == ("m", "n")
+    assert dropdown.grouping == ()
+    assert dropdown.index == 0
+    assert dropdown.value == "m"
+
+
+def test_invalid_disabled_options_in_batch_update(monkeypatch):
+    """Invalid disabled options set in `batch_update()` are neither kept nor sent"""
+    dropdown = DropdownExtended(options=["a", "b", "c"], disabled_options=["a"])
+    sent = []
+    monkeypatch.setattr(
+        dropdown, "_send", lambda msg, buffers=None: sent.append(msg["state"])
+    )
+
+    with pytest.raises(TraitError, match="nope"):
+        with dropdown.batch_update():
+            dropdown.disabled_options = ["nope"]
+            dropdown.value = "c"
+
+    assert dropdown.disabled_options == ["a"]
+    assert dropdown._disabled_options_labels == ("a",)
+    assert dropdown.value == "c"
+    assert all(
+        "nope" not in state.get("_disabled_options_labels", ()) for state in sent
+    )
+
+
+def test_insert_options_without_options():
+    """Inserting un-grouped options into an empty dropdown adds them"""
+    dropdown = DropdownExtended()
+    dropdown.insert_options("", ["a", "b"])
+
+    assert dropdown._flat_index.labels == ("a", "b")
+    assert dropdown.value == "a"
+
+    dropdown.insert_options("", ["c"], position=0)
+    assert dropdown._flat_index.labels == ("c", "a", "b")
+    assert dropdown.value == "a"
+
+    with pytest.raises(ValueError):
+        DropdownExtended().insert_options("A", ["a"])
+
+
+def test_grouping_from_iterator():
+    """A grouping passed as an iterator is kept materialized, not as the iterator"""
+    groups = (group for group in [("A", ["a", "b"])])
+    dropdown = DropdownExtended(grouping=groups)
+
+    assert dropdown.grouping is not groups
+    assert dropdown.grouping == (("A", (("a", "a"), ("b", "b"))),)
+    assert dropdown._flat_index.labels == ("A", "a", "b")
+    assert dropdown.value == "a"
+
+
+def _sent_custom(dropdown, monkeypatch):
+    """Record the custom messages sent to the frontend"""
+    sent = []
+    monkeypatch.setattr(
+        dropdown,
+        "_send",
+        lambda msg, buffers=None: sent.append(msg["content"])
+        if msg["method"] == "custom"
+        else None,
+    )
+    return sent
+
+
+def test_virtual_view_created_after_change(monkeypatch):
+    """A view created after the entries changed accepts the pages sent to it"""
+    dropdown = DropdownExtended(
+        options=[str(number) for number in range(5)], virtual=True
+    )
+    dropdown.disabled_options = ["3"]
+    assert dropdown._pages_version == 1
+
+    # A new view starts from the current state
+    version = dropdown.get_state()["_pages_version"]
+    sent = _sent_custom(dropdown, monkeypatch)
+    dropdown._handle_frontend_msg(None, {"event": "request_page", "page": 0}, [])
+
+    assert sent[-1]["event"] == "page"
+    assert sent[-1]["version"] == version
+    assert sent[-1]["disabled"] == [3]
+
+
+def test_tree_view_created_after_change(monkeypatch):
+    """A tree view created after the entries changed accepts the groups sent to it"""
+    dropdown = DropdownExtended(
+        grouping=[("A", ["a", "b"]), ("B", ["c"])], virtual=True, collapsible=True
+    )
+    dropdown.disabled_options = ["b"]
+
+    version = dropdown.get_state()["_pages_version"]
+    sent = _sent_custom(dropdown, monkeypatch)
+    dropdown._handle_frontend_msg(None, {"event": "request_group", "header": "A"}, [])
+
+    assert sent[-1]["event"] == "group"
+    assert sent[-1]["version"] == version
+    assert sent[-1]["labels"] == ["a", "b"]
+
+
+def test_options_replace_disabled_selection():
+    """Changing the options selects the first enabled option, as for a grouping"""
+    dropdown = DropdownExtended(options=["a", "b"], disabled_options=["b"])
+    dropdown.options = ["b", "c"]
+
+    assert dropdown.value == "c"
+    assert dropdown.disabled_options == ["b"]
+
+    dropdown.grouping = [("A", ["b", "d"])]
+    assert dropdown.value == "d"
+
+
+@pytest.mark.parametrize(
+    "grouping, expected",
+    [
+        ([("A", [("a", 1), ("b", 2)])], (("A", (("a", 1), ("b", 2))),)),
+        (
+            {"A": {"": ["a"], "B": ["b"]}, "": ["c"]},
+            {"A": {"": (("a", "a"),), "B": (("b", "b"),)}, "": (("c", "c"),)},
+        ),
+    ],
+)
+def test_grouping_read_back_normalized(grouping, expected):
+    """`grouping` reads back normalized, whether passed to `__init__()` or set"""
+    dropdown = DropdownExtended(grouping=grouping)
+    assert dropdown.grouping == expected
+
+    dropdown.options = ["x"]
+    dropdown.grouping = grouping
+    assert dropdown.grouping == expected
+
+
+def test_navigate_enabled_options():
+    """Navigation skips group headers and disabled options, stopping at the ends"""
+    dropdown = DropdownExtended(
+        grouping=[("A", ["a", "b", "c"]), ("B", ["d"])], disabled_options=["b"]
+    )
+    assert dropdown.index == 1
+
+    assert dropdown.select_next_enabled() == 3
+    assert dropdown.select_next_enabled() == 5
+    assert dropdown.select_next_enabled() == 5
+    assert dropdown.select_previous_enabled() == 3
+    assert dropdown.select_previous_enabled() == 1
+    assert dropdown.select_previous_enabled() == 1
+    assert dropdown.value == "a"
+
+    assert dropdown.nearest_enabled(2) == 3  # Equally close, the latter is returned
+    assert dropdown.nearest_enabled(4) == 5
+
+    dropdown.index = None
+    assert dropdown.select_previous_enabled() == 5
+    dropdown.index = None
+    assert dropdown.select_next_enabled() == 1
+
+
+def test_navigate_without_enabled_options():
+    """Navigation keeps the selection when there is no enabled option"""
+    dropdown = DropdownExtended(grouping=[("A", ["a"])], disabled_options=["a"])
+
+    assert dropdown.index is None
+    assert dropdown.select_next_enabled() is None
+    assert dropdown.select_previous_enabled() is None
+    assert dropdown.nearest_enabled(1) is None
+
+
+def test_disable_and_enable_send_patches(monkeypatch):
+    """Only the changed labels are sent when disabling and enabling options"""
+    dropdown = DropdownExtended(options=["a", "b", "c"], value="b")
+    sent = _sent_custom(dropdown, monkeypatch)
+
+    dropdown.disable("b", "c", "b")
+    assert dropdown.disabled_options == ["b", "c"]
+    assert dropdown._disabled_options_labels == ("b", "c")
+    assert dropdown.value == "a"
+    assert sent == [{"event": "disabled_patch", "add": ["b", "c"], "remove": []}]
+
+    dropdown.disable("c")
+    dropdown.enable("b", "a")
+    assert dropdown.disabled_options == ["c"]
+    assert sent[1:] == [{"event": "disabled_patch", "add": [], "remove": ["b"]}]
+
+    with pytest.raises(ValueError, match="nope"):
+        dropdown.disable("nope")
+
+
+def test_disable_in_virtual_mode(monkeypatch):
+    """The virtual view is not sent patches, but requests the changed pages"""
+    dropdown = DropdownExtended(options=["a", "b", "c"], virtual=True)
+    sent = _sent_custom(dropdown, monkeypatch)
+
+    dropdown.disable("a")
+    assert sent == []
+    assert dropdown._pages_version == 1
+    assert dropdown.value == "b"
+    assert dropdown._selected_label == "b"
+
+
+def test_batch_update_resolves_once():
+    """Changes in `batch_update()` are validated and resolved when leaving it"""
+    dropdown = DropdownExtended(options=["a", "b"])
+    with dropdown.batch_update():
+        dropdown.disabled_options = ["c"]  # Not an option yet
+        dropdown.grouping = [("Letters", ["a", "b", "c"])]
+        dropdown.value = "b"
+        with dropdown.batch_update():
+            dropdown.disabled_options = ["b", "c"]
+        assert dropdown.value == "b"
+
+    assert dropdown.disabled_options == ["b", "c"]
+    assert dropdown.value == "a"
+
+
+def test_batch_update_options_after_selection():
+    """Options set after the selection in `batch_update()` reset the selection"""
+    dropdown = DropdownExtended(options=["a", "b"])
+    with dropdown.batch_update():
+        dropdown.value = "b"
+        dropdown.options = ["b", "c"]
+    assert dropdown.value == "b"
+    assert dropdown.index == 0
+
+
+def test_batch_update_sends_one_message(monkeypatch):
+    """All changes of `batch_update()` are sent to the frontend in one message"""
+    dropdown = DropdownExtended(options=["a", "b"])
+    sent = []
+    monkeypatch.setattr(
+        dropdown, "_send", lambda msg, buffers=None: sent.append(msg["state"])
+    )
+
+    with dropdown.batch_update():
+        dropdown.options = ["x", "y", "z"]
+        dropdown.disabled_options = ["x"]
+
+    assert len(sent) == 1
+    assert sent[0]["_options_labels"] == ("x", "y", "z")
+    assert sent[0]["_disabled_options_labels"] == ("x",)
+    assert sent[0]["index"] == 1
+
+
+def test_disabled_mask():
+    """A boolean mask disables options by label, and follows `disabled_options`"""
+    numpy = pytest.importorskip("numpy")
+    dropdown = DropdownExtended(
+        grouping=[("A", ["a", "b"]), ("B", ["c", "a"])],
+        disabled_mask=[True, True, False, False, False, False],
+    )
+    assert dropdown.disabled_options == ["a"]
+    assert dropdown.disabled_mask.tolist() == [False, True, False, False, False, True]
+    assert not dropdown.disabled_mask.flags.writeable
+    assert dropdown.value == "b"
+
+    dropdown.disabled_mask = numpy.array([0, 0, 1, 0, 1, 0])
+    assert dropdown.disabled_options == ["b", "c"]
+    assert dropdown.value == "a"
+
+    dropdown.disabled_options = ["c"]
+    assert dropdown.disabled_mask.tolist() == [False] * 4 + [True, False]
+
+    with pytest.raises(TraitError, match="shape"):
+        dropdown.disabled_mask = [True]
+    with pytest.raises(ValueError, match="Not both"):
+        DropdownExtended(options=["a"], disabled_mask=[True], disabled_options=["a"])
+
+
+NESTED = {"Europe": {"": ["EU"], "Denmark": ["Aarhus"], "Sweden": {}}, "": ["Mars"]}
+
+
+def test_nested_grouping():
+    """Nested groups are flattened depth first, keeping the depth of each group"""
+    dropdown = DropdownExtended(grouping=NESTED)
+
+    assert dropdown._options_labels == (
+        "Europe",
+        "EU",
+        "Denmark",
+        "Aarhus",
+        "Sweden",
+        "Mars",
+    )
+    assert dropdown._group_depths == (0, 1, 1, 1, 0)
+    assert dropdown.value == "EU"
+
+    with pytest.raises(ValueError, match="sub-groups"):
+        dropdown.remove_group("Europe")
+    with pytest.raises(ValueError, match="top-level"):
+        dropdown.add_group("Norway", ["Oslo"], position=2)
+
+    dropdown.remove_group("Sweden")
+    dropdown.add_group("Moon", ["Base"])
+    assert dropdown._group_depths == (0, 1, 1, 0, 0)
+    assert dropdown.grouping == {
+        "Europe": {"": (("EU", "EU"),), "Denmark": (("Aarhus", "Aarhus"),)},
+        "": (("Mars", "Mars"),),
+        "Moon": (("Base", "Base"),),
+    }
+
+    with pytest.raises(TraitError, match="sub-groups"):
+        dropdown.grouping = {"": {"A": ["a"]}}
+
+
+def test_nested_groups_sent_to_views(monkeypatch):
+    """The tree view is sent the entries below a group, and pages have their levels"""
+    dropdown = DropdownExtended(grouping=NESTED, virtual=True, collapsible=True)
+    sent = _sent_custom(dropdown, monkeypatch)
+
+    dropdown._handle_frontend_msg(None, {"event": "request_group", "header": None}, [])
+    dropdown._handle_frontend_msg(
+        None, {"event": "request_group", "header": "Europe"}, []
+    )
+    assert [(message["labels"], message["headers"]) for message in sent] == [
+        (["Europe", "Mars"], [0]),
+        (["EU", "Denmark", "Sweden"], [1, 2]),
+    ]
+    assert sent[1]["indices"] == [1, 2, 4]
+
+    dropdown._handle_frontend_msg(None, {"event": "request_page", "page": 0}, [])
+    assert sent[-1]["levels"] == [0, 1, 1, 2, 1, 0]
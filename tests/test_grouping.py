@@ -0,0 +1,15 @@
+"""Tests for the index structures"""
+from ipywidgets_extended.grouping import SearchIndex
+
+
+def test_search_index_add_and_discard():
+    """Updating the search index matches building it from scratch"""
+    labels = [f"Option {number} of {number % 7}" for number in range(100)]
+    index = SearchIndex(labels[:50], ["Group"])
+    index.add(labels[40:], ["Group", "Other group"])
+    assert index._labels == SearchIndex(labels)._labels
+    assert index._headers == SearchIndex((), ["Group", "Other group"])._headers
+
+    index.discard(labels[::2], ["Group"])
+    assert index._labels == SearchIndex(labels[1::2])._labels
+    assert index._headers == SearchIndex((), ["Other group"])._headers
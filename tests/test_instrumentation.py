@@ -0,0 +1,26 @@
+"""Tests for the comm traffic instrumentation"""
+from ipywidgets import Widget
+
+from ipywidgets_extended import DropdownExtended, disable_sync_stats, enable_sync_stats
+
+
+def test_opening_state_serialized_once(monkeypatch):
+    """The state sent when opening the comm is counted without serializing it again"""
+    calls = []
+    get_state = Widget.get_state
+
+    def counted_get_state(self, *args, **kwargs):
+        calls.append(self)
+        return get_state(self, *args, **kwargs)
+
+    monkeypatch.setattr(Widget, "get_state", counted_get_state)
+    enable_sync_stats()
+    try:
+        dropdown = DropdownExtended(options=["a", "b"])
+    finally:
+        disable_sync_stats()
+
+    assert calls.count(dropdown) == 1
+    stats = dropdown.sync_stats()
+    assert stats["_options_labels"]["sent"] == 1
+    assert stats["_options_labels"]["sent_bytes"] == len('["a","b"]')
@@ -0,0 +1,115 @@
+"""Tests for adding options from an asynchronous source with `populate()`"""
+import asyncio
+
+import pytest
+
+from ipywidgets_extended import DropdownExtended
+
+
+async def _groups(*groups, delay: float = 0, then: asyncio.Event = None):
+    """Yield the groups, waiting `delay` seconds before each, and for `then` after"""
+    for group in groups:
+        await asyncio.sleep(delay)
+        yield group
+    if then is not None:
+        await then.wait()
+
+
+def test_streamed_groups():
+    """Groups are added as they arrive, and `loading` is set right away"""
+
+    async def main():
+        dropdown = DropdownExtended(
+            grouping=_groups(("A", ["a"]), ("B", ["b"]), ("A", ["c"]))
+        )
+        assert dropdown.loading
+        await dropdown.wait_loaded()
+
+        assert not dropdown.loading
+        assert dropdown._options_labels == ("A", "a", "c", "B", "b")
+        assert dropdown.value == "a"
+
+    asyncio.run(main())
+
+
+def test_groups_added_after_interval():
+    """Groups received so far are added after `interval`, while still loading"""
+
+    async def main():
+        done = asyncio.Event()
+        dropdown = DropdownExtended()
+        population = dropdown.populate(
+            _groups(("A", ["a", "b"]), then=done), interval=0.01
+        )
+        assert dropdown.loading
+
+        await asyncio.sleep(0.1)
+        assert dropdown.loading
+        assert dropdown._options_labels == ("A", "a", "b")
+        assert dropdown.value == "a"
+
+        done.set()
+        await population
+        assert not dropdown.loading
+
+    asyncio.run(main())
+
+
+def test_setting_options_stops_population():
+    """Setting the options cancels adding options, and `wait_loaded()` returns"""
+
+    async def main():
+        dropdown = DropdownExtended()
+        population = dropdown.populate(_groups(("A", ["a"]), then=asyncio.Event()))
+        await asyncio.sleep(0)
+
+        dropdown.options = ["x"]
+        assert not dropdown.loading
+        await dropdown.wait_loaded()
+        assert population.cancelled()
+        assert dropdown._options_labels == ("x",)
+
+        # A new population is not reset by the cancelled one
+        dropdown.populate(_groups(("B", ["b"]), delay=0.01))
+        await asyncio.sleep(0)
+        assert dropdown.loading
+        await dropdown.wait_loaded()
+        assert not dropdown.loading
+        assert dropdown._options_labels == ("x", "B", "b")
+
+    asyncio.run(main())
+
+
+def test_source_error():
+    """Errors of the source are raised by `wait_loaded()`, keeping received groups"""
+
+    async def failing():
+        yield "A", ["a"]
+        raise RuntimeError("Source failed")
+
+    async def main():
+        dropdown = DropdownExtended(grouping=failing())
+        with pytest.raises(RuntimeError, match="Source failed"):
+            await dropdown.wait_loaded()
+        assert not dropdown.loading
+        assert dropdown._options_labels == ("A", "a")
+
+    asyncio.run(main())
+
+
+def test_delayed_add_error():
+    """Errors adding the options after `interval` are raised by `wait_loaded()`"""
+
+    def disabled(value):
+        if value == "bad":
+            raise ValueError("Bad option")
+        return False
+
+    async def main():
+        dropdown = DropdownExtended(disabled_when=disabled)
+        dropdown.populate(_groups(("A", ["bad"]), then=asyncio.Event()), interval=0.01)
+        with pytest.raises(ValueError, match="Bad option"):
+            await asyncio.wait_for(dropdown.wait_loaded(), 1)
+        assert not dropdown.loading
+
+    asyncio.run(main())
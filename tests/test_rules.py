@@ -0,0 +1,23 @@
+"""Tests for rules disabling options"""
+import gc
+from weakref import ref
+
+from ipywidgets import IntSlider
+
+from ipywidgets_extended import DisabledRule, DropdownExtended
+
+
+def test_replaced_options_are_not_kept_alive():
+    """The memoized labels of replaced options are dropped with the options"""
+    budget = IntSlider(1)
+    rule = DisabledRule(lambda value, budget: value > budget, depends_on=[budget])
+    dropdown = DropdownExtended(options=[1, 2, 3], disabled_when=rule)
+    replaced = ref(dropdown._flat_index)
+
+    dropdown.options = [0, 1, 2]
+    budget.value = 0
+    gc.collect()
+
+    assert replaced() is None
+    assert len(rule._cache) == 1
+    assert sorted(dropdown.disabled_options) == ["1", "2"]
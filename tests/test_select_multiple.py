@@ -0,0 +1,53 @@
+"""Tests for `SelectMultipleExtended`"""
+import os
+import subprocess
+import sys
+
+import pytest
+
+import ipywidgets_extended
+from ipywidgets_extended import SelectMultipleExtended
+
+
+CREATE_AND_SELECT = """
+from ipywidgets_extended import SelectMultipleExtended
+
+select = SelectMultipleExtended(
+    grouping=[("A", ["x", "y"]), ("B", ["z"])], value=("y",), disabled_options=["x"]
+)
+assert select.index == (2,), select.index
+assert select._selection == {2}, select._selection
+assert select._selected_bitmap == b"\\x04", select._selected_bitmap
+select.select_group("B")
+assert select.index == (2, 4), select.index
+assert select._selected_bitmap == b"\\x14", select._selected_bitmap
+"""
+
+
+@pytest.mark.parametrize("seed", ["0", "1", "2", "3", "42"])
+def test_selection_passed_to_init(seed):
+    """The selection passed to `__init__()` is kept, whatever the order of the
+    notifications of the passed traits"""
+    package_root = os.path.dirname(os.path.dirname(ipywidgets_extended.__file__))
+    env = dict(os.environ, PYTHONHASHSEED=seed)
+    env["PYTHONPATH"] = os.pathsep.join(
+        filter(None, [package_root, os.environ.get("PYTHONPATH")])
+    )
+    subprocess.run([sys.executable, "-c", CREATE_AND_SELECT], env=env, check=True)
+
+
+def test_select_group():
+    """Selecting a group selects its enabled options"""
+    select = SelectMultipleExtended(
+        grouping=[("A", ["x", "y"]), ("B", ["z"])], disabled_options=["x"]
+    )
+    select.select_group("A")
+    assert select.value == ("y",)
+    assert select._selected_bitmap == b"\x04"
+
+    select.select_all_enabled()
+    assert select.value == ("y", "z")
+
+    select.disabled_options = ["y"]
+    assert select.value == ("z",)
+    assert select._selected_bitmap == b"\x10"
@@ -0,0 +1,95 @@
+"""Tests for the selection widgets sharing `GroupedOptionsMixin`"""
+import pytest
+from traitlets import TraitError
+
+from ipywidgets_extended import (
+    ComboboxExtended,
+    RadioButtonsExtended,
+    SelectExtended,
+    ToggleButtonsExtended,
+)
+
+
+SELECTION_WIDGETS = [SelectExtended, RadioButtonsExtended, ToggleButtonsExtended]
+
+
+@pytest.mark.parametrize("widget_class", SELECTION_WIDGETS)
+def test_grouping_selects_first_enabled(widget_class):
+    """Group headers and disabled options are not selected initially"""
+    widget = widget_class(
+        grouping=[("A", ["a", "b"]), ("B", ["c"])], disabled_options=["a"]
+    )
+
+    assert widget._options_labels == ("A", "a", "b", "B", "c")
+    assert widget._grouping_labels == (("A", ("a", "b")), ("B", ("c",)))
+    assert widget.index == 2
+    assert widget.value == "b"
+
+    with pytest.raises(TraitError):
+        widget.index = 0  # Group header
+    with pytest.raises(TraitError):
+        widget.value = "a"  # Disabled
+
+
+@pytest.mark.parametrize("widget_class", SELECTION_WIDGETS)
+def test_disabling_selected_option(widget_class):
+    """Disabling the selected option selects the closest enabled option"""
+    widget = widget_class(grouping=[("A", ["a", "b"]), ("B", ["c"])], value="b")
+    widget.disabled_options = ["b"]
+
+    assert widget._disabled_options_labels == ("b",)
+    assert widget.value == "a"
+
+    with pytest.raises(TraitError, match="nope"):
+        widget.disabled_options = ["nope"]
+    assert widget.disabled_options == ["b"]
+
+
+@pytest.mark.parametrize("widget_class", SELECTION_WIDGETS)
+def test_changing_options(widget_class):
+    """Changing `grouping` or `options` re-indexes the options, keeping them apart"""
+    widget = widget_class(options=["x", "y"], disabled_options=["x"])
+    assert widget.value == "y"
+
+    widget.grouping = {"A": {"B": ["x", "z"]}, "C": ["w"]}
+    assert widget._options_labels == ("A", "B", "x", "z", "C", "w")
+    assert widget._group_depths == (0, 1, 0)
+    assert widget.options == widget._flat_index.entries
+    assert widget.value == "z"
+
+    widget.options = ["p", "x"]
+    assert widget.grouping == ()
+    assert widget._grouping_labels == ()
+    assert widget._group_depths == ()
+    assert widget.value == "p"
+    assert widget.label == "p"
+
+
+def test_combobox_suggests_enabled_options():
+    """The combobox options are labels only, also for groupings"""
+    combobox = ComboboxExtended(
+        grouping=[("A", ["a", "b"]), ("", ["c"])], disabled_options=["b"]
+    )
+
+    assert combobox.options == ("a", "b", "c")
+    assert combobox._options_labels == ("A", "a", "b", "c")
+    assert combobox._disabled_options_labels == ("b",)
+
+    combobox.options = ["x", "y"]
+    assert combobox.grouping == ()
+    assert combobox._options_labels == ("x", "y")
+
+    with pytest.raises(TraitError):
+        combobox.disabled_options = ["b"]
+
+
+@pytest.mark.parametrize("widget_class", SELECTION_WIDGETS)
+def test_grouping_read_back_normalized(widget_class):
+    """`grouping` reads back normalized, whether passed to `__init__()` or set"""
+    grouping = {"A": {"B": ["b"]}, "C": [("c", 3)]}
+    expected = {"A": {"B": (("b", "b"),)}, "C": (("c", 3),)}
+    widget = widget_class(grouping=grouping)
+    assert widget.grouping == expected
+
+    widget.grouping = grouping
+    assert widget.grouping == expected
@@ -0,0 +1,64 @@
+"""Tests for the compact binary serialization of labels"""
+from array import array
+
+from ipywidgets_extended import DropdownExtended
+from ipywidgets_extended.serialization import (
+    disabled_to_json,
+    grouping_to_json,
+    labels_to_json,
+)
+
+
+def _uint32s(view) -> list:
+    """Decode a little-endian `uint32` buffer"""
+    return array("I", bytes(view)).tolist()
+
+
+def _decode_labels(encoded) -> list:
+    """Decode labels from a UTF-8 blob and byte offsets"""
+    blob, offsets = bytes(encoded["blob"]), _uint32s(encoded["offsets"])
+    return [
+        blob[start:stop].decode("utf-8") for start, stop in zip(offsets, offsets[1:])
+    ]
+
+
+def test_labels_sent_as_lists_by_default():
+    """Without `compact_sync`, the labels are sent as they are"""
+    dropdown = DropdownExtended(grouping=[("A", ["a"])], disabled_options=["a"])
+
+    assert labels_to_json(dropdown._options_labels, dropdown) == ("A", "a")
+    assert grouping_to_json(dropdown._grouping_labels, dropdown) == (("A", ("a",)),)
+    assert disabled_to_json(dropdown._disabled_options_labels, dropdown) == ("a",)
+
+
+def test_compact_labels():
+    """Labels are sent as a UTF-8 blob with byte offsets"""
+    dropdown = DropdownExtended(options=["a", "bø", "", "c"], compact_sync=True)
+
+    encoded = labels_to_json(dropdown._options_labels, dropdown)
+    assert _uint32s(encoded["offsets"]) == [0, 1, 4, 4, 5]
+    assert _decode_labels(encoded) == ["a", "bø", "", "c"]
+
+
+def test_compact_grouping():
+    """Groupings are sent as the headers, the option labels and the group offsets"""
+    dropdown = DropdownExtended(
+        grouping=[("A", ["a", "b"]), ("", ["c"]), ("B", [])], compact_sync=True
+    )
+
+    encoded = grouping_to_json(dropdown._grouping_labels, dropdown)
+    assert _decode_labels(encoded["headers"]) == ["A", "", "B"]
+    assert _decode_labels(encoded["labels"]) == ["a", "b", "c"]
+    assert _uint32s(encoded["groups"]) == [0, 2, 3, 3]
+
+
+def test_compact_disabled_options():
+    """Disabled options are sent as a bitmap over the entries"""
+    options = [str(number) for number in range(10)]
+    dropdown = DropdownExtended(
+        grouping=[("A", options)], disabled_options=["0", "8"], compact_sync=True
+    )
+
+    encoded = disabled_to_json(dropdown._disabled_options_labels, dropdown)
+    # Entry 0 is the group header
+    assert bytes(encoded["bitmap"]) == bytes([0b10, 0b10])